@@ -0,0 +1,381 @@
+# batch.py
+import numpy as np
+from dataclasses import dataclass
+from models import Debt, DebtPortfolio
+from schedule import RepaymentSchedule
+from strategies import StrategyLike, get_strategy
+from typing import List, Dict, Tuple, Optional, Sequence, Hashable
+
+
+@dataclass
+class BatchResult:
+    """Per-client outcome of a batch run, indexed in input order."""
+    client_ids: List[Hashable]
+    creditors: List[List[str]]
+    total_months: np.ndarray
+    paid_off: np.ndarray
+    total_paid: np.ndarray
+    total_interest: np.ndarray
+    remaining_balance: np.ndarray
+    balances: Optional[np.ndarray] = None
+    payments: Optional[np.ndarray] = None
+    min_payments: Optional[np.ndarray] = None
+    interest: Optional[np.ndarray] = None
+    cash_flow_used: Optional[np.ndarray] = None
+    remaining_cash_flow: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.client_ids)
+
+    def schedule(self, client_id: Hashable) -> RepaymentSchedule:
+        """Payment schedule for one client, as calculate_repayment_schedule returns it."""
+        if self.balances is None:
+            raise ValueError("Batch was run without include_schedule=True")
+
+        position = self.client_ids.index(client_id)
+        creditors = self.creditors[position]
+        debt_count = len(creditors)
+        months = int(self.total_months[position])
+
+        return RepaymentSchedule(
+            creditors,
+            np.ascontiguousarray(self.balances[position, :months, :debt_count]),
+            np.ascontiguousarray(self.payments[position, :months, :debt_count]),
+            np.ascontiguousarray(self.min_payments[position, :months, :debt_count]),
+            np.ascontiguousarray(self.interest[position, :months, :debt_count]),
+            self.cash_flow_used[position, :months].copy(),
+            self.remaining_cash_flow[position, :months].copy()
+        )
+
+    def to_frame(self):
+        """Per-client summary as a pandas DataFrame indexed by client id."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                'payoff_month': self.total_months,
+                'paid_off': self.paid_off,
+                'total_paid': self.total_paid,
+                'total_interest': self.total_interest,
+                'remaining_balance': self.remaining_balance
+            },
+            index=pd.Index(self.client_ids, name='client_id')
+        )
+
+
+class BatchCalculator:
+    @staticmethod
+    def calculate_batch(scenarios: Sequence[Tuple[List[Debt], float]], months_to_display: int,
+                        client_ids: Optional[Sequence[Hashable]] = None,
+                        include_schedule: bool = False,
+                        strategy: StrategyLike = "cash_flow_recap") -> BatchResult:
+        """
+        Simulate many (debts, additional_cash_flow) scenarios in one pass.
+
+        Args:
+        - scenarios: One (debts, additional_cash_flow) pair per client
+        - months_to_display: Maximum months to calculate
+        - client_ids: Optional ids, defaults to the scenario position
+        - include_schedule: Also keep the full months x debts matrices
+        - strategy: Priority order for extra payments
+
+        Returns:
+        - batch result with one entry per scenario
+        """
+        debt_lists = [list(debts) for debts, _ in scenarios]
+        counts = np.array([len(debts) for debts in debt_lists], dtype=np.int64)
+        flat = DebtPortfolio.from_debts([debt for debts in debt_lists for debt in debts])
+
+        return BatchCalculator._run(
+            counts,
+            flat.balance,
+            flat.min_payment,
+            flat.apr,
+            BatchCalculator._priority(flat, strategy),
+            list(flat.creditors),
+            np.array([cash_flow for _, cash_flow in scenarios], dtype=np.float64),
+            months_to_display,
+            list(client_ids) if client_ids is not None else list(range(len(debt_lists))),
+            include_schedule
+        )
+
+    @staticmethod
+    def calculate_batch_arrays(balances: Sequence[Sequence[float]], min_payments: Sequence[Sequence[float]],
+                               additional_cash_flows: Sequence[float], months_to_display: int,
+                               client_ids: Optional[Sequence[Hashable]] = None,
+                               creditors: Optional[Sequence[Sequence[str]]] = None,
+                               aprs: Optional[Sequence[Sequence[float]]] = None,
+                               include_schedule: bool = False,
+                               strategy: StrategyLike = "cash_flow_recap",
+                               limits: Optional[Sequence[Sequence[float]]] = None) -> BatchResult:
+        """
+        Simulate scenarios given as ragged balance / minimum payment arrays.
+
+        Args:
+        - balances: One sequence of balances per client
+        - min_payments: One sequence of minimum payments per client, same shape as balances
+        - additional_cash_flows: Extra money per client BEYOND minimum payments
+        - months_to_display: Maximum months to calculate
+        - client_ids: Optional ids, defaults to the client position
+        - creditors: Optional creditor names, defaults to "Debt 1", "Debt 2", ...
+        - aprs: Optional APRs in percent, same shape as balances, defaults to 0
+        - include_schedule: Also keep the full months x debts matrices
+        - strategy: Priority order for extra payments
+        - limits: Optional credit limits, same shape as balances, defaults to 0;
+          only the utilization strategy reads them
+
+        Returns:
+        - batch result with one entry per client
+        """
+        counts = np.array([len(row) for row in balances], dtype=np.int64)
+        if [len(row) for row in min_payments] != counts.tolist():
+            raise ValueError("balances and min_payments must have the same shape")
+
+        flat_balance = np.concatenate([np.asarray(row, dtype=np.float64) for row in balances]) \
+            if len(balances) else np.empty(0)
+        flat_min = np.concatenate([np.asarray(row, dtype=np.float64) for row in min_payments]) \
+            if len(min_payments) else np.empty(0)
+        flat_apr = np.concatenate([np.asarray(row, dtype=np.float64) for row in aprs]) \
+            if aprs is not None and len(aprs) else np.zeros_like(flat_balance)
+        if len(flat_apr) != len(flat_balance):
+            raise ValueError("balances and aprs must have the same shape")
+        flat_limit = np.concatenate([np.asarray(row, dtype=np.float64) for row in limits]) \
+            if limits is not None and len(limits) else np.zeros_like(flat_balance)
+        if len(flat_limit) != len(flat_balance):
+            raise ValueError("balances and limits must have the same shape")
+        if creditors is None:
+            names = [f"Debt {i + 1}" for count in counts.tolist() for i in range(count)]
+        else:
+            names = [name for row in creditors for name in row]
+
+        return BatchCalculator._run(
+            counts,
+            flat_balance,
+            flat_min,
+            flat_apr,
+            BatchCalculator._priority(DebtPortfolio(names, flat_balance, flat_limit, flat_min, flat_apr), strategy),
+            names,
+            np.asarray(additional_cash_flows, dtype=np.float64),
+            months_to_display,
+            list(client_ids) if client_ids is not None else list(range(len(counts))),
+            include_schedule
+        )
+
+    @staticmethod
+    def calculate_batch_frame(frame, months_to_display: int, client_column: str = 'client_id',
+                              cash_flow_column: str = 'additional_cash_flow',
+                              include_schedule: bool = False,
+                              strategy: StrategyLike = "cash_flow_recap") -> BatchResult:
+        """
+        Simulate every client in a long-format DataFrame with one row per debt.
+
+        Args:
+        - frame: DataFrame with client, creditor, balance, min_payment and cash flow columns,
+          plus optional apr and limit columns
+        - months_to_display: Maximum months to calculate
+        - client_column: Column holding the client id
+        - cash_flow_column: Column holding the client's additional cash flow (first row per client is used)
+        - include_schedule: Also keep the full months x debts matrices
+        - strategy: Priority order for extra payments
+
+        Returns:
+        - batch result with one entry per client, in order of first appearance
+        """
+        import pandas as pd
+
+        codes, client_ids = pd.factorize(frame[client_column], sort=False)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        counts = np.bincount(codes, minlength=len(client_ids)).astype(np.int64)
+
+        balance = frame['balance'].to_numpy(dtype=np.float64)[order]
+        min_payment = frame['min_payment'].to_numpy(dtype=np.float64)[order]
+        apr = frame['apr'].to_numpy(dtype=np.float64)[order] if 'apr' in frame else np.zeros_like(balance)
+        limit = frame['limit'].to_numpy(dtype=np.float64)[order] if 'limit' in frame else np.zeros_like(balance)
+        creditors = frame['creditor'].to_numpy()[order].tolist()
+        cash_flow = frame[cash_flow_column].to_numpy(dtype=np.float64)[order]
+        first_rows = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(counts) else counts
+
+        return BatchCalculator._run(
+            counts,
+            balance,
+            min_payment,
+            apr,
+            BatchCalculator._priority(DebtPortfolio(creditors, balance, limit, min_payment, apr), strategy),
+            creditors,
+            cash_flow[first_rows],
+            months_to_display,
+            list(client_ids),
+            include_schedule
+        )
+
+    @staticmethod
+    def _priority(debts: DebtPortfolio, strategy: StrategyLike) -> np.ndarray:
+        """
+        Strategy keys of every debt, negated for ascending strategies so that
+        `_run` can sort them all descending.
+        """
+        strategy = get_strategy(strategy)
+        if strategy.column is not None:
+            priority = np.array(getattr(debts, strategy.column), dtype=np.float64)
+        else:
+            priority = np.array([strategy.key(debt) for debt in debts], dtype=np.float64)
+        return priority if strategy.reverse else -priority
+
+    @staticmethod
+    def _run(counts: np.ndarray, balance: np.ndarray, min_payment: np.ndarray, apr: np.ndarray,
+             priority: np.ndarray,
+             creditors: List[str], additional_cash_flow: np.ndarray, months_to_display: int,
+             client_ids: List[Hashable], include_schedule: bool) -> BatchResult:
+        """Sort each client's debts by priority and pad them into a clients x debts layout."""
+        client_count = len(counts)
+        width = int(counts.max()) if client_count else 0
+        client = np.repeat(np.arange(client_count), counts)
+
+        # Stable descending sort within each client, like sort_debts_by_priority
+        order = np.lexsort((-priority, client))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if client_count else counts
+        column = np.arange(len(order)) - starts[client]
+
+        padded_balance = np.zeros((client_count, width))
+        padded_min = np.zeros((client_count, width))
+        padded_balance[client, column] = balance[order]
+        padded_min[client, column] = min_payment[order]
+        padded_apr = np.zeros((client_count, width))
+        padded_apr[client, column] = apr[order]
+
+        sorted_creditors = [creditors[i] for i in order.tolist()]
+        creditor_rows = [sorted_creditors[start:start + count]
+                         for start, count in zip(starts.tolist(), counts.tolist())]
+
+        result = BatchCalculator._simulate(
+            padded_balance, padded_min, padded_apr, additional_cash_flow, months_to_display, include_schedule
+        )
+        return BatchResult(client_ids, creditor_rows, **result)
+
+    @staticmethod
+    def _simulate(balance: np.ndarray, min_payment: np.ndarray, apr: np.ndarray, additional_cash_flow: np.ndarray,
+                  months_to_display: int, include_schedule: bool,
+                  cash_flow_paths: Optional[np.ndarray] = None, apr_shift: Optional[np.ndarray] = None,
+                  track_total_balance: bool = False) -> Dict:
+        """
+        Run the DebtCalculator waterfall for every client at once.
+
+        Each row is one client with debts in priority order, padded with zero
+        balances. The extra-payment waterfall walks columns in priority order
+        so every client sees exactly the per-debt arithmetic of the reference loop.
+
+        Optional clients x months arrays vary the inputs over time:
+        `cash_flow_paths` replaces the additional cash flow of each month and
+        `apr_shift` is added to every debt's APR (floored at 0). With
+        `track_total_balance` the result also holds each client's total
+        balance at the end of every month.
+        """
+        client_count, width = balance.shape
+        starting_total = balance.sum(axis=1)
+
+        total_months = np.zeros(client_count, dtype=np.int64)
+        total_interest = np.zeros(client_count)
+        final_balance = balance.copy()
+        schedule = {}
+        if include_schedule:
+            schedule = {
+                'balances': np.zeros((client_count, months_to_display, width)),
+                'payments': np.zeros((client_count, months_to_display, width)),
+                'min_payments': np.zeros((client_count, months_to_display, width)),
+                'interest': np.zeros((client_count, months_to_display, width)),
+                'cash_flow_used': np.zeros((client_count, months_to_display)),
+                'remaining_cash_flow': np.zeros((client_count, months_to_display))
+            }
+        if track_total_balance:
+            schedule['total_balance'] = np.zeros((client_count, months_to_display))
+
+        # Working set holds only the clients that still carry a balance
+        rows = np.arange(client_count)
+        balance = balance.copy()
+        min_payment = min_payment.copy()
+        apr = apr.copy()
+        additional = additional_cash_flow.copy()
+        freed = np.zeros(client_count)
+        columns = np.flatnonzero((balance > 0).any(axis=0))
+
+        for month in range(months_to_display):
+            if not len(rows):
+                break
+
+            if cash_flow_paths is not None:
+                additional = cash_flow_paths[rows, month]
+            current_cash_flow = additional + freed
+
+            # Interest accrues before any payment
+            month_apr = apr if apr_shift is None else np.maximum(apr + apr_shift[rows, month][:, None], 0.0)
+            interest = np.where(balance > 0, balance * month_apr / 1200, 0.0)
+            balance = balance + interest
+            total_interest[rows] += interest.sum(axis=1)
+            if include_schedule:
+                previous = balance.copy()
+
+            # Minimum payments
+            active = balance > 0
+            paid_off = active & (balance <= min_payment)
+            balance = np.where(paid_off, 0.0, balance - np.where(active, min_payment, 0.0))
+
+            # Extra cash waterfall, column by column in priority order
+            remaining = current_cash_flow.copy()
+            for j in columns:
+                if not (remaining > 0).any():
+                    break
+                current = balance[:, j]
+                additional_payment = np.where((current > 0) & (remaining > 0),
+                                              np.minimum(remaining, current), 0.0)
+                balance[:, j] = current - additional_payment
+                remaining -= additional_payment
+
+            if include_schedule:
+                schedule['balances'][rows, month] = balance
+                schedule['payments'][rows, month] = np.where(previous > balance, previous - balance, 0.0)
+                schedule['min_payments'][rows, month] = min_payment
+                schedule['interest'][rows, month] = interest
+                schedule['cash_flow_used'][rows, month] = current_cash_flow - remaining
+                schedule['remaining_cash_flow'][rows, month] = remaining
+            if track_total_balance:
+                schedule['total_balance'][rows, month] = balance.sum(axis=1)
+
+            # When a debt is paid off, its minimum payment becomes additional cash flow
+            paid = balance == 0
+            newly_freed = paid & (min_payment > 0)
+            if newly_freed.any():
+                freed_total = np.zeros(len(rows))
+                for j in np.flatnonzero(newly_freed.any(axis=0)):
+                    freed_total = freed_total + np.where(newly_freed[:, j], min_payment[:, j], 0.0)
+                freeing = freed_total > 0
+                freed = np.where(freeing, freed_total, freed)
+                min_payment = np.where(freeing[:, None] & paid, 0.0, min_payment)
+                columns = np.flatnonzero((balance > 0).any(axis=0))
+
+            total_months[rows] += 1
+
+            # Drop clients that are debt free from the working set
+            done = ~(balance > 0).any(axis=1)
+            if done.any():
+                final_balance[rows[done]] = balance[done]
+                keep = ~done
+                rows = rows[keep]
+                balance = balance[keep]
+                min_payment = min_payment[keep]
+                apr = apr[keep]
+                additional = additional[keep]
+                freed = freed[keep]
+                columns = np.flatnonzero((balance > 0).any(axis=0))
+
+        final_balance[rows] = balance
+        remaining_balance = final_balance.sum(axis=1)
+        return {
+            'total_months': total_months,
+            'paid_off': ~(final_balance > 0).any(axis=1),
+            'total_paid': starting_total + total_interest - remaining_balance,
+            'total_interest': total_interest,
+            'remaining_balance': remaining_balance,
+            **schedule
+        }
+
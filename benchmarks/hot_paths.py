@@ -0,0 +1,305 @@
+# benchmarks/hot_paths.py
+"""
+Benchmarks for the calculator hot paths on synthetic portfolios.
+
+Every case runs in its own forked process, so peak RSS and allocations are
+measured per case. After one warm-up call, wall time is the best of several
+repeats and allocations are the tracemalloc peak of one extra run. Results
+are written as JSON and can be compared with an earlier run; any case slower
+(or allocating more) than the baseline by more than the threshold fails the
+run.
+
+Usage:
+    python benchmarks/hot_paths.py [--full] [--output FILE] [--baseline FILE] [--threshold FRACTION]
+"""
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+from calculator import DebtCalculator  # noqa: E402
+from models import Debt  # noqa: E402
+
+QUICK_DEBTS = (1, 10, 100, 1000)
+QUICK_MONTHS = (12, 120, 600)
+FULL_DEBTS = (1, 10, 100, 1000, 10000)
+FULL_MONTHS = (12, 60, 120, 360, 600)
+ENGINES = ("python", "numpy", "cents")
+
+# Row-by-row paths are skipped above this many schedule rows
+ROW_LIMIT = 200_000
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    engine: str
+    debts: int
+    months: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.engine}] debts={self.debts} months={self.months}"
+
+
+def make_portfolio(debt_count: int, seed: int = 0):
+    """
+    Synthetic debts whose minimums barely outpace interest, so plans run for
+    most of a 600 month horizon and every case does its full share of work.
+    """
+    rng = np.random.default_rng(seed)
+    balance = np.round(rng.uniform(500, 25000, debt_count), 2)
+    apr = np.round(rng.uniform(0, 29.99, debt_count), 2)
+    limit = np.round(balance * rng.uniform(1.1, 2.0, debt_count), 2)
+    min_payment = np.round(balance * (apr / 1200 + 0.001) + 1, 2)
+    debts = [
+        Debt.create(f"Creditor {i + 1}", b, lim, mp, a)
+        for i, (b, lim, mp, a) in enumerate(zip(balance.tolist(), limit.tolist(), min_payment.tolist(), apr.tolist()))
+    ]
+    return debts, 100.0
+
+
+def build_cases(debt_sizes, horizons):
+    cases = []
+    for debts in debt_sizes:
+        cases.append(Case("calculate_repayment", "python", debts, 1))
+        for months in horizons:
+            for engine in ENGINES:
+                if engine != "python" or debts * months <= ROW_LIMIT:
+                    cases.append(Case("calculate_repayment_schedule", engine, debts, months))
+            cases.append(Case("iter_repayment_schedule", "numpy", debts, months))
+            cases.append(Case("month_data", "numpy", debts, months))
+            cases.append(Case("to_pandas", "numpy", debts, months))
+            cases.append(Case("chart_data", "numpy", debts, months))
+            cases.append(Case("sensitivity_sweep", "numpy", debts, months))
+            for engine in ("numpy", "cents"):
+                cases.append(Case("incremental_edit_first", engine, debts, months))
+                cases.append(Case("incremental_edit_last", engine, debts, months))
+            if debts * months <= ROW_LIMIT:
+                cases.append(Case("dataframe_from_rows", "numpy", debts, months))
+    return cases
+
+
+def prepare(case: Case):
+    """Untimed setup; returns the callable to time and its arguments."""
+    debts, cash_flow = make_portfolio(case.debts)
+
+    if case.name == "calculate_repayment":
+        return DebtCalculator.calculate_repayment, (copy.deepcopy(debts), cash_flow)
+    if case.name == "calculate_repayment_schedule":
+        return DebtCalculator.calculate_repayment_schedule, (debts, cash_flow, case.months, case.engine)
+    if case.name == "iter_repayment_schedule":
+        def drain(*args):
+            for _ in DebtCalculator.iter_repayment_schedule(*args):
+                pass
+        return drain, (debts, cash_flow, case.months)
+    if case.name == "sensitivity_sweep":
+        from sensitivity import SensitivityAnalyzer
+        cash_flows = SensitivityAnalyzer.cash_flow_grid(cash_flow, debts)
+        return SensitivityAnalyzer.sweep, (debts, cash_flows, case.months)
+
+    if case.name.startswith("incremental_edit"):
+        # Avalanche keeps the priority order when a balance changes. Editing the
+        # first debt resumes after its early payoff, the worst case; editing
+        # the last one only replays that debt
+        from incremental import IncrementalCalculator
+        calculator = IncrementalCalculator(case.engine, "avalanche")
+        calculator.calculate(debts, cash_flow, case.months)
+        position = calculator._order[0 if case.name == "incremental_edit_first" else -1]
+        edited = list(debts)
+        edited[position] = Debt.create(
+            debts[position].creditor, round(debts[position].balance * 0.9, 2), debts[position].limit,
+            debts[position].min_payment, debts[position].apr
+        )
+        return calculator.calculate, (edited, cash_flow, case.months)
+
+    schedule, total_months = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, case.months, case.engine)
+    if case.name == "month_data":
+        return schedule.month_data, (total_months,)
+    if case.name == "to_pandas":
+        return schedule.to_pandas, ()
+    if case.name == "chart_data":
+        from charting import ChartData
+        return ChartData.payoff_timeline, (schedule,)
+    if case.name == "dataframe_from_rows":
+        import pandas as pd
+        return pd.DataFrame, (list(schedule),)
+    raise ValueError(f"Unknown case: {case.name}")
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes, 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def measure(case: Case, min_time: float, max_repeats: int) -> dict:
+    """Time, allocation and memory figures for one case, in the current process."""
+    # One untimed call pays for lazy imports and first-use caches
+    function, args = prepare(case)
+    function(*args)
+
+    start_rss = current_rss()
+    timings = []
+    while len(timings) < max_repeats and (sum(timings) < min_time or len(timings) < 1):
+        function, args = prepare(case)
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+
+    function, args = prepare(case)
+    tracemalloc.start()
+    function(*args)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        **asdict(case),
+        "seconds": min(timings),
+        "repeats": len(timings),
+        "allocated_bytes": traced_peak,
+        "peak_rss_bytes": peak_rss,
+        "rss_growth_bytes": max(peak_rss - start_rss, 0) if start_rss else None
+    }
+
+
+def _measure_in_child(connection, case: Case, min_time: float, max_repeats: int):
+    try:
+        connection.send(measure(case, min_time, max_repeats))
+    except Exception as error:  # reported by the parent
+        connection.send({**asdict(case), "error": repr(error)})
+    finally:
+        connection.close()
+
+
+def run_isolated(case: Case, min_time: float, max_repeats: int) -> dict:
+    """Measure a case in a forked child so memory figures are not shared between cases."""
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_measure_in_child, args=(sender, case, min_time, max_repeats))
+    process.start()
+    sender.close()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Cases slower or allocating more than the baseline by more than `threshold`."""
+    previous = {Case(r["name"], r["engine"], r["debts"], r["months"]).key: r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        key = Case(result["name"], result["engine"], result["debts"], result["months"]).key
+        old = previous.get(key)
+        if old is None or "error" in result or "error" in old:
+            continue
+        for metric in ("seconds", "allocated_bytes"):
+            if old[metric] and result[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{key}: {metric} {old[metric]:.6g} -> {result[metric]:.6g} "
+                                   f"(+{result[metric] / old[metric] - 1:.0%})")
+    return regressions
+
+
+def print_engine_comparison(results: list):
+    """Speed of each engine relative to the python reference loop."""
+    schedules = {
+        (r["debts"], r["months"], r["engine"]): r["seconds"]
+        for r in results if r["name"] == "calculate_repayment_schedule" and "error" not in r
+    }
+    print("\nEngine comparison (calculate_repayment_schedule):")
+    for debts, months in sorted({(d, m) for d, m, _ in schedules}):
+        cells = []
+        for engine in ENGINES:
+            seconds = schedules.get((debts, months, engine))
+            if seconds is None:
+                cells.append(f"{engine}: -")
+                continue
+            reference = schedules.get((debts, months, "python"))
+            speedup = f" ({reference / seconds:.1f}x)" if reference and engine != "python" else ""
+            cells.append(f"{engine}: {seconds * 1000:.2f} ms{speedup}")
+        print(f"  debts={debts:<6} months={months:<4} " + ", ".join(cells))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="Scale to 10,000 debts and more horizons")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown as a fraction")
+    parser.add_argument("--filter", default="", help="Only run cases whose key contains this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds of repeats per case")
+    parser.add_argument("--max-repeats", type=int, default=5, help="Maximum timed repeats per case")
+    args = parser.parse_args()
+
+    cases = build_cases(FULL_DEBTS if args.full else QUICK_DEBTS, FULL_MONTHS if args.full else QUICK_MONTHS)
+    cases = [case for case in cases if args.filter in case.key]
+
+    results = []
+    for case in cases:
+        result = run_isolated(case, args.min_time, args.max_repeats)
+        results.append(result)
+        if "error" in result:
+            print(f"{case.key:<72} ERROR {result['error']}")
+        else:
+            print(f"{case.key:<72} {result['seconds'] * 1000:>10.3f} ms "
+                  f"{result['allocated_bytes'] / 1e6:>9.2f} MB alloc "
+                  f"{result['peak_rss_bytes'] / 1e6:>8.1f} MB rss", flush=True)
+
+    print_engine_comparison(results)
+
+    report = {"environment": environment(), "threshold": args.threshold, "results": results}
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    failed = any("error" in result for result in results)
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} regressions over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            failed = True
+        else:
+            print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# benchmarks/import_time.py
+"""
+Cold import benchmark for the headless calculation core.
+
+Imports the core modules in fresh interpreters and exits non-zero if the
+fastest run goes over the time budget or if any UI library gets pulled in.
+
+Usage:
+    python benchmarks/import_time.py [--budget SECONDS] [--runs N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+CORE_MODULES = ["models", "validators", "formatters", "calculator", "batch"]
+UI_MODULES = ["streamlit", "altair", "pandas", "pyarrow", "tornado"]
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import {", ".join(CORE_MODULES)}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "ui_modules": sorted(name for name in {UI_MODULES!r} if name in sys.modules)
+}}))
+"""
+
+
+def measure(runs: int) -> dict:
+    """Import the core in `runs` fresh interpreters and keep the fastest one."""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        results.append(json.loads(output))
+    return min(results, key=lambda result: result["seconds"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.25, help="Maximum cold import time in seconds")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to time")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(f"core import: {result['seconds'] * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    if result["ui_modules"]:
+        print(f"FAIL: core imports UI modules: {', '.join(result['ui_modules'])}")
+        return 1
+    if result["seconds"] > args.budget:
+        print("FAIL: core import is over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+# benchmarks/load_test.py
+"""
+Load test for the HTTP/JSON service on localhost.
+
+Starts the service in a subprocess (unless --url points at a running one),
+then keeps --concurrency keep-alive connections busy with POST /schedule
+requests drawn from --unique distinct portfolios, so repeated requests
+exercise request coalescing and the response cache. Prints client-side
+throughput and latency percentiles next to the service's /health report.
+
+Usage:
+    python benchmarks/load_test.py [--requests N] [--concurrency N] [--unique N] [--workers N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+from hot_paths import make_portfolio  # noqa: E402
+
+
+def make_payloads(unique: int, debts: int, months: int):
+    payloads = []
+    for seed in range(unique):
+        portfolio, cash_flow = make_portfolio(debts, seed=seed)
+        payloads.append(json.dumps({
+            'debts': [
+                {'creditor': debt.creditor, 'balance': debt.balance, 'limit': debt.limit,
+                 'min_payment': debt.min_payment, 'apr': debt.apr}
+                for debt in portfolio
+            ],
+            'additional_cash_flow': cash_flow,
+            'months': months
+        }).encode('utf-8'))
+    return payloads
+
+
+async def request(reader, writer, host: str, method: str, path: str, body: bytes = b''):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(host: str, port: int, payloads, counter, results, seed: int):
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(seed)
+    try:
+        while counter[0] > 0:
+            counter[0] -= 1
+            body = rng.choice(payloads)
+            started = time.perf_counter()
+            status, _ = await request(reader, writer, host, 'POST', '/schedule', body)
+            results.append((status, time.perf_counter() - started))
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, payloads, requests: int, concurrency: int):
+    counter = [requests]
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, payloads, counter, results, seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await request(reader, writer, host, 'GET', '/health')
+    writer.close()
+    return results, elapsed, json.loads(health)
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Service did not start on {host}:{port}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Running service, e.g. http://127.0.0.1:8765; started locally when omitted")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent connections")
+    parser.add_argument("--unique", type=int, default=20, help="Distinct portfolios among the requests")
+    parser.add_argument("--debts", type=int, default=20, help="Debts per portfolio")
+    parser.add_argument("--months", type=int, default=360, help="Months per plan")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Service workers when started locally")
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'service', '--host', host, '--port', str(port), '--workers', str(args.workers)],
+            cwd=REPO_ROOT
+        )
+    try:
+        wait_for_port(host, port)
+        payloads = make_payloads(args.unique, args.debts, args.months)
+        results, elapsed, health = asyncio.run(run_load(host, port, payloads, args.requests, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies = np.array([seconds for _, seconds in results]) * 1000
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    p50, p90, p99 = np.percentile(latencies, (50, 90, 99))
+    print(f"{len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:,.0f} req/s), "
+          f"concurrency {args.concurrency}, {args.unique} distinct portfolios of {args.debts} debts")
+    print(f"client latency ms: p50 {p50:.1f}  p90 {p90:.1f}  p99 {p99:.1f}  max {latencies.max():.1f}")
+    print(f"status codes: {statuses}")
+    print(f"service: {json.dumps(health, indent=2)}")
+    return 0 if set(statuses) == {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
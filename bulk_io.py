@@ -0,0 +1,281 @@
+# bulk_io.py
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as pa_feather
+import pyarrow.parquet as pq
+from dataclasses import dataclass
+from batch import BatchCalculator, BatchResult
+from models import Debt
+from schedule import RepaymentSchedule, ScheduleMonth
+from strategies import StrategyLike
+from validators import InputValidator
+from typing import Hashable, Iterable, List, Optional, Union
+
+REQUIRED_COLUMNS = ('creditor', 'balance', 'limit', 'min_payment')
+NUMERIC_COLUMNS = ('balance', 'limit', 'min_payment', 'apr', 'additional_cash_flow')
+
+FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow'
+}
+
+SCHEDULE_SCHEMA = pa.schema([
+    ('month', pa.int32()),
+    ('creditor', pa.dictionary(pa.int32(), pa.string())),
+    ('min_payment', pa.float64()),
+    ('additional_payment', pa.float64()),
+    ('total_payment', pa.float64()),
+    ('balance', pa.float64()),
+    ('cash_flow_used', pa.float64()),
+    ('remaining_cash_flow', pa.float64()),
+    ('interest', pa.float64())
+])
+
+
+@dataclass
+class DebtTable:
+    """
+    Debts loaded from a file, split into rows ready to run and rows with errors.
+
+    `frame` has one row per debt with client_id, creditor, balance, limit,
+    min_payment, apr and additional_cash_flow columns, indexed by the row's
+    0-based position in the file. `errors` lists every invalid row with its
+    message.
+    """
+    frame: pd.DataFrame
+    errors: pd.DataFrame
+    rejected_clients: List[Hashable]
+
+    @property
+    def client_ids(self) -> List[Hashable]:
+        """Clients with debts to run, in order of first appearance."""
+        return pd.unique(self.frame['client_id']).tolist()
+
+    def debts(self, client_id: Optional[Hashable] = None) -> List[Debt]:
+        """Debt objects for one client, or for every row when client_id is None."""
+        rows = self.frame if client_id is None else self.frame[self.frame['client_id'] == client_id]
+        return [
+            Debt.create(creditor, balance, limit, min_payment, apr)
+            for creditor, balance, limit, min_payment, apr in zip(
+                rows['creditor'].tolist(),
+                rows['balance'].tolist(),
+                rows['limit'].tolist(),
+                rows['min_payment'].tolist(),
+                rows['apr'].tolist()
+            )
+        ]
+
+    def run(self, months_to_display: int, include_schedule: bool = False,
+            strategy: StrategyLike = "cash_flow_recap") -> BatchResult:
+        """Simulate every client in one batch."""
+        return BatchCalculator.calculate_batch_frame(
+            self.frame, months_to_display, include_schedule=include_schedule, strategy=strategy
+        )
+
+
+class BulkIO:
+    @staticmethod
+    def read_table(path: str, file_format: Optional[str] = None) -> pa.Table:
+        """
+        Read a CSV, Parquet or Arrow IPC / Feather file.
+
+        Args:
+        - path: File to read
+        - file_format: "csv", "parquet" or "arrow"; inferred from the extension when omitted
+
+        Returns:
+        - the file as an Arrow table
+        """
+        file_format = file_format or FORMATS.get(os.path.splitext(path)[1].lower())
+        if file_format == 'csv':
+            return pa_csv.read_csv(path)
+        if file_format == 'parquet':
+            return pq.read_table(path)
+        if file_format == 'arrow':
+            return pa_feather.read_table(path)
+        raise ValueError(f"Unsupported file format: {path}")
+
+    @staticmethod
+    def load_debts(path: str, file_format: Optional[str] = None, client_column: str = 'client_id',
+                   additional_cash_flow: float = 0.0, reject_client_on_error: bool = True) -> DebtTable:
+        """
+        Load and validate a file with one row per debt.
+
+        Args:
+        - path: CSV, Parquet or Arrow file
+        - file_format: "csv", "parquet" or "arrow"; inferred from the extension when omitted
+        - client_column: Column holding the client id; without it every row belongs to one client
+        - additional_cash_flow: Cash flow for clients when the file has no additional_cash_flow column
+        - reject_client_on_error: Drop every debt of a client that has an invalid row,
+          so no plan runs on a partial portfolio
+
+        Returns:
+        - debt table with the valid rows and the per-row errors
+        """
+        # Integer ids with blanks stay integers instead of turning into floats
+        frame = BulkIO.read_table(path, file_format).to_pandas(integer_object_nulls=True)
+        return BulkIO.validate_frame(
+            frame, client_column, additional_cash_flow, reject_client_on_error
+        )
+
+    @staticmethod
+    def validate_frame(frame: pd.DataFrame, client_column: str = 'client_id',
+                       additional_cash_flow: float = 0.0, reject_client_on_error: bool = True) -> DebtTable:
+        """Normalize columns and validate every row at once; see load_debts."""
+        missing = [column for column in REQUIRED_COLUMNS if column not in frame]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+        frame = frame.reset_index(drop=True)
+        normalized = pd.DataFrame({
+            'client_id': frame[client_column] if client_column in frame else 0,
+            'creditor': frame['creditor'].fillna('').astype(str)
+        }, index=frame.index)
+        for column in NUMERIC_COLUMNS:
+            if column in frame:
+                normalized[column] = pd.to_numeric(frame[column], errors='coerce').astype(np.float64)
+            else:
+                normalized[column] = additional_cash_flow if column == 'additional_cash_flow' else 0.0
+
+        errors = InputValidator.validate_debt_columns(
+            normalized['creditor'].to_numpy(),
+            normalized['balance'].to_numpy(),
+            normalized['limit'].to_numpy(),
+            normalized['min_payment'].to_numpy(),
+            normalized['apr'].to_numpy()
+        )
+        cash_flow = normalized['additional_cash_flow'].to_numpy()
+        with np.errstate(invalid='ignore'):
+            bad_cash_flow = (errors == "") & ~(cash_flow >= 0)
+        errors[bad_cash_flow] = "Additional cash flow must be a non-negative number"
+
+        client_ids = normalized['client_id']
+        blank_client = client_ids.isna().to_numpy()
+        if client_ids.dtype == object:
+            blank_client |= client_ids.map(lambda value: isinstance(value, str) and not value.strip()).to_numpy()
+        errors[blank_client] = "Client id cannot be empty"
+
+        invalid = errors != ""
+        error_frame = pd.DataFrame({
+            'row': np.flatnonzero(invalid),
+            'client_id': normalized['client_id'].to_numpy()[invalid],
+            'creditor': normalized['creditor'].to_numpy()[invalid],
+            'error': errors[invalid]
+        })
+
+        keep = ~invalid
+        rejected_clients: List[Hashable] = []
+        if reject_client_on_error and invalid.any():
+            rejected_clients = pd.unique(client_ids[invalid & ~blank_client]).tolist()
+            keep &= ~client_ids.isin(rejected_clients).to_numpy()
+
+        table = normalized[keep]
+        if client_ids.dtype == object:
+            table = table.assign(client_id=table['client_id'].infer_objects())
+        return DebtTable(table, error_frame, rejected_clients)
+
+    @staticmethod
+    def write_schedule(schedule: Union[RepaymentSchedule, Iterable[ScheduleMonth]], path: str,
+                       chunk_months: int = 120) -> int:
+        """
+        Write a schedule to Parquet in the legacy row layout, one row group per chunk.
+
+        Accepts a RepaymentSchedule or the months streamed by
+        DebtCalculator.iter_repayment_schedule; a stream is buffered at most
+        `chunk_months` months at a time.
+
+        Returns:
+        - number of rows written
+        """
+        rows = 0
+        with pq.ParquetWriter(path, SCHEDULE_SCHEMA) as writer:
+            for month_offset, chunk in BulkIO._schedule_chunks(schedule, chunk_months):
+                writer.write_table(BulkIO._schedule_table(chunk, month_offset))
+                rows += len(chunk)
+        return rows
+
+    @staticmethod
+    def write_batch_schedules(result: BatchResult, path: str, chunk_clients: int = 1000) -> int:
+        """
+        Write every client's schedule from a batch run to one Parquet file.
+
+        Rows carry a leading client_id column; each row group holds up to
+        `chunk_clients` clients. The batch must have been run with
+        include_schedule=True.
+
+        Returns:
+        - number of rows written
+        """
+        if result.balances is None:
+            raise ValueError("Batch was run without include_schedule=True")
+
+        client_type = pa.array(result.client_ids[:1]).type if len(result) else pa.int64()
+        schema = SCHEDULE_SCHEMA.insert(0, pa.field('client_id', client_type))
+        rows = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for start in range(0, len(result), chunk_clients):
+                tables = []
+                for client_id in result.client_ids[start:start + chunk_clients]:
+                    table = BulkIO._schedule_table(result.schedule(client_id))
+                    tables.append(table.add_column(
+                        0, 'client_id', pa.array([client_id] * table.num_rows, type=client_type)
+                    ))
+                if tables:
+                    chunk = pa.concat_tables(tables).unify_dictionaries()
+                    writer.write_table(chunk.cast(schema))
+                    rows += chunk.num_rows
+        return rows
+
+    @staticmethod
+    def _schedule_chunks(schedule: Union[RepaymentSchedule, Iterable[ScheduleMonth]], chunk_months: int):
+        """Month-range slices of a schedule as (month offset, RepaymentSchedule) pairs."""
+        if isinstance(schedule, RepaymentSchedule):
+            for start in range(0, schedule.months, chunk_months):
+                stop = start + chunk_months
+                yield start, RepaymentSchedule(
+                    schedule.creditors,
+                    schedule.balance[start:stop],
+                    schedule.total_payment[start:stop],
+                    schedule.min_payment[start:stop],
+                    schedule.interest[start:stop],
+                    schedule.cash_flow_used[start:stop],
+                    schedule.remaining_cash_flow[start:stop]
+                )
+            return
+
+        buffered: List[ScheduleMonth] = []
+        for month in schedule:
+            buffered.append(month)
+            if len(buffered) == chunk_months:
+                yield buffered[0].month - 1, BulkIO._stack_months(buffered)
+                buffered = []
+        if buffered:
+            yield buffered[0].month - 1, BulkIO._stack_months(buffered)
+
+    @staticmethod
+    def _stack_months(months: List[ScheduleMonth]) -> RepaymentSchedule:
+        return RepaymentSchedule(
+            months[0].creditors,
+            np.array([month.balance for month in months]),
+            np.array([month.total_payment for month in months]),
+            np.array([month.min_payment for month in months]),
+            np.array([month.interest for month in months]),
+            np.array([month.cash_flow_used for month in months]),
+            np.array([month.remaining_cash_flow for month in months])
+        )
+
+    @staticmethod
+    def _schedule_table(schedule: RepaymentSchedule, month_offset: int = 0) -> pa.Table:
+        """Arrow table of a schedule with months numbered from month_offset + 1."""
+        table = schedule.to_arrow()
+        if month_offset:
+            months = table.column('month').to_numpy() + month_offset
+            table = table.set_column(0, 'month', pa.array(months, type=pa.int32()))
+        return table.cast(SCHEDULE_SCHEMA)
@@ -0,0 +1,169 @@
+# cache.py
+import hashlib
+import itertools
+import json
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from models import Debt
+from strategies import STRATEGIES
+from typing import Any, Callable, Dict, Hashable, List
+
+
+def fingerprint(debts: List[Debt], additional_cash_flow: float, months_to_display: int, **options) -> str:
+    """
+    Content hash of a repayment plan's inputs.
+
+    Debts are hashed in the order given, since ties in the priority sort keep
+    input order. Extra keyword options (engine, strategy, ...) are part of the key.
+    """
+    canonical = {
+        'debts': [
+            [debt.creditor, float(debt.balance), float(debt.limit), float(debt.min_payment), float(debt.apr)]
+            for debt in debts
+        ],
+        'additional_cash_flow': float(additional_cash_flow),
+        'months_to_display': int(months_to_display),
+        'options': {name: _option_key(value) for name, value in options.items()}
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _option_key(value: Any) -> Any:
+    """
+    Stable key for an option value.
+
+    Plain values and registered strategies key by value or name. Anything
+    else, such as a custom key function, keys by identity: lambdas and local
+    functions share names, so a name could not tell two of them apart.
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    name = getattr(value, 'name', None)
+    if isinstance(name, str) and STRATEGIES.get(name) == value:
+        return name
+    return _identity_key(value)
+
+
+_identity_lock = threading.Lock()
+_identity_serials: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+_identity_counter = itertools.count(1)
+_pinned: Dict[int, Any] = {}
+
+
+def _identity_key(value: Any) -> str:
+    """Key unique to one object for the life of the process; unlike id(), serials are never reused."""
+    with _identity_lock:
+        try:
+            serial = _identity_serials.get(value)
+            if serial is None:
+                serial = _identity_serials[value] = next(_identity_counter)
+        except TypeError:
+            # Not weakly referenceable: keep the object alive so its id stays unique
+            _pinned[id(value)] = value
+            serial = f"id{id(value)}"
+    return f"{type(value).__qualname__}#{serial}"
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate bytes held by a cached value."""
+    if isinstance(value, tuple):
+        return sum(_sizeof(item) for item in value)
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    # Altair charts embed their data frames, on the chart or on each layer
+    data = getattr(value, 'data', None)
+    if hasattr(data, 'memory_usage'):
+        size += int(data.memory_usage(deep=True).sum())
+    layers = getattr(value, 'layer', None)
+    if isinstance(layers, list):
+        size += sum(_sizeof(layer) for layer in layers)
+    return size
+
+
+class ScheduleCache:
+    """
+    Thread-safe LRU cache bounded by entry count and total size.
+
+    One instance is shared by every Streamlit session in the process, so a
+    rerun or a second user with the same inputs is served without recomputing.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            # Values larger than the whole budget are returned but not kept
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+
+# Process-wide cache shared across sessions
+schedule_cache = ScheduleCache()
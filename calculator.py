@@ -1,10 +1,16 @@
 # calculator.py
 
 # Import necessary libraries and modules
-import streamlit as st
-import copy
-from models import Debt
-from typing import List, Tuple, Dict
+import numpy as np
+from instrumentation import instrumentation
+from models import Debt, DebtPortfolio
+from schedule import RepaymentSchedule, ScheduleMonth
+from strategies import StrategyLike, get_strategy
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Bump whenever a change alters the schedules the engines produce; stored
+# results from another version are recomputed instead of served
+ENGINE_VERSION = 1
 
 
 class DebtCalculator:
@@ -60,7 +66,9 @@ class DebtCalculator:
         return debts, remaining_cash_flow, total_payment_made
     
     @staticmethod
-    def calculate_repayment_schedule(debts: List[Debt], additional_cash_flow: float, months_to_display: int) -> tuple[List[Dict], int]:
+    def calculate_repayment_schedule(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                                     engine: str = "python",
+                                     strategy: StrategyLike = "cash_flow_recap") -> tuple[RepaymentSchedule, int]:
         """
         Calculate the complete repayment schedule.
         
@@ -68,47 +76,69 @@ class DebtCalculator:
         - debts: List of debts to process
         - additional_cash_flow: Extra money available BEYOND minimum payments
         - months_to_display: Maximum months to calculate
+        - engine: "python" for the reference loop, "numpy" for the array engine,
+          "cents" for the array engine on exact integer cents
+        - strategy: Priority order for extra payments, a strategy name, PriorityStrategy or key function
         
         Returns:
         - payment schedule
         - total months
         """
-        payment_schedule = []
+        if engine not in ("python", "numpy", "cents"):
+            raise ValueError(f"Unknown engine: {engine}")
+
+        with instrumentation.span("calculate_repayment_schedule", engine=engine, debts=len(debts)):
+            if engine == "python":
+                payment_schedule, total_months = DebtCalculator._calculate_repayment_schedule_python(
+                    debts, additional_cash_flow, months_to_display, strategy
+                )
+            else:
+                payment_schedule, total_months = DebtCalculator._calculate_repayment_schedule_numpy(
+                    debts, additional_cash_flow, months_to_display, cents=engine == "cents", strategy=strategy
+                )
+        instrumentation.count("months_simulated", total_months)
+        instrumentation.count("schedule_rows", len(payment_schedule))
+        return payment_schedule, total_months
+
+    @staticmethod
+    def _calculate_repayment_schedule_python(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                                             strategy: StrategyLike = "cash_flow_recap") -> tuple[RepaymentSchedule, int]:
+        """Reference month-by-month loop over Debt objects."""
+        balances, payments, min_payments, interest = [], [], [], []
+        cash_flow_used, remaining = [], []
         current_cash_flow = additional_cash_flow
         total_months = 0
         
-        # Make a deep copy of debts to avoid modifying the original list
-        working_debts = copy.deepcopy(debts)
-        sorted_debts = DebtCalculator.sort_debts_by_priority(working_debts)
+        # Work on copies to avoid modifying the original debts
+        with instrumentation.span("copy_debts"):
+            working_debts = [debt.copy() for debt in debts]
+        sorted_debts = DebtCalculator.sort_debts_by_priority(working_debts, strategy)
         
         # Track total minimum payments for reference
         total_min_payments = sum(debt.min_payment for debt in debts)
         
+        # Only debts with a balance take part in the monthly payment loop
+        active_debts = [debt for debt in sorted_debts if debt.balance > 0]
+        
         for month in range(1, months_to_display + 1):
-            month_payments = []
-            debts_snapshot = copy.deepcopy(sorted_debts)
+            interest.append(DebtCalculator.accrue_interest(sorted_debts))
+            balances_before = [debt.balance for debt in sorted_debts]
             
             # Calculate payments for this month
-            sorted_debts, remaining_cash_flow, total_payment = DebtCalculator.calculate_repayment(
-                sorted_debts, 
+            active_debts, remaining_cash_flow, total_payment = DebtCalculator.calculate_repayment(
+                active_debts, 
                 current_cash_flow
             )
             
             # Record payments and balances for each debt
-            for original, current in zip(debts_snapshot, sorted_debts):
-                payment = original.balance - current.balance if original.balance > current.balance else 0
-                month_payments.append({
-                    'month': month,
-                    'creditor': current.creditor,
-                    'min_payment': current.min_payment,
-                    'additional_payment': max(0, payment - current.min_payment),
-                    'total_payment': payment,
-                    'balance': current.balance,
-                    'cash_flow_used': current_cash_flow - remaining_cash_flow,
-                    'remaining_cash_flow': remaining_cash_flow
-                })
-            
-            payment_schedule.extend(month_payments)
+            payments.append([
+                before - debt.balance if before > debt.balance else 0
+                for before, debt in zip(balances_before, sorted_debts)
+            ])
+            balances.append([debt.balance for debt in sorted_debts])
+            min_payments.append([debt.min_payment for debt in sorted_debts])
+            cash_flow_used.append(current_cash_flow - remaining_cash_flow)
+            remaining.append(remaining_cash_flow)
             
             # When a debt is paid off, its minimum payment becomes additional cash flow
             newly_freed_payments = sum(
@@ -126,13 +156,256 @@ class DebtCalculator:
             
             total_months += 1
             
-            # Check if all debts are paid off
-            if all(debt.balance <= 0 for debt in sorted_debts):
+            # Paid-off debts drop out of the loop; stop once none are left
+            active_debts = [debt for debt in active_debts if debt.balance > 0]
+            if not active_debts:
                 break
         
+        shape = (total_months, len(sorted_debts))
+        payment_schedule = RepaymentSchedule(
+            [debt.creditor for debt in sorted_debts],
+            np.array(balances, dtype=np.float64).reshape(shape),
+            np.array(payments, dtype=np.float64).reshape(shape),
+            np.array(min_payments, dtype=np.float64).reshape(shape),
+            np.array(interest, dtype=np.float64).reshape(shape),
+            np.array(cash_flow_used, dtype=np.float64),
+            np.array(remaining, dtype=np.float64)
+        )
         return payment_schedule, total_months
+
+    @staticmethod
+    def accrue_interest(debts: List[Debt]) -> List[float]:
+        """Adds one month of interest to every debt with a balance and returns the interest per debt."""
+        interest = []
+        for debt in debts:
+            charge = debt.balance * debt.apr / 1200 if debt.balance > 0 else 0.0
+            debt.balance += charge
+            interest.append(charge)
+        return interest
+
+    @staticmethod
+    def accrue_interest_array(balance: np.ndarray, apr: np.ndarray) -> np.ndarray:
+        """
+        Array version of accrue_interest. Updates balance in place.
+        
+        Float balances are in dollars with APR in percent. Integer balances are
+        in cents with APR in ten-thousandths of a percent, and interest is
+        rounded half up to the cent so results are exact and reproducible.
+        
+        Returns:
+        - interest charged per debt
+        """
+        if balance.dtype.kind == 'i':
+            interest = np.where(balance > 0, (balance * apr + 6_000_000) // 12_000_000, 0)
+        else:
+            interest = np.where(balance > 0, balance * apr / 1200, 0.0)
+        balance += interest
+        return interest
+
+    @staticmethod
+    def apply_payments(balance: np.ndarray, min_payment: np.ndarray, cash_flow: float,
+                       active: Optional[np.ndarray] = None) -> float:
+        """
+        Array version of calculate_repayment. Updates balance in place.
+        
+        Args:
+        - balance: Balances in priority order
+        - min_payment: Minimum payments in priority order
+        - cash_flow: Extra money available BEYOND minimum payments
+        - active: Optional ascending positions of the debts that still carry a
+          balance; debts outside it are not touched
+        
+        Returns:
+        - remaining additional cash flow
+        """
+        if active is None:
+            active = np.flatnonzero(balance > 0)
+
+        # First, make all minimum payments
+        current = balance[active]
+        minimum = min_payment[active]
+        current = np.where(current <= minimum, 0, current - minimum)
+
+        # Then walk the waterfall; it stops at the first debt that absorbs
+        # the remaining cash, so only a handful of debts are touched
+        remaining_cash_flow = cash_flow
+        if remaining_cash_flow > 0:
+            for i in np.flatnonzero(current > 0):
+                owed = current[i].item()
+                additional_payment = min(remaining_cash_flow, owed)
+                current[i] = owed - additional_payment
+                remaining_cash_flow -= additional_payment
+                if remaining_cash_flow <= 0:
+                    break
+
+        balance[active] = current
+        return remaining_cash_flow
+
+    @staticmethod
+    def iter_repayment_schedule(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                                cents: bool = False, strategy: StrategyLike = "cash_flow_recap",
+                                sink=None) -> Iterator[ScheduleMonth]:
+        """
+        Stream the repayment schedule one month at a time.
+
+        Only the current month is held in memory, so very long horizons or
+        large portfolios can be written to disk or summarized as they are
+        produced. Stops after the month the last debt is paid off.
+
+        Args:
+        - debts: List of debts to process
+        - additional_cash_flow: Extra money available BEYOND minimum payments
+        - months_to_display: Maximum months to calculate
+        - cents: Simulate on exact integer cents
+        - strategy: Priority order for extra payments
+        - sink: Optional object whose update(month) is called with every month,
+          e.g. a ScheduleAggregates
+
+        Returns:
+        - iterator of ScheduleMonth in dollars
+        """
+        creditors, steps = DebtCalculator._simulate_months(
+            debts, additional_cash_flow, months_to_display, cents, strategy
+        )
+        scale = 100 if cents else 1
+        for month, (balance, payments, min_payment, interest, used, remaining, paid_off, _) in enumerate(steps, 1):
+            schedule_month = ScheduleMonth(
+                month,
+                creditors,
+                balance / scale,
+                payments / scale,
+                min_payment / scale,
+                interest / scale,
+                used / scale,
+                remaining / scale,
+                [creditors[i] for i in paid_off.tolist()]
+            )
+            if sink is not None:
+                sink.update(schedule_month)
+            instrumentation.count("months_streamed")
+            yield schedule_month
+
+    @staticmethod
+    def _simulate_months(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                         cents: bool = False, strategy: StrategyLike = "cash_flow_recap") -> Tuple[List[str], Iterator]:
+        """
+        Month-by-month array simulation shared by the full and streaming schedules.
+
+        Returns the creditors in priority order and the _run_months generator
+        for the sorted debts.
+        """
+        portfolio = debts if isinstance(debts, DebtPortfolio) else DebtPortfolio.from_debts(debts)
+        sorted_debts = DebtCalculator.sort_debts_by_priority(portfolio, strategy)
+        balance, min_payment, apr, additional_cash_flow = DebtCalculator._engine_arrays(
+            sorted_debts, additional_cash_flow, cents
+        )
+        steps = DebtCalculator._run_months(
+            balance, min_payment, apr, additional_cash_flow, additional_cash_flow, months_to_display
+        )
+        return list(sorted_debts.creditors), steps
+
+    @staticmethod
+    def _engine_arrays(sorted_debts: Union[List[Debt], DebtPortfolio], additional_cash_flow: float,
+                       cents: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Balances, minimum payments, APRs and cash flow in engine units: dollars, or integer cents.
+
+        The arrays are writable copies; the engine updates them in place.
+        """
+        if not isinstance(sorted_debts, DebtPortfolio):
+            sorted_debts = DebtPortfolio.from_debts(sorted_debts)
+        balance = np.array(sorted_debts.balance)
+        min_payment = np.array(sorted_debts.min_payment)
+        apr = np.array(sorted_debts.apr)
+
+        if cents:
+            balance = DebtCalculator.to_cents(balance)
+            min_payment = DebtCalculator.to_cents(min_payment)
+            apr = np.rint(apr * 10000).astype(np.int64)
+            additional_cash_flow = int(DebtCalculator.to_cents(additional_cash_flow))
+        return balance, min_payment, apr, additional_cash_flow
+
+    @staticmethod
+    def _run_months(balance: np.ndarray, min_payment: np.ndarray, apr: np.ndarray, additional_cash_flow,
+                    current_cash_flow, months: int) -> Iterator[tuple]:
+        """
+        Simulate from the given state, updating balance and min_payment in place.
+
+        Yields per month (balance, payments, min_payment, interest,
+        cash_flow_used, remaining_cash_flow, paid_off positions, cash flow for
+        the next month) and stops once every balance is zero.
+        """
+        active = np.flatnonzero(balance > 0)
+
+        for _ in range(months):
+            interest = DebtCalculator.accrue_interest_array(balance, apr)
+            previous = balance.copy()
+            remaining_cash_flow = DebtCalculator.apply_payments(balance, min_payment, current_cash_flow, active)
+            payments = np.where(previous > balance, previous - balance, 0)
+            month_min_payment = min_payment.copy()
+            cash_flow_used = current_cash_flow - remaining_cash_flow
+
+            # When a debt is paid off, its minimum payment becomes additional cash flow
+            freed = (balance == 0) & (min_payment > 0)
+            if freed.any():
+                current_cash_flow = additional_cash_flow + sum(min_payment[freed].tolist())
+                min_payment[balance == 0] = 0
+
+            # Paid-off debts drop out of the compacted active index
+            still_active = balance[active] > 0
+            paid_off = active[~still_active]
+            if len(paid_off):
+                active = active[still_active]
+
+            yield (balance.copy(), payments, month_min_payment, interest,
+                   cash_flow_used, remaining_cash_flow, paid_off, current_cash_flow)
+            if not len(active):
+                break
+
+    @staticmethod
+    def _calculate_repayment_schedule_numpy(debts: List[Debt], additional_cash_flow: float,
+                                            months_to_display: int, cents: bool = False,
+                                            strategy: StrategyLike = "cash_flow_recap") -> tuple[RepaymentSchedule, int]:
+        """Same schedule as the reference loop, simulated on NumPy arrays of dollars or integer cents."""
+        creditors, steps = DebtCalculator._simulate_months(
+            debts, additional_cash_flow, months_to_display, cents, strategy
+        )
+        dtype = np.int64 if cents else np.float64
+        balances = np.empty((months_to_display, len(creditors)), dtype=dtype)
+        payments = np.empty_like(balances)
+        min_payments = np.empty_like(balances)
+        interest = np.empty_like(balances)
+        cash_flow_used = np.empty(months_to_display, dtype=dtype)
+        remaining = np.empty(months_to_display, dtype=dtype)
+
+        total_months = 0
+        for month, step in enumerate(steps):
+            (balances[month], payments[month], min_payments[month], interest[month],
+             cash_flow_used[month], remaining[month], _, _) = step
+            total_months += 1
+
+        # Cents are converted back to dollars once, at the end
+        scale = 100 if cents else 1
+        payment_schedule = RepaymentSchedule(
+            creditors,
+            balances[:total_months] / scale,
+            payments[:total_months] / scale,
+            min_payments[:total_months] / scale,
+            interest[:total_months] / scale,
+            cash_flow_used[:total_months] / scale,
+            remaining[:total_months] / scale
+        )
+        return payment_schedule, total_months
+
+    @staticmethod
+    def to_cents(amount):
+        """Converts dollar amounts (scalar or array) to integer cents."""
+        return np.rint(np.asarray(amount, dtype=np.float64) * 100).astype(np.int64)
     
     @staticmethod
-    def sort_debts_by_priority(debts: List[Debt]) -> List[Debt]:
-        """Sorts debts by cash flow recapture percentage."""
-        return sorted(debts, key=lambda x: x.cash_flow_recap, reverse=True)
\ No newline at end of file
+    def sort_debts_by_priority(debts: Union[List[Debt], DebtPortfolio],
+                               strategy: StrategyLike = "cash_flow_recap") -> Union[List[Debt], DebtPortfolio]:
+        """Sorts debts by the given strategy, cash flow recapture percentage by default."""
+        if isinstance(debts, DebtPortfolio):
+            return get_strategy(strategy).order_portfolio(debts)
+        return get_strategy(strategy).order(debts)
\ No newline at end of file
@@ -0,0 +1,141 @@
+# charting.py
+"""
+Chart data for the payoff timeline.
+
+The schedule is reduced before it reaches Altair, which embeds every row in
+the chart spec sent to the browser: creditors beyond a series limit are
+summed per month, each line stops at its payoff month, and long lines are
+downsampled with Largest-Triangle-Three-Buckets (LTTB). Payoff months are
+always kept, so payoff events are drawn at their exact month.
+"""
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from schedule import RepaymentSchedule
+from typing import List
+
+DEFAULT_POINT_BUDGET = 2000
+MAX_SERIES = 10
+TOTAL_SERIES = 'All debts'
+OTHER_SERIES = 'Other debts'
+
+
+@dataclass
+class TimelineData:
+    """
+    Reduced payoff timeline.
+
+    `lines` has one row per plotted point with month, creditor (series name),
+    balance and total_payment columns. `payoffs` has one row per paid-off
+    debt with the month, creditor and the total balance left that month.
+    """
+    lines: pd.DataFrame
+    payoffs: pd.DataFrame
+    source_rows: int
+
+    @property
+    def points(self) -> int:
+        return len(self.lines) + len(self.payoffs)
+
+
+class ChartData:
+    @staticmethod
+    def payoff_timeline(schedule: RepaymentSchedule, point_budget: int = DEFAULT_POINT_BUDGET,
+                        max_series: int = MAX_SERIES) -> TimelineData:
+        """
+        Reduce a schedule to the points needed to draw its payoff timeline.
+
+        Args:
+        - schedule: Repayment schedule to plot
+        - point_budget: Approximate number of line points to keep over all series
+        - max_series: Creditors drawn individually, in priority order; the rest are summed
+
+        Returns:
+        - lines and payoff events ready for plotting
+        """
+        months = np.arange(1, schedule.months + 1)
+        balance = schedule.balance
+        paid = schedule.total_payment
+
+        # A debt's last plotted month is the one its balance reaches zero
+        cleared = balance <= 0
+        paid_off = cleared.any(axis=0)
+        payoff_row = np.where(paid_off, cleared.argmax(axis=0), schedule.months - 1)
+
+        total_balance = schedule.total_balance
+        series = [(TOTAL_SERIES, total_balance, schedule.total_paid, np.unique(payoff_row[paid_off]))]
+        shown = min(schedule.debt_count, max_series)
+        if shown < schedule.debt_count:
+            shown -= 1
+        for position in range(shown):
+            end = payoff_row[position] + 1
+            series.append((
+                schedule.creditors[position],
+                balance[:end, position],
+                paid[:end, position],
+                np.array([end - 1])
+            ))
+        if shown < schedule.debt_count:
+            rest = slice(shown, None)
+            other_balance = balance[:, rest].sum(axis=1)
+            end = payoff_row[rest].max() + 1
+            series.append((OTHER_SERIES, other_balance[:end], paid[:end, rest].sum(axis=1), np.array([end - 1])))
+
+        per_series = max(point_budget // len(series), 3)
+        frames = []
+        for name, values, payments, keep in series:
+            rows = np.union1d(ChartData.lttb(months[:len(values)], values, per_series), keep)
+            frames.append(pd.DataFrame({
+                'month': months[rows],
+                'creditor': name,
+                'balance': values[rows],
+                'total_payment': payments[rows]
+            }))
+        lines = pd.concat(frames, ignore_index=True)
+        lines['creditor'] = pd.Categorical(lines['creditor'], categories=list(dict.fromkeys(name for name, *_ in series)))
+
+        positions = np.flatnonzero(paid_off)
+        order = np.argsort(payoff_row[positions], kind='stable')
+        positions = positions[order]
+        payoffs = pd.DataFrame({
+            'month': months[payoff_row[positions]],
+            'creditor': [schedule.creditors[position] for position in positions.tolist()],
+            'balance': total_balance[payoff_row[positions]]
+        })
+        return TimelineData(lines, payoffs, len(schedule))
+
+    @staticmethod
+    def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+        """
+        Largest-Triangle-Three-Buckets downsampling.
+
+        Keeps the first and last points and, from each of budget - 2 buckets
+        in between, the point forming the largest triangle with the point
+        kept before it and the average of the next bucket.
+
+        Returns:
+        - sorted indices of the kept points
+        """
+        count = len(x)
+        if count <= budget:
+            return np.arange(count)
+        if budget < 3:
+            return np.array([0, count - 1])
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        edges = np.append(np.floor(np.linspace(1, count - 1, budget - 1)).astype(np.int64), count).tolist()
+        kept: List[int] = [0]
+        previous = 0
+        for bucket in range(budget - 2):
+            start, stop, next_stop = edges[bucket], edges[bucket + 1], edges[bucket + 2]
+            next_x = x[stop:next_stop].mean()
+            next_y = y[stop:next_stop].mean()
+            area = np.abs(
+                (x[previous] - next_x) * (y[start:stop] - y[previous])
+                - (x[previous] - x[start:stop]) * (next_y - y[previous])
+            )
+            previous = start + int(area.argmax())
+            kept.append(previous)
+        kept.append(count - 1)
+        return np.array(kept)
@@ -0,0 +1,190 @@
+# debtcalc.py
+"""
+Command-line batch runner.
+
+    python -m debtcalc run clients.parquet --workers 4
+
+Clients are split into shards that run on a process pool. Each finished shard
+is written to the output directory under its final name only once complete,
+so an interrupted run picks up where it stopped when started again with the
+same arguments.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from bulk_io import BulkIO
+from batch import BatchCalculator
+from instrumentation import instrumentation
+from strategies import STRATEGIES
+from typing import List, Optional, Tuple
+
+MANIFEST = 'manifest.json'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='debtcalc', description="Debt repayment batch runner")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Run every client in a CSV, Parquet or Arrow file")
+    run.add_argument('input', help="File with one row per debt")
+    run.add_argument('--output', help="Output directory, defaults to <input>.results")
+    run.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    run.add_argument('--months', type=int, default=360, help="Maximum months to calculate")
+    run.add_argument('--shard-size', type=int, default=1000, help="Clients per shard")
+    run.add_argument('--client-column', default='client_id', help="Column holding the client id")
+    run.add_argument('--strategy', choices=list(STRATEGIES), default='cash_flow_recap',
+                     help="Priority order for extra payments")
+    run.add_argument('--schedules', action='store_true', help="Also write every client's monthly schedule")
+    run.add_argument('--restart', action='store_true', help="Discard finished shards from an earlier run")
+
+    args = parser.parse_args(argv)
+    return run_batch(args)
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    output = args.output or os.path.splitext(args.input)[0] + '.results'
+    os.makedirs(output, exist_ok=True)
+
+    started = time.perf_counter()
+    table = BulkIO.load_debts(args.input, client_column=args.client_column)
+    if len(table.errors):
+        table.errors.to_csv(os.path.join(output, 'errors.csv'), index=False)
+        print(f"{len(table.errors)} invalid rows, {len(table.rejected_clients)} clients skipped "
+              f"(see {os.path.join(output, 'errors.csv')})")
+
+    # Clients are numbered in order of first appearance and cut into consecutive shards;
+    # rows without a client id were rejected by validation, so no code is -1
+    codes, _ = pd.factorize(table.frame['client_id'], sort=False)
+    if (codes < 0).any():
+        raise ValueError("Every debt needs a client id")
+    shard_rows = pd.Series(codes).groupby(codes // args.shard_size).indices
+    shard_count = len(shard_rows)
+
+    # Finished shards are only reused when they were produced from the same inputs
+    manifest = {
+        'input': os.path.abspath(args.input),
+        'input_size': os.path.getsize(args.input),
+        'input_mtime': os.path.getmtime(args.input),
+        'months': args.months,
+        'shard_size': args.shard_size,
+        'client_column': args.client_column,
+        'strategy': args.strategy,
+        'schedules': args.schedules,
+        'shards': shard_count
+    }
+    if not _check_manifest(output, manifest, args.restart):
+        print(f"{output} holds results of a different run; use --restart to discard them", file=sys.stderr)
+        return 2
+
+    tasks = []
+    for index in range(shard_count):
+        paths = _shard_paths(output, index, args.schedules)
+        if all(os.path.exists(path) for path in paths):
+            continue
+        tasks.append((index, table.frame.iloc[shard_rows[index]], args.months, args.strategy, paths))
+
+    skipped = shard_count - len(tasks)
+    if skipped:
+        print(f"Resuming: {skipped} of {shard_count} shards already done")
+
+    clients_run = 0
+    run_started = time.perf_counter()
+    try:
+        if args.workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                clients_run += _report(_run_shard(task), shard_count, clients_run, run_started)
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                futures = [pool.submit(_run_shard, task) for task in tasks]
+                try:
+                    for future in as_completed(futures):
+                        clients_run += _report(future.result(), shard_count, clients_run, run_started)
+                except KeyboardInterrupt:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+    except KeyboardInterrupt:
+        print(f"Interrupted after {clients_run} clients; run the same command again to resume", file=sys.stderr)
+        return 130
+
+    elapsed = time.perf_counter() - started
+    run_elapsed = time.perf_counter() - run_started
+    print(f"Done: {clients_run} clients in {run_elapsed:.2f}s "
+          f"({_throughput(clients_run, run_elapsed):,.0f} clients/s), {elapsed:.2f}s total -> {output}")
+    return 0
+
+
+def _check_manifest(output: str, manifest: dict, restart: bool) -> bool:
+    """Write the manifest for a new run; False when the directory belongs to another run."""
+    path = os.path.join(output, MANIFEST)
+    if os.path.exists(path) and not restart:
+        with open(path) as handle:
+            return json.load(handle) == manifest
+
+    for name in os.listdir(output):
+        if name.startswith(('summary-', 'schedules-')):
+            os.remove(os.path.join(output, name))
+    _atomic_write(path, lambda temp: _dump_json(manifest, temp))
+    return True
+
+
+def _shard_paths(output: str, index: int, schedules: bool) -> Tuple[str, ...]:
+    summary = os.path.join(output, f'summary-{index:05d}.parquet')
+    if schedules:
+        return summary, os.path.join(output, f'schedules-{index:05d}.parquet')
+    return (summary,)
+
+
+def _run_shard(task: Tuple) -> Tuple[int, int, float]:
+    """Process-pool entry point: simulate one shard and write its files."""
+    index, frame, months, strategy, paths = task
+    started = time.perf_counter()
+    with instrumentation.trace("shard", shard=index):
+        with instrumentation.span("simulate", rows=len(frame)):
+            result = BatchCalculator.calculate_batch_frame(
+                frame, months, include_schedule=len(paths) > 1, strategy=strategy
+            )
+        instrumentation.count("clients", len(result))
+
+        # The summary is written last, so its presence marks the shard as done
+        with instrumentation.span("write"):
+            if len(paths) > 1:
+                _atomic_write(paths[1], lambda temp: BulkIO.write_batch_schedules(result, temp))
+            _atomic_write(paths[0], lambda temp: result.to_frame().reset_index().to_parquet(temp, index=False))
+    return index, len(result), time.perf_counter() - started
+
+
+def _report(shard: Tuple[int, int, float], shard_count: int, clients_before: int, run_started: float) -> int:
+    index, clients, seconds = shard
+    done = clients_before + clients
+    elapsed = time.perf_counter() - run_started
+    print(f"shard {index + 1}/{shard_count}: {clients} clients in {seconds:.2f}s "
+          f"({_throughput(done, elapsed):,.0f} clients/s overall)", flush=True)
+    return clients
+
+
+def _throughput(clients: int, seconds: float) -> float:
+    return clients / seconds if seconds > 0 else 0.0
+
+
+def _atomic_write(path: str, write):
+    """Write through a temporary file and rename it into place."""
+    temp = f'{path}.tmp-{os.getpid()}'
+    try:
+        write(temp)
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def _dump_json(data: dict, path: str):
+    with open(path, 'w') as handle:
+        json.dump(data, handle, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
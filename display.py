@@ -4,7 +4,18 @@ import pandas as pd
 import altair as alt
 from models import Debt
 from formatters import Formatter
-from typing import List, Dict
+from schedule import RepaymentSchedule
+from charting import ChartData
+from montecarlo import MonteCarloSimulator, StressScenario, StressResult
+from sensitivity import SensitivityAnalyzer, DEFAULT_POINTS
+from solver import PayoffSolver
+from strategies import StrategyLike
+from cache import schedule_cache
+from instrumentation import instrumentation
+from dataclasses import astuple
+from typing import List, Dict, Optional
+
+PAGE_SIZES = (25, 100, 250, 1000)
 
 def display_header(self):
     """Displays the application header with custom styling."""
@@ -22,24 +33,15 @@ class DebtDisplay:
         st.title("💰 Debt Repayment Calculator")
         st.markdown("Track your path to financial freedom")
 
-    def get_month_data(self, payment_schedule: List[Dict], month: int) -> Dict:
+    def get_month_data(self, payment_schedule: RepaymentSchedule, month: int) -> Dict:
         """Get the debt states for a specific month."""
-        month_data = {}
-        for payment in payment_schedule:
-            if payment['month'] == month:
-                month_data[payment['creditor']] = {
-                    'balance': payment['balance'],
-                    'min_payment': payment['min_payment'],
-                    'additional_payment': payment['additional_payment'],
-                    'total_payment': payment['total_payment']
-                }
-        return month_data
+        return payment_schedule.month_data(month)
 
     def display_progress_metrics(self, debts: List[Debt], original_debts: List[Debt], 
-                               payment_schedule: List[Dict]):
+                               payment_schedule: RepaymentSchedule):
         """Displays key metrics and progress bars for selected month."""
-        # Get unique months from payment schedule
-        months = sorted(list(set(payment['month'] for payment in payment_schedule)))
+        # Months are indexed by the schedule itself
+        months = payment_schedule.month_numbers
         
         st.markdown("### View Progress By Month")
         selected_month = st.select_slider(
@@ -52,9 +54,10 @@ class DebtDisplay:
         # Get data for selected month
         month_data = self.get_month_data(payment_schedule, selected_month)
         
-        # Calculate progress for selected month
-        total_original = sum(d.balance for d in original_debts)
-        total_current = sum(data['balance'] for data in month_data.values())
+        # Calculate progress for selected month from the schedule's per-month totals
+        row = selected_month - 1
+        total_original = payment_schedule.starting_balance
+        total_current = float(payment_schedule.total_balance[row])
         total_progress = ((total_original - total_current) / total_original * 100) if total_original > 0 else 100
         
         # Display metrics for selected month
@@ -75,6 +78,22 @@ class DebtDisplay:
                 "Total Progress", 
                 f"{round(total_progress, 1)}%"
             )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(
+                "Paid So Far",
+                self.formatter.format_currency(float(payment_schedule.cumulative_paid[row]))
+            )
+        with col2:
+            st.metric(
+                "Interest So Far",
+                self.formatter.format_currency(float(payment_schedule.cumulative_interest[row]))
+            )
+        with col3:
+            st.metric(
+                "Freed Minimum Payments",
+                self.formatter.format_currency(float(payment_schedule.freed_min_payment[row]))
+            )
 
         # Display individual debt progress
         st.markdown("#### Individual Debt Progress")
@@ -99,33 +118,82 @@ class DebtDisplay:
                         monthly_payment = month_data[debt.creditor]['total_payment']
                         st.write(f"Payment: {self.formatter.format_currency(monthly_payment)}")
 
-    def display_payment_schedule(self, payment_schedule: List[Dict]):
+    def build_payment_chart(self, payment_schedule: RepaymentSchedule) -> alt.Chart:
+        """Builds the payoff timeline chart from a downsampled view of the schedule."""
+        timeline = ChartData.payoff_timeline(payment_schedule)
+        instrumentation.count("chart_points", timeline.points)
+        lines = alt.Chart(timeline.lines).mark_line().encode(
+            x=alt.X('month:Q', title='Month'),
+            y=alt.Y('balance:Q', title='Balance ($)'),
+            color=alt.Color('creditor:N', title='Creditor', sort=None),
+            tooltip=['month', 'creditor', 'total_payment', 'balance']
+        )
+        # Payoff events sit on the total balance line at their exact month
+        payoffs = alt.Chart(timeline.payoffs).mark_point(filled=True, size=60, color='black').encode(
+            x='month:Q',
+            y='balance:Q',
+            tooltip=[
+                alt.Tooltip('creditor', title='Paid off'),
+                alt.Tooltip('month', title='Month'),
+                alt.Tooltip('balance', title='Total balance left', format='$,.2f')
+            ]
+        )
+        return (lines + payoffs).properties(
+            width=700,
+            height=400,
+            title='Debt Payoff Timeline'
+        ).interactive()
+
+    def display_payment_schedule(self, payment_schedule: RepaymentSchedule, cache_key: Optional[str] = None):
         """Displays the monthly payment schedule."""
         st.markdown("### Payment Schedule")
         
-        # Create DataFrame for payment schedule
-        df = pd.DataFrame(payment_schedule)
+        # Create the chart, reusing the cached one on reruns
+        def build_chart():
+            with instrumentation.span("chart"):
+                return self.build_payment_chart(payment_schedule)
+
+        if cache_key is None:
+            chart = build_chart()
+        else:
+            chart = schedule_cache.get_or_compute((cache_key, 'chart'), build_chart)
         
         # Create tabs for different views
         tab1, tab2 = st.tabs(["📊 Chart View", "📑 Table View"])
         
-        with tab1:
-            # Create payment chart
-            chart_data = df.copy()
-            chart = alt.Chart(chart_data).mark_line(point=True).encode(
-                x=alt.X('month:Q', title='Month'),
-                y=alt.Y('balance:Q', title='Balance ($)'),
-                color=alt.Color('creditor:N', title='Creditor'),
-                tooltip=['month', 'creditor', 'total_payment', 'balance']
-            ).properties(
-                width=700,
-                height=400,
-                title='Debt Payoff Timeline'
-            ).interactive()
-            
+        with tab1, instrumentation.span("render_chart"):
             st.altair_chart(chart, use_container_width=True)
         
-        with tab2:
+        with tab2, instrumentation.span("render_table"):
+            # Only the selected page of the schedule is materialized and sent
+            col1, col2 = st.columns(2)
+            with col1:
+                creditors = st.multiselect(
+                    "Creditors",
+                    list(dict.fromkeys(payment_schedule.creditors)),
+                    placeholder="All creditors"
+                )
+            with col2:
+                if payment_schedule.months > 1:
+                    first_month, last_month = st.slider(
+                        "Months", 1, payment_schedule.months, (1, payment_schedule.months)
+                    )
+                else:
+                    first_month, last_month = 1, payment_schedule.months
+            window = payment_schedule.window(creditors, first_month, last_month)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+            with col2:
+                page = st.number_input("Page", min_value=1, max_value=window.page_count(page_size), value=1)
+            with instrumentation.span("table_page"):
+                df = window.page(page, page_size)
+            instrumentation.count("rows_emitted", len(df))
+
+            first_row = (page - 1) * page_size
+            st.caption(f"Rows {min(first_row + 1, len(window)):,}-{first_row + len(df):,} of {len(window):,}")
+
             # Display detailed table
             st.dataframe(
                 df,
@@ -155,6 +223,10 @@ class DebtDisplay:
                     "remaining_cash_flow": st.column_config.NumberColumn(
                         "Remaining Cash Flow",
                         format="$%.2f"
+                    ),
+                    "interest": st.column_config.NumberColumn(
+                        "Interest",
+                        format="$%.2f"
                     )
                 },
                 hide_index=True
@@ -172,14 +244,210 @@ class DebtDisplay:
             f"{years} years, {months} months"
         )
 
+    def display_stress_test(self, debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                            strategy: StrategyLike, cache_key: Optional[str] = None):
+        """Displays Monte Carlo payoff percentiles and a balance fan chart for the current plan."""
+        with st.expander("Stress test"):
+            with st.form(key="stress_test_form"):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    paths = st.number_input("Paths", min_value=100, max_value=50_000, value=10_000, step=1000)
+                    seed = st.number_input("Random seed", min_value=0, value=0, step=1)
+                with col2:
+                    volatility = st.slider("Monthly cash flow volatility (%)", 0, 100, 10)
+                    shock_probability = st.slider("Monthly chance of an income shock (%)", 0.0, 20.0, 2.0, 0.5)
+                    shock_months = st.slider("Shock length (months)", 1, 24, 3)
+                with col3:
+                    apr_drift = st.number_input("APR drift (points per month)", value=0.0, step=0.05, format="%.2f")
+                    apr_volatility = st.number_input(
+                        "APR volatility (points per month)", min_value=0.0, value=0.1, step=0.05, format="%.2f"
+                    )
+                submitted = st.form_submit_button("Run stress test")
+
+            scenario = StressScenario(
+                paths=int(paths),
+                seed=int(seed),
+                cash_flow_volatility=volatility / 100,
+                shock_probability=shock_probability / 100,
+                shock_months=int(shock_months),
+                apr_drift=float(apr_drift),
+                apr_volatility=float(apr_volatility)
+            )
+            stress_key = (cache_key, 'stress', astuple(scenario))
+            if submitted:
+                st.session_state.stress_key = stress_key
+            if st.session_state.get('stress_key') != stress_key:
+                return
+
+            def simulate():
+                with instrumentation.span("stress_test", paths=scenario.paths):
+                    return MonteCarloSimulator.simulate(
+                        debts, additional_cash_flow, months_to_display, scenario, strategy
+                    )
+
+            if cache_key is None:
+                result = simulate()
+            else:
+                result = schedule_cache.get_or_compute(stress_key, simulate)
+            self.display_stress_result(result)
+
+    def display_stress_result(self, result: StressResult):
+        """Displays the payoff percentiles and the balance fan chart of a stress test."""
+        st.metric("Paths debt free within the horizon", f"{result.probability_paid_off:.1%}")
+        cols = st.columns(len(result.percentiles))
+        for col, (percentile, month) in zip(cols, result.payoff_percentiles().items()):
+            with col:
+                st.metric(
+                    f"Payoff month, {percentile:g}th percentile",
+                    month if month is not None else f"> {result.months_to_display}"
+                )
+
+        bands = result.bands_frame()
+        low, high = bands.columns[1], bands.columns[-1]
+        median = f"p{50:g}" if 50 in result.percentiles else None
+        band = alt.Chart(bands).mark_area(opacity=0.3).encode(
+            x=alt.X('month:Q', title='Month'),
+            y=alt.Y(f'{low}:Q', title='Total balance ($)'),
+            y2=f'{high}:Q',
+            tooltip=['month'] + [alt.Tooltip(column, format='$,.2f') for column in bands.columns[1:]]
+        )
+        chart = band if median is None else band + alt.Chart(bands).mark_line().encode(x='month:Q', y=f'{median}:Q')
+        st.altair_chart(
+            chart.properties(title=f'Total balance, {low}-{high} band over {result.paths:,} paths'),
+            use_container_width=True
+        )
+
+    def display_sensitivity(self, debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                            strategy: StrategyLike, cache_key: Optional[str] = None):
+        """Displays how the payoff month responds to the additional cash flow."""
+        with st.expander("Cash flow sensitivity"):
+            points = st.slider("Grid points", 11, 201, DEFAULT_POINTS, 10)
+            cash_flows = SensitivityAnalyzer.cash_flow_grid(additional_cash_flow, debts, points)
+
+            def sweep():
+                with instrumentation.span("sensitivity", points=points):
+                    return SensitivityAnalyzer.sweep(debts, cash_flows, months_to_display, strategy)
+
+            if cache_key is None:
+                curve = sweep()
+            else:
+                curve = schedule_cache.get_or_compute((cache_key, 'sensitivity', points), sweep)
+
+            frame = curve.to_frame()
+            frame['payoff_month'] = frame['payoff_month'].astype('float')
+            line = alt.Chart(frame).mark_line(interpolate='step-after', point=True).encode(
+                x=alt.X('additional_cash_flow:Q', title='Additional monthly cash flow ($)'),
+                y=alt.Y('payoff_month:Q', title='Payoff month'),
+                tooltip=[
+                    alt.Tooltip('additional_cash_flow', title='Cash flow', format='$,.2f'),
+                    alt.Tooltip('payoff_month', title='Payoff month'),
+                    alt.Tooltip('total_interest', title='Total interest', format='$,.2f')
+                ]
+            )
+            current = alt.Chart(pd.DataFrame({'additional_cash_flow': [additional_cash_flow]})).mark_rule(
+                strokeDash=[4, 4]
+            ).encode(x='additional_cash_flow:Q')
+            st.altair_chart(
+                (line + current).properties(
+                    title=f'Payoff month by cash flow (missing points take longer than {months_to_display} months)'
+                ),
+                use_container_width=True
+            )
+
+    def display_goal_seek(self, debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                          strategy: StrategyLike, cache_key: Optional[str] = None):
+        """Displays the minimum cash flow for a target payoff month and the payoff month for a cash flow."""
+        with st.expander("Goal seek"):
+            col1, col2 = st.columns(2)
+            with col1:
+                target_month = st.number_input(
+                    "Debt free by month", min_value=1, max_value=1200, value=int(months_to_display), step=1
+                )
+
+                def seek():
+                    with instrumentation.span("goal_seek", target_month=int(target_month)):
+                        return PayoffSolver.minimum_cash_flow(debts, int(target_month), strategy)
+
+                if cache_key is None:
+                    goal = seek()
+                else:
+                    goal = schedule_cache.get_or_compute((cache_key, 'goal', int(target_month)), seek)
+                st.metric(
+                    "Minimum additional monthly cash flow",
+                    Formatter.format_currency(goal.additional_cash_flow),
+                    help=f"Debt free in month {goal.payoff_month}; found in {goal.evaluations} evaluations."
+                )
+            with col2:
+                cash_flow = st.number_input(
+                    "Additional monthly cash flow ($)", min_value=0.0, value=float(additional_cash_flow),
+                    step=50.0, format="%.2f", key="goal_seek_cash_flow"
+                )
+
+                def payoff():
+                    with instrumentation.span("goal_payoff_month"):
+                        return PayoffSolver.payoff_month(debts, float(cash_flow), 1200, strategy)
+
+                if cache_key is None:
+                    payoff_month = payoff()
+                else:
+                    payoff_month = schedule_cache.get_or_compute(
+                        (cache_key, 'goal_payoff_month', float(cash_flow)), payoff
+                    )
+                st.metric("Debt free in month", payoff_month if payoff_month is not None else "> 1200")
+
+    def display_cache_stats(self):
+        """Displays how often reruns were served from the shared schedule cache."""
+        stats = schedule_cache.stats()
+        with st.expander("Cache statistics"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Cache hits", stats['hits'])
+            with col2:
+                st.metric("Cache misses", stats['misses'])
+            with col3:
+                st.metric("Cached size", f"{stats['bytes'] / 1024 / 1024:.1f} MB")
+
+    def display_diagnostics(self):
+        """Displays the spans, counters and profiles of recent traces when instrumentation is on."""
+        if not instrumentation.enabled:
+            return
+        with st.expander("Diagnostics"):
+            report = instrumentation.last_report
+            if report is None:
+                st.write("No trace recorded yet.")
+                return
+
+            st.write(f"Last {report['trace']}: {report['duration_ms']:.1f} ms, logged to `{instrumentation.log_path}`")
+            st.dataframe(
+                pd.DataFrame([
+                    {'stage': '  ' * span['depth'] + span['name'], 'ms': span.get('duration_ms')}
+                    for span in report['spans']
+                ]),
+                hide_index=True
+            )
+            if report['counters']:
+                st.json(report['counters'])
+            if 'tracemalloc' in report:
+                st.write(f"Peak traced memory: {report['tracemalloc']['peak_bytes'] / 1024 / 1024:.1f} MB")
+                st.dataframe(pd.DataFrame(report['tracemalloc']['top']), hide_index=True)
+            if 'cprofile' in report:
+                st.code(report['cprofile'])
+            st.line_chart(
+                pd.DataFrame({'ms': [past['duration_ms'] for past in instrumentation.reports]}),
+                height=150
+            )
+
     def display_repayment_plan(self, debts: List[Debt], original_debts: List[Debt], 
-                             payment_schedule: List[Dict], total_months: int):
+                             payment_schedule: RepaymentSchedule, total_months: int,
+                             cache_key: Optional[str] = None):
         """Main method to display the complete repayment plan."""
         st.markdown("---")
-        self.display_progress_metrics(debts, original_debts, payment_schedule)
+        with instrumentation.span("progress_metrics"):
+            self.display_progress_metrics(debts, original_debts, payment_schedule)
         
         st.markdown("---")
-        self.display_payment_schedule(payment_schedule)
+        with instrumentation.span("payment_schedule"):
+            self.display_payment_schedule(payment_schedule, cache_key)
         
         st.markdown("---")
         self.display_summary(total_months)
\ No newline at end of file
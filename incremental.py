@@ -0,0 +1,331 @@
+# incremental.py
+import bisect
+import numpy as np
+from models import Debt
+from calculator import DebtCalculator
+from instrumentation import instrumentation
+from schedule import RepaymentSchedule
+from strategies import StrategyLike, get_strategy
+from typing import List, Optional, Tuple
+
+ENGINES = ("numpy", "cents")
+
+
+class IncrementalCalculator:
+    """
+    Repayment schedule that is kept up to date across edits.
+
+    The schedule matrices already hold the balances and minimum payments of
+    every month. Alongside them the calculator keeps a checkpoint at each
+    payoff event: the month and the cash flow in effect after it. Together
+    they restore the complete engine state at the start of any month.
+
+    Debts after the edited debt in priority order only receive cash it
+    passes on, and it passes cash on only in the month it is paid off.
+    Debts ahead of it never see it. So while the priority order is
+    unchanged, every other debt keeps its old rows until the edited debt is
+    paid off under the old or the new values. Only the edited debt is
+    replayed up to that month, from the cash that reaches it, and the array
+    engine resumes there for the tail. Changes to the cash flow, the number
+    or order of debts, or the priority order recompute everything.
+    Results are identical to calculate_repayment_schedule.
+
+    An edit costs the replay of one debt plus a full-width simulation of
+    the months after its payoff, so the saving depends on how late that
+    payoff is. Editing the last debt in priority order runs several times
+    faster than a full recompute; editing a debt paid off in the first few
+    months costs about as much as one, or a little more for the copy of the
+    kept months (see the incremental_edit cases in benchmarks/hot_paths.py).
+    """
+
+    def __init__(self, engine: str = "numpy", strategy: StrategyLike = "cash_flow_recap"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+        self.strategy = strategy
+        self.schedule: Optional[RepaymentSchedule] = None
+        self.total_months = 0
+        self.resumed_from: Optional[int] = None
+        self._debts: List[Debt] = []
+        self._order: List[int] = []
+        self._additional_cash_flow = 0.0
+        self._months_to_display = 0
+        self._checkpoints: List[Tuple[int, float]] = []
+        self._payoff: List[Optional[int]] = []
+
+    @property
+    def _scale(self) -> int:
+        return 100 if self.engine == "cents" else 1
+
+    def calculate(self, debts: List[Debt], additional_cash_flow: float,
+                  months_to_display: int) -> Tuple[RepaymentSchedule, int]:
+        """
+        Schedule for the given inputs, reusing the previous one where it still holds.
+
+        Args:
+        - debts: List of debts to process
+        - additional_cash_flow: Extra money available BEYOND minimum payments
+        - months_to_display: Maximum months to calculate
+
+        Returns:
+        - payment schedule
+        - total months
+        """
+        debts = list(debts)
+        with instrumentation.span("incremental_schedule", debts=len(debts)):
+            if not self._can_resume(debts, additional_cash_flow):
+                self._full(debts, additional_cash_flow, months_to_display)
+                return self.schedule, self.total_months
+
+            self.resumed_from = None
+            for position in self._changed_positions(debts):
+                edited = self._debts[:position] + [debts[position]] + self._debts[position + 1:]
+                if not self._edit(position, edited):
+                    self._full(debts, additional_cash_flow, months_to_display)
+                    return self.schedule, self.total_months
+
+            if months_to_display != self._months_to_display:
+                self._change_horizon(months_to_display)
+            self._debts = debts
+            self._relabel()
+        return self.schedule, self.total_months
+
+    def _can_resume(self, debts: List[Debt], additional_cash_flow: float) -> bool:
+        return (
+            self.schedule is not None
+            and len(debts) == len(self._debts)
+            and additional_cash_flow == self._additional_cash_flow
+        )
+
+    def _changed_positions(self, debts: List[Debt]) -> List[int]:
+        def values(debt: Debt):
+            return debt.balance, debt.limit, debt.min_payment, debt.apr
+
+        return [i for i, (old, new) in enumerate(zip(self._debts, debts)) if values(old) != values(new)]
+
+    def _priority_order(self, debts: List[Debt]) -> List[int]:
+        """Input positions in priority order."""
+        strategy = get_strategy(self.strategy)
+        return sorted(range(len(debts)), key=lambda i: strategy.key(debts[i]), reverse=strategy.reverse)
+
+    def _relabel(self):
+        """Creditor names do not affect the numbers, only the labels."""
+        creditors = [self._debts[i].creditor for i in self._order]
+        if creditors != self.schedule.creditors:
+            schedule = self.schedule
+            self.schedule = RepaymentSchedule(
+                creditors, schedule.balance, schedule.total_payment, schedule.min_payment,
+                schedule.interest, schedule.cash_flow_used, schedule.remaining_cash_flow
+            )
+
+    def _full(self, debts: List[Debt], additional_cash_flow: float, months_to_display: int):
+        self.resumed_from = None
+        self._debts = debts
+        self._order = self._priority_order(debts)
+        self._additional_cash_flow = additional_cash_flow
+        self._months_to_display = months_to_display
+        self._checkpoints = []
+        self._payoff = [None] * len(debts)
+
+        sorted_debts = [debts[i] for i in self._order]
+        balance, min_payment, apr, cash_flow = DebtCalculator._engine_arrays(
+            sorted_debts, additional_cash_flow, self.engine == "cents"
+        )
+        steps = DebtCalculator._run_months(balance, min_payment, apr, cash_flow, cash_flow, months_to_display)
+        self.schedule, self.total_months = self._collect(
+            [debt.creditor for debt in sorted_debts], None, 0, steps, cash_flow, months_to_display
+        )
+
+    def _collect(self, creditors: List[str], head: Optional[RepaymentSchedule], start: int, steps,
+                 cash_flow, months_to_display: int,
+                 overlay: Optional[Tuple[int, List[tuple]]] = None) -> Tuple[RepaymentSchedule, int]:
+        """
+        Build a schedule from the first `start` months of `head`, with the
+        overlay column written over them, followed by the engine steps.
+        Checkpoints are recorded for the new months.
+        """
+        scale = self._scale
+        shape = (months_to_display, len(creditors))
+        balances, payments, min_payments, interest = (np.empty(shape) for _ in range(4))
+        cash_flow_used, remaining = np.empty(months_to_display), np.empty(months_to_display)
+        if start:
+            balances[:start] = head.balance[:start]
+            payments[:start] = head.total_payment[:start]
+            min_payments[:start] = head.min_payment[:start]
+            interest[:start] = head.interest[:start]
+            cash_flow_used[:start] = head.cash_flow_used[:start]
+            remaining[:start] = head.remaining_cash_flow[:start]
+        if overlay is not None:
+            p, rows = overlay
+            columns = np.array(rows, dtype=np.float64) / scale
+            balances[:len(rows), p] = columns[:, 0]
+            payments[:len(rows), p] = columns[:, 1]
+            min_payments[:len(rows), p] = columns[:, 2]
+            interest[:len(rows), p] = columns[:, 3]
+
+        month = start
+        for balance, paid, minimum, charged, used, left, paid_off, next_cash_flow in steps:
+            balances[month] = balance / scale
+            payments[month] = paid / scale
+            min_payments[month] = minimum / scale
+            interest[month] = charged / scale
+            cash_flow_used[month] = used / scale
+            remaining[month] = left / scale
+            for position in paid_off.tolist():
+                self._payoff[position] = month
+            if len(paid_off) or next_cash_flow != cash_flow:
+                self._checkpoints.append((month, next_cash_flow))
+                cash_flow = next_cash_flow
+            month += 1
+
+        instrumentation.count("months_simulated", month - start)
+        schedule = RepaymentSchedule(
+            creditors, *(
+                column[:month].copy() if month < months_to_display else column
+                for column in (balances, payments, min_payments, interest, cash_flow_used, remaining)
+            )
+        )
+        return schedule, month
+
+    def _cash_flow_at(self, month: int):
+        """Cash flow in engine units for a 0-based month, from the checkpoints before it."""
+        index = bisect.bisect_left(self._checkpoints, (month,)) - 1
+        if index < 0:
+            return self._engine_cash_flow(self._additional_cash_flow)
+        return self._checkpoints[index][1]
+
+    def _engine_cash_flow(self, amount: float):
+        """Dollar amount in engine units."""
+        return int(DebtCalculator.to_cents(amount)) if self.engine == "cents" else amount
+
+    def _native(self, value: float):
+        """Schedule value back in engine units."""
+        return int(round(value * 100)) if self.engine == "cents" else value
+
+    def _edit(self, input_position: int, debts: List[Debt]) -> bool:
+        """Apply a change to one debt in place; False when a full recompute is needed."""
+        order = self._priority_order(debts)
+        old_debt, new_debt = self._debts[input_position], debts[input_position]
+        if order != self._order:
+            return False
+        if (old_debt.balance, old_debt.min_payment, old_debt.apr) == (new_debt.balance, new_debt.min_payment, new_debt.apr):
+            self._debts = debts
+            return True
+        if old_debt.balance <= 0 or new_debt.balance <= 0:
+            return False
+
+        old = self.schedule
+        p = order.index(input_position)
+        cents = self.engine == "cents"
+        sorted_debts = [debts[i] for i in order]
+        balance = self._engine_cash_flow(new_debt.balance)
+        minimum = self._engine_cash_flow(new_debt.min_payment)
+        apr = int(round(new_debt.apr * 10000)) if cents else new_debt.apr
+
+        # The old rows of every other debt hold until the edited debt is paid off
+        old_payoff = self._payoff[p]
+        limit = old.months if old_payoff is None else old_payoff
+        ahead = [j for j in range(p) if sorted_debts[j].balance > 0]
+        new_rows = []
+        old_balance, old_interest, old_minimum = old.balance, old.interest, old.min_payment
+
+        month = 0
+        while month < limit:
+            # Cash left after the debts ahead, replayed exactly from their old rows.
+            # The walk stops at the first debt that absorbs the rest, so only a
+            # few debts are read each month and paid-off ones are dropped on the way
+            cash = self._cash_flow_at(month)
+            index = 0
+            while index < len(ahead) and cash > 0:
+                j = ahead[index]
+                owed = self._native(old_balance.item(month - 1, j)) if month else self._engine_cash_flow(sorted_debts[j].balance)
+                if owed == 0:
+                    del ahead[index]
+                    continue
+                owed += self._native(old_interest.item(month, j))
+                owed_minimum = self._native(old_minimum.item(month, j))
+                owed = 0 if owed <= owed_minimum else owed - owed_minimum
+                if owed > 0:
+                    cash -= min(cash, owed)
+                index += 1
+
+            if cents:
+                charged = (balance * apr + 6_000_000) // 12_000_000
+            else:
+                charged = balance * apr / 1200
+            previous = balance + charged
+            current = 0 if previous <= minimum else previous - minimum
+            if current > 0 and cash > 0:
+                current -= min(cash, current)
+            if current == 0:
+                break
+
+            new_rows.append((current, previous - current if previous > current else 0, minimum, charged))
+            balance = current
+            month += 1
+
+        if month == 0:
+            return False
+
+        self._debts = debts
+        self.resumed_from = month + 1 if self.resumed_from is None else min(self.resumed_from, month + 1)
+        if month < old.months:
+            self._resume(month, (p, new_rows))
+        else:
+            self.schedule, _ = self._collect(
+                old.creditors, old, month, iter(()), None, old.months, (p, new_rows)
+            )
+        return True
+
+    def _resume(self, start: int, overlay: Optional[Tuple[int, List[tuple]]] = None):
+        """
+        Re-simulate every month from the 0-based `start` on, from the state restored there.
+
+        `overlay` replaces one debt's rows before `start` with (balance,
+        payment, minimum, interest) rows in engine units.
+        """
+        sorted_debts = [self._debts[i] for i in self._order]
+        cents = self.engine == "cents"
+        balance, min_payment, apr, additional_cash_flow = DebtCalculator._engine_arrays(
+            sorted_debts, self._additional_cash_flow, cents
+        )
+        if start:
+            head = self.schedule
+            balance = np.array([self._native(value) for value in head.balance[start - 1].tolist()], dtype=balance.dtype)
+            min_payment = np.array(
+                [self._native(value) for value in head.min_payment[start - 1].tolist()], dtype=min_payment.dtype
+            )
+            if overlay is not None:
+                p, rows = overlay
+                balance[p], min_payment[p] = rows[-1][0], rows[-1][2]
+            min_payment[balance == 0] = 0
+
+        cash_flow = self._cash_flow_at(start)
+        self._checkpoints = self._checkpoints[:bisect.bisect_left(self._checkpoints, (start,))]
+        self._payoff = [month if month is not None and month < start else None for month in self._payoff]
+        steps = DebtCalculator._run_months(
+            balance, min_payment, apr, additional_cash_flow, cash_flow, self._months_to_display - start
+        )
+        self.schedule, self.total_months = self._collect(
+            self.schedule.creditors, self.schedule, start, steps, cash_flow, self._months_to_display, overlay
+        )
+
+    def _change_horizon(self, months_to_display: int):
+        previous = self._months_to_display
+        self._months_to_display = months_to_display
+        if months_to_display < self.total_months:
+            # A shorter run is the same plan cut off earlier; copies let the longer buffers go
+            old = self.schedule
+            self.schedule = RepaymentSchedule(
+                old.creditors, old.balance[:months_to_display].copy(), old.total_payment[:months_to_display].copy(),
+                old.min_payment[:months_to_display].copy(), old.interest[:months_to_display].copy(),
+                old.cash_flow_used[:months_to_display].copy(), old.remaining_cash_flow[:months_to_display].copy()
+            )
+            self.total_months = months_to_display
+            self._checkpoints = [point for point in self._checkpoints if point[0] < months_to_display]
+            self._payoff = [month if month is not None and month < months_to_display else None
+                            for month in self._payoff]
+        elif self.total_months == previous and (self.schedule.balance[-1] > 0).any():
+            # The old plan ran out of months before every debt was paid off
+            self.resumed_from = previous + 1
+            self._resume(previous)
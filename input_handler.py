@@ -9,7 +9,7 @@ class DebtInputHandler:
     def __init__(self):
         self.validator = InputValidator()
     
-    def collect_debt_inputs(self, index: int) -> Tuple[str, float, float, float]:
+    def collect_debt_inputs(self, index: int) -> Tuple[str, float, float, float, float]:
         """Collects inputs for a single debt."""
         col1, col2 = st.columns(2)
         
@@ -21,4 +21,6 @@ class DebtInputHandler:
             limit = st.number_input(f"Credit limit:", min_value=0.0, step=0.01, key=f"limit_{index}")
             min_payment = st.number_input(f"Minimum payment:", min_value=0.0, step=0.01, key=f"min_payment_{index}")
         
-        return creditor, balance, limit, min_payment
+        apr = st.number_input(f"APR (%):", min_value=0.0, max_value=100.0, step=0.01, key=f"apr_{index}")
+        
+        return creditor, balance, limit, min_payment, apr
@@ -0,0 +1,177 @@
+# instrumentation.py
+"""
+Opt-in timing spans, counters and profiling for the calculation pipeline.
+
+Disabled unless an environment variable turns it on, in which case every
+trace (one app rerun, one CLI shard, ...) is appended as a JSON line to a
+local log and kept in memory for the diagnostics panel.
+
+- DEBTCALC_TRACE=1: record spans and counters
+- DEBTCALC_PROFILE=cprofile,tracemalloc: also capture a profile per trace (implies tracing)
+- DEBTCALC_TRACE_LOG=path: JSONL log file, defaults to debtcalc-trace.jsonl in the
+  system temporary directory, so traces never land in the working tree
+"""
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+ENV_TRACE = 'DEBTCALC_TRACE'
+ENV_PROFILE = 'DEBTCALC_PROFILE'
+ENV_LOG = 'DEBTCALC_TRACE_LOG'
+DEFAULT_LOG = os.path.join(tempfile.gettempdir(), 'debtcalc-trace.jsonl')
+PROFILERS = ('cprofile', 'tracemalloc')
+
+_DISABLED = nullcontext()
+
+
+class _Trace:
+    """Spans and counters collected on one thread between trace() enter and exit."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.depth = 0
+        self.spans: List[Dict] = []
+        self.counters: Dict[str, float] = {}
+
+
+class Instrumentation:
+    """
+    Collects spans and counters per thread, so concurrent Streamlit sessions
+    keep separate traces. Spans and counters outside a trace are ignored.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, profile: Optional[str] = None,
+                 log_path: Optional[str] = None, history: int = 20):
+        profile = os.environ.get(ENV_PROFILE, '') if profile is None else profile
+        self.profile = [name for name in (part.strip().lower() for part in profile.split(',')) if name in PROFILERS]
+        if enabled is None:
+            enabled = os.environ.get(ENV_TRACE, '').lower() in ('1', 'true', 'yes', 'on')
+        self.enabled = bool(enabled or self.profile)
+        self.log_path = log_path or os.environ.get(ENV_LOG) or DEFAULT_LOG
+        self.reports = deque(maxlen=history)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    @property
+    def last_report(self) -> Optional[Dict]:
+        return self.reports[-1] if self.reports else None
+
+    def _current(self) -> Optional[_Trace]:
+        return getattr(self._local, 'trace', None)
+
+    def span(self, name: str, **fields):
+        """Context manager timing one stage; nested spans are recorded with their depth."""
+        if not self.enabled or self._current() is None:
+            return _DISABLED
+        return self._span(name, fields)
+
+    @contextmanager
+    def _span(self, name: str, fields: Dict) -> Iterator[None]:
+        trace = self._current()
+        record = {'name': name, 'depth': trace.depth, 'start_ms': (time.perf_counter() - trace.started) * 1000}
+        record.update(fields)
+        trace.spans.append(record)
+        trace.depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['duration_ms'] = (time.perf_counter() - started) * 1000
+            trace.depth -= 1
+
+    def count(self, name: str, value: float = 1):
+        """Add to a named counter of the current trace."""
+        if not self.enabled:
+            return
+        trace = self._current()
+        if trace is not None:
+            trace.counters[name] = trace.counters.get(name, 0) + value
+
+    def trace(self, name: str, **fields):
+        """Context manager for one unit of work; writes its report when it ends."""
+        if not self.enabled or self._current() is not None:
+            return _DISABLED
+        return self._trace(name, fields)
+
+    @contextmanager
+    def _trace(self, name: str, fields: Dict) -> Iterator[None]:
+        trace = _Trace(name)
+        self._local.trace = trace
+        profiler = self._start_profilers()
+        try:
+            yield
+        finally:
+            duration_ms = (time.perf_counter() - trace.started) * 1000
+            report = {
+                'trace': name,
+                'timestamp': time.time(),
+                'thread': threading.current_thread().name,
+                'duration_ms': duration_ms,
+                **fields,
+                'spans': trace.spans,
+                'counters': trace.counters
+            }
+            report.update(self._stop_profilers(profiler))
+            self._local.trace = None
+            self.reports.append(report)
+            self._write(report)
+
+    def _start_profilers(self) -> Dict:
+        started = {}
+        if 'cprofile' in self.profile:
+            import cProfile
+
+            started['cprofile'] = cProfile.Profile()
+            started['cprofile'].enable()
+        if 'tracemalloc' in self.profile:
+            import tracemalloc
+
+            # Another tracer (or an outer benchmark) may already be running
+            started['tracemalloc'] = not tracemalloc.is_tracing()
+            if started['tracemalloc']:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        return started
+
+    def _stop_profilers(self, started: Dict) -> Dict:
+        results = {}
+        if 'cprofile' in started:
+            import io
+            import pstats
+
+            started['cprofile'].disable()
+            output = io.StringIO()
+            pstats.Stats(started['cprofile'], stream=output).sort_stats('cumulative').print_stats(25)
+            results['cprofile'] = output.getvalue()
+        if 'tracemalloc' in started:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            if started['tracemalloc']:
+                tracemalloc.stop()
+            results['tracemalloc'] = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top': [{'location': str(stat.traceback[0]), 'bytes': stat.size, 'count': stat.count} for stat in top]
+            }
+        return results
+
+    def _write(self, report: Dict):
+        import json
+
+        try:
+            with self._write_lock, open(self.log_path, 'a') as handle:
+                handle.write(json.dumps(report, default=str) + '\n')
+        except OSError:
+            # Diagnostics must never break the calculation
+            pass
+
+
+# Process-wide instance configured from the environment
+instrumentation = Instrumentation()
@@ -1,13 +1,17 @@
 # main.py
+import sqlite3
 import streamlit as st
-from models import Debt
+from models import Debt, DebtPortfolio
 from validators import InputValidator
 from formatters import Formatter
-from calculator import DebtCalculator
+from incremental import IncrementalCalculator
 from display import DebtDisplay
 from input_handler import DebtInputHandler
+from strategies import STRATEGIES
+from cache import fingerprint, schedule_cache
+from plan_store import plan_store
+from instrumentation import instrumentation
 from typing import List, Dict
-import copy
 
 # Set page config at the very top
 st.set_page_config(
@@ -99,6 +103,58 @@ def reset_calculation():
     st.session_state.calculation_complete = False
     st.session_state.original_debts = []
     st.session_state.payment_schedule = []
+    st.session_state.pop('incremental', None)
+    st.session_state.pop('plan_inputs', None)
+
+def open_saved_plan(key: str):
+    """Load a stored plan into the session; its schedule is memory-mapped unless already cached."""
+    def load():
+        stored, schedule = plan_store.open(key)
+        return schedule, stored.total_months
+
+    with instrumentation.span("open_plan"):
+        payment_schedule, total_months = schedule_cache.get_or_compute((key, 'schedule'), load)
+        plan = plan_store.get(key)
+    st.session_state.original_debts = DebtPortfolio.from_debts(plan.debts)
+    st.session_state.plan_inputs = (plan.additional_cash_flow, plan.months_to_display, plan.strategy)
+    st.session_state.schedule_key = key
+    st.session_state.payment_schedule = payment_schedule
+    st.session_state.total_months = total_months
+    st.session_state.submitted = True
+    st.session_state.calculation_complete = True
+
+def display_saved_plans():
+    """Sidebar controls to save the current plan and reopen stored ones."""
+    with st.sidebar:
+        st.header("Saved Plans")
+        try:
+            if st.session_state.calculation_complete:
+                name = st.text_input("Plan name", value="My plan")
+                if st.button("Save plan"):
+                    with instrumentation.span("save_plan"):
+                        plan = plan_store.save(
+                            name,
+                            st.session_state.original_debts.to_debts(),
+                            *st.session_state.plan_inputs,
+                            st.session_state.payment_schedule,
+                            st.session_state.total_months
+                        )
+                    st.success(f"Saved \"{plan.name}\"")
+
+            plans = plan_store.plans()
+            if not plans:
+                st.caption("No saved plans yet.")
+                return
+            selected = st.selectbox(
+                "Stored plans",
+                plans,
+                format_func=lambda plan: f"{plan.name} ({len(plan.debts)} debts, {plan.total_months} months)"
+            )
+            if st.button("Open plan"):
+                open_saved_plan(selected.key)
+                st.rerun()
+        except (OSError, sqlite3.Error) as error:
+            st.error(f"Plan store unavailable: {error}")
 
 def main():
     initialize_session_state()
@@ -106,7 +162,6 @@ def main():
     # Initialize components
     input_handler = DebtInputHandler()
     display = DebtDisplay()
-    calculator = DebtCalculator()
     
     # Display header
     display.display_header()
@@ -128,11 +183,19 @@ def main():
             months_to_display = st.number_input(
                 "Maximum months to calculate:",
                 min_value=1,
+                max_value=1200,
                 value=60,
                 step=1,
-                help="Maximum number of months to calculate the repayment plan"
+                help="Maximum number of months to calculate the repayment plan (up to 100 years)"
             )
         
+        strategy = st.selectbox(
+            "Extra payment priority:",
+            options=list(STRATEGIES),
+            format_func=lambda name: STRATEGIES[name].label,
+            help="Which debt receives the monthly cash flow first"
+        )
+        
         creditor_count = st.number_input(
             "Number of creditors:",
             min_value=1,
@@ -148,17 +211,17 @@ def main():
         
         for i in range(int(creditor_count)):
             st.write(f"### Debt {i + 1}")
-            creditor, balance, limit, min_payment = input_handler.collect_debt_inputs(i)
+            creditor, balance, limit, min_payment, apr = input_handler.collect_debt_inputs(i)
             
             is_valid, error_message = InputValidator.validate_debt_input(
-                creditor, balance, limit, min_payment
+                creditor, balance, limit, min_payment, apr
             )
             
             if not is_valid:
                 validation_errors.append((i + 1, error_message))
                 has_errors = True
             else:
-                debts.append(Debt.create(creditor, balance, limit, min_payment))
+                debts.append(Debt.create(creditor, balance, limit, min_payment, apr))
         
         submit_button = st.form_submit_button(label="Calculate Repayment Plan")
         
@@ -171,28 +234,66 @@ def main():
             elif not debts:
                 st.error("Please enter at least one debt.")
             else:
-                # Store original debts for progress tracking
-                st.session_state.original_debts = copy.deepcopy(debts)
+                # Store an immutable snapshot of the original debts for progress tracking
+                with instrumentation.span("snapshot"):
+                    st.session_state.original_debts = DebtPortfolio.from_debts(debts)
                 
-                # Calculate repayment schedule
-                payment_schedule, total_months = calculator.calculate_repayment_schedule(
-                    debts,
-                    monthly_cash_flow,
-                    months_to_display
-                )
+                # Edits to a previous plan only re-simulate the months they affect
+                incremental = st.session_state.get('incremental')
+                if incremental is None or incremental.strategy != strategy:
+                    incremental = IncrementalCalculator(engine="numpy", strategy=strategy)
+                    st.session_state.incremental = incremental
                 
+                # Calculate repayment schedule, or reuse it if these inputs were seen before
+                schedule_key = fingerprint(debts, monthly_cash_flow, months_to_display, strategy=strategy)
+                with instrumentation.span("schedule"):
+                    payment_schedule, total_months = schedule_cache.get_or_compute(
+                        (schedule_key, 'schedule'),
+                        lambda: incremental.calculate(debts, monthly_cash_flow, months_to_display)
+                    )
+                
+                st.session_state.schedule_key = schedule_key
+                st.session_state.plan_inputs = (monthly_cash_flow, months_to_display, strategy)
                 st.session_state.payment_schedule = payment_schedule
                 st.session_state.total_months = total_months
                 st.session_state.calculation_complete = True
     
+    display_saved_plans()
+
     # Display results if calculation is complete
     if st.session_state.calculation_complete:
-        display.display_repayment_plan(
-            debts,
+        plan_cash_flow, plan_months, plan_strategy = st.session_state.plan_inputs
+        with instrumentation.span("display"):
+            display.display_repayment_plan(
+                debts,
+                st.session_state.original_debts,
+                st.session_state.payment_schedule,
+                st.session_state.total_months,
+                st.session_state.get('schedule_key')
+            )
+        display.display_stress_test(
+            st.session_state.original_debts,
+            plan_cash_flow,
+            plan_months,
+            plan_strategy,
+            st.session_state.get('schedule_key')
+        )
+        display.display_sensitivity(
+            st.session_state.original_debts,
+            plan_cash_flow,
+            plan_months,
+            plan_strategy,
+            st.session_state.get('schedule_key')
+        )
+        display.display_goal_seek(
             st.session_state.original_debts,
-            st.session_state.payment_schedule,
-            st.session_state.total_months
+            plan_cash_flow,
+            plan_months,
+            plan_strategy,
+            st.session_state.get('schedule_key')
         )
+        display.display_cache_stats()
+        display.display_diagnostics()
         
         # Add a reset button
         if st.button("Reset Calculator"):
@@ -200,4 +301,5 @@ def main():
             st.rerun()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with instrumentation.trace("rerun"):
+        main()
\ No newline at end of file
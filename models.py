@@ -1,8 +1,9 @@
 # models.py
+import numpy as np
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-@dataclass
+@dataclass(slots=True)
 class Debt:
     creditor: str
     balance: float
@@ -10,10 +11,164 @@ class Debt:
     utilization: float
     cash_flow_recap: float
     min_payment: float
+    apr: float = 0.0
 
     @classmethod
-    def create(cls, creditor: str, balance: float, limit: float, min_payment: float) -> 'Debt':
+    def create(cls, creditor: str, balance: float, limit: float, min_payment: float, apr: float = 0.0) -> 'Debt':
         """Factory method to create a Debt instance with calculated fields."""
         utilization = (balance / limit * 100) if limit > 0 else 0
         cash_flow_recap = (min_payment / balance * 100) if balance > 0 else 0
-        return cls(creditor, balance, limit, utilization, cash_flow_recap, min_payment)
\ No newline at end of file
+        return cls(creditor, balance, limit, utilization, cash_flow_recap, min_payment, apr)
+
+    def copy(self) -> 'Debt':
+        """Independent copy; every field is immutable, so a shallow copy is enough."""
+        return Debt(self.creditor, self.balance, self.limit, self.utilization,
+                    self.cash_flow_recap, self.min_payment, self.apr)
+
+
+class DebtPortfolio:
+    """
+    Immutable set of debts stored as parallel arrays.
+
+    The arrays are read-only, so a snapshot is the portfolio itself and
+    `replace` shares every column it does not change. Utilization and cash
+    flow recapture are computed for all debts at once, on first use, with
+    the same formulas as Debt.create. Iterating yields Debt objects.
+    """
+    __slots__ = ('creditors', 'balance', 'limit', 'min_payment', 'apr', '_utilization', '_cash_flow_recap')
+
+    def __init__(self, creditors: Sequence[str], balance, limit, min_payment, apr=None,
+                 utilization=None, cash_flow_recap=None):
+        self.creditors: Tuple[str, ...] = tuple(creditors)
+        self.balance = self._column(balance)
+        self.limit = self._column(limit)
+        self.min_payment = self._column(min_payment)
+        self.apr = self._column(np.zeros(len(self.creditors)) if apr is None else apr)
+        if not len(self.creditors) == len(self.balance) == len(self.limit) == len(self.min_payment) == len(self.apr):
+            raise ValueError("All debt columns must have the same length")
+        self._utilization: Optional[np.ndarray] = None if utilization is None else self._column(utilization)
+        self._cash_flow_recap: Optional[np.ndarray] = None if cash_flow_recap is None else self._column(cash_flow_recap)
+
+    @staticmethod
+    def _column(values) -> np.ndarray:
+        column = np.array(values, dtype=np.float64)
+        column.flags.writeable = False
+        return column
+
+    @classmethod
+    def from_debts(cls, debts: Sequence[Debt]) -> 'DebtPortfolio':
+        """Portfolio of Debt objects, keeping their stored utilization and cash flow recapture."""
+        return cls(
+            [debt.creditor for debt in debts],
+            [debt.balance for debt in debts],
+            [debt.limit for debt in debts],
+            [debt.min_payment for debt in debts],
+            [debt.apr for debt in debts],
+            [debt.utilization for debt in debts],
+            [debt.cash_flow_recap for debt in debts]
+        )
+
+    @property
+    def utilization(self) -> np.ndarray:
+        if self._utilization is None:
+            utilization = np.zeros(len(self))
+            np.divide(self.balance, self.limit, out=utilization, where=self.limit > 0)
+            utilization *= 100
+            utilization.flags.writeable = False
+            self._utilization = utilization
+        return self._utilization
+
+    @property
+    def cash_flow_recap(self) -> np.ndarray:
+        if self._cash_flow_recap is None:
+            recap = np.zeros(len(self))
+            np.divide(self.min_payment, self.balance, out=recap, where=self.balance > 0)
+            recap *= 100
+            recap.flags.writeable = False
+            self._cash_flow_recap = recap
+        return self._cash_flow_recap
+
+    def snapshot(self) -> 'DebtPortfolio':
+        """O(1) snapshot: the portfolio never changes, so it is its own snapshot."""
+        return self
+
+    def replace(self, index: int, **changes) -> 'DebtPortfolio':
+        """
+        Copy with one debt's fields changed; unchanged columns are shared.
+
+        Args:
+        - index: Position of the debt to change
+        - changes: New values for creditor, balance, limit, min_payment or apr
+
+        Returns:
+        - new portfolio
+        """
+        portfolio = DebtPortfolio.__new__(DebtPortfolio)
+        for name in DebtPortfolio.__slots__:
+            setattr(portfolio, name, getattr(self, name))
+
+        for name, value in changes.items():
+            if name == 'creditor':
+                creditors = list(self.creditors)
+                creditors[index] = value
+                portfolio.creditors = tuple(creditors)
+            elif name in ('balance', 'limit', 'min_payment', 'apr'):
+                column = getattr(self, name).copy()
+                column[index] = value
+                column.flags.writeable = False
+                setattr(portfolio, name, column)
+            else:
+                raise TypeError(f"Unknown debt field: {name}")
+
+        # Derived columns are recomputed on next use when their inputs changed
+        if changes.keys() & {'balance', 'limit'}:
+            portfolio._utilization = None
+        if changes.keys() & {'balance', 'min_payment'}:
+            portfolio._cash_flow_recap = None
+        return portfolio
+
+    def take(self, positions: Sequence[int]) -> 'DebtPortfolio':
+        """Portfolio of the debts at the given positions, in that order."""
+        positions = np.asarray(positions, dtype=np.intp)
+        return DebtPortfolio(
+            [self.creditors[i] for i in positions.tolist()],
+            self.balance[positions],
+            self.limit[positions],
+            self.min_payment[positions],
+            self.apr[positions],
+            # Derived columns carry over only if already computed; otherwise they stay lazy
+            None if self._utilization is None else self._utilization[positions],
+            None if self._cash_flow_recap is None else self._cash_flow_recap[positions]
+        )
+
+    def __len__(self) -> int:
+        return len(self.creditors)
+
+    def __getitem__(self, index: int) -> Debt:
+        return Debt(
+            self.creditors[index],
+            float(self.balance[index]),
+            float(self.limit[index]),
+            float(self.utilization[index]),
+            float(self.cash_flow_recap[index]),
+            float(self.min_payment[index]),
+            float(self.apr[index])
+        )
+
+    def __iter__(self) -> Iterator[Debt]:
+        return iter(self.to_debts())
+
+    def to_debts(self) -> List[Debt]:
+        """Debt objects in portfolio order."""
+        return [
+            Debt(creditor, balance, limit, utilization, recap, min_payment, apr)
+            for creditor, balance, limit, utilization, recap, min_payment, apr in zip(
+                self.creditors,
+                self.balance.tolist(),
+                self.limit.tolist(),
+                self.utilization.tolist(),
+                self.cash_flow_recap.tolist(),
+                self.min_payment.tolist(),
+                self.apr.tolist()
+            )
+        ]
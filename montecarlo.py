@@ -0,0 +1,162 @@
+# montecarlo.py
+"""
+Monte Carlo stress testing of a repayment plan.
+
+Every path draws its own monthly additional cash flow (noise plus
+occasional income shocks) and a shared APR shift for the client's debts (a
+random walk), then the paths run together through the batch waterfall, so
+each path follows exactly the DebtCalculator rules. Results are
+reproducible for a given seed.
+"""
+import numpy as np
+from dataclasses import dataclass
+from batch import BatchCalculator
+from calculator import DebtCalculator
+from models import Debt, DebtPortfolio
+from strategies import StrategyLike
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_PERCENTILES = (10, 50, 90)
+
+
+@dataclass
+class StressScenario:
+    """
+    Distribution of the simulated paths.
+
+    Cash flow volatility and shock sizes are fractions of the base additional
+    cash flow; APR values are percentage points per month.
+    """
+    paths: int = 10_000
+    seed: Optional[int] = 0
+    cash_flow_volatility: float = 0.1
+    shock_probability: float = 0.02
+    shock_months: int = 3
+    shock_cash_flow: float = 0.0
+    apr_drift: float = 0.0
+    apr_volatility: float = 0.1
+
+    def draw(self, additional_cash_flow: float, months: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Random inputs for every path.
+
+        Returns:
+        - paths x months additional cash flow, never negative
+        - paths x months APR shift in percentage points
+        """
+        rng = np.random.default_rng(self.seed)
+        noise = rng.standard_normal((self.paths, months))
+        cash_flow = np.maximum(additional_cash_flow * (1 + self.cash_flow_volatility * noise), 0.0)
+
+        # A shock started in any of the last shock_months months cuts the cash flow
+        if self.shock_probability > 0 and self.shock_months > 0:
+            starts = np.cumsum(rng.random((self.paths, months)) < self.shock_probability, axis=1)
+            lagged = np.zeros_like(starts)
+            lagged[:, self.shock_months:] = starts[:, :-self.shock_months]
+            cash_flow = np.where(starts > lagged, cash_flow * self.shock_cash_flow, cash_flow)
+
+        steps = self.apr_drift + self.apr_volatility * rng.standard_normal((self.paths, months))
+        return cash_flow, np.cumsum(steps, axis=1)
+
+
+@dataclass
+class StressResult:
+    """
+    Outcome of every path.
+
+    `payoff_months` is the month each path became debt free, or 0 for paths
+    still in debt at the horizon. `balance_bands` holds the total balance
+    percentiles per month, one row per entry of `percentiles`.
+    """
+    percentiles: Tuple[float, ...]
+    months_to_display: int
+    payoff_months: np.ndarray
+    paid_off: np.ndarray
+    total_interest: np.ndarray
+    balance_bands: np.ndarray
+
+    @property
+    def paths(self) -> int:
+        return len(self.payoff_months)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.payoff_months, self.paid_off, self.total_interest, self.balance_bands))
+
+    @property
+    def probability_paid_off(self) -> float:
+        return float(self.paid_off.mean()) if self.paths else 0.0
+
+    def payoff_percentiles(self) -> Dict[float, Optional[int]]:
+        """
+        Payoff month at each percentile of the paths.
+
+        Paths that never pay off count as later than the horizon, so a
+        percentile that falls on them is None.
+        """
+        months = np.where(self.paid_off, self.payoff_months, np.inf)
+        values = np.percentile(months, self.percentiles, method='inverted_cdf') if self.paths else []
+        return {
+            percentile: int(value) if np.isfinite(value) else None
+            for percentile, value in zip(self.percentiles, np.atleast_1d(values).tolist())
+        }
+
+    def bands_frame(self):
+        """Fan chart data: one row per month with a pN column per percentile."""
+        import pandas as pd
+
+        data = {'month': np.arange(1, self.months_to_display + 1)}
+        for percentile, band in zip(self.percentiles, self.balance_bands):
+            data[f'p{percentile:g}'] = band
+        return pd.DataFrame(data)
+
+
+class MonteCarloSimulator:
+    @staticmethod
+    def simulate(debts: Union[List[Debt], DebtPortfolio], additional_cash_flow: float, months_to_display: int,
+                 scenario: Optional[StressScenario] = None, strategy: StrategyLike = "cash_flow_recap",
+                 percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> StressResult:
+        """
+        Run a repayment plan under many random cash flow and APR paths.
+
+        Args:
+        - debts: List of Debt objects or a DebtPortfolio
+        - additional_cash_flow: Base extra money available BEYOND minimum payments
+        - months_to_display: Maximum months to simulate per path
+        - scenario: Path distribution, StressScenario() defaults when omitted
+        - strategy: Priority order for extra payments
+        - percentiles: Percentiles reported for payoff months and balance bands
+
+        Returns:
+        - per-path outcomes with payoff percentiles and balance bands
+        """
+        scenario = scenario or StressScenario()
+        portfolio = debts if isinstance(debts, DebtPortfolio) else DebtPortfolio.from_debts(debts)
+        sorted_debts = DebtCalculator.sort_debts_by_priority(portfolio, strategy)
+        shape = (scenario.paths, len(sorted_debts))
+        cash_flow, apr_shift = scenario.draw(additional_cash_flow, months_to_display)
+
+        # Every path starts from the same debts; _simulate copies its inputs, so broadcast views suffice here
+        result = BatchCalculator._simulate(
+            np.broadcast_to(sorted_debts.balance, shape),
+            np.broadcast_to(sorted_debts.min_payment, shape),
+            np.broadcast_to(sorted_debts.apr, shape),
+            cash_flow[:, 0] if months_to_display else np.zeros(scenario.paths),
+            months_to_display,
+            include_schedule=False,
+            cash_flow_paths=cash_flow,
+            apr_shift=apr_shift,
+            track_total_balance=True
+        )
+
+        percentiles = tuple(percentiles)
+        bands = np.percentile(result['total_balance'], percentiles, axis=0) if scenario.paths \
+            else np.zeros((len(percentiles), months_to_display))
+        return StressResult(
+            percentiles,
+            months_to_display,
+            np.where(result['paid_off'], result['total_months'], 0),
+            result['paid_off'],
+            result['total_interest'],
+            bands
+        )
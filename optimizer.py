@@ -0,0 +1,267 @@
+# optimizer.py
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import permutations
+from models import Debt
+from schedule import RepaymentSchedule
+from solver import PayoffEvents, PayoffSolver
+from strategies import STRATEGIES
+from typing import List, Dict, Optional, Tuple
+
+OBJECTIVES = ("interest", "months")
+
+# Slack for rounding in the closed-form bound, in dollars or months
+BOUND_TOLERANCE = 1e-6
+
+
+@dataclass
+class OptimizationResult:
+    """Best payoff ordering found, with the plans it was compared against."""
+    objective: str
+    best_plan: str
+    best_order: List[str]
+    events: PayoffEvents
+    comparison: List[Dict]
+    nodes_evaluated: int
+    exhaustive: bool
+
+    def schedule(self, engine: str = "numpy") -> RepaymentSchedule:
+        """Full monthly schedule of the best plan."""
+        return self.events.schedule(engine)
+
+    def comparison_frame(self):
+        """Comparison table as a pandas DataFrame, best plan first."""
+        import pandas as pd
+
+        return pd.DataFrame(self.comparison)
+
+
+class PayoffOptimizer:
+    @staticmethod
+    def optimize(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                 objective: str = "interest", workers: Optional[int] = None,
+                 max_nodes: int = 20000, time_limit: float = 10.0) -> OptimizationResult:
+        """
+        Search payoff orderings for the one that minimizes total interest or months.
+
+        Every built-in strategy is evaluated first and the best one seeds the
+        search. Orderings are then explored depth first, one priority position
+        at a time, and a prefix is pruned as soon as its lower bound cannot beat
+        the best plan so far. Subtrees are spread across a process pool. When
+        the node budget or time limit runs out the best plan found so far is
+        returned and `exhaustive` is False.
+
+        Args:
+        - debts: List of debts to process
+        - additional_cash_flow: Extra money available BEYOND minimum payments
+        - months_to_display: Maximum months to calculate
+        - objective: "interest" or "months"
+        - workers: Worker processes, defaults to the CPU count; 1 searches in-process
+        - max_nodes: Node budget per subtree
+        - time_limit: Wall-clock seconds for the whole search
+
+        Returns:
+        - optimization result with the best plan and a comparison table
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+        debts = list(debts)
+
+        # Built-in strategies are the allocation policies to beat
+        candidates = []
+        for name, strategy in STRATEGIES.items():
+            ordered = strategy.order(debts)
+            order = [next(i for i, debt in enumerate(debts) if debt is ordered_debt) for ordered_debt in ordered]
+            events = _evaluate(debts, order, additional_cash_flow, months_to_display)
+            candidates.append((name, order, events))
+
+        best_name, best_order, best_events = min(
+            candidates, key=lambda candidate: _score(candidate[2], objective)
+        )
+        best_score = _score(best_events, objective)
+
+        # Subtrees rooted at the first two priority positions, most promising first
+        depth = 2 if len(debts) > 4 else 1
+        deadline = time.time() + time_limit
+        tasks = [
+            (debts, additional_cash_flow, months_to_display, objective, list(prefix),
+             [i for i in best_order if i not in prefix], best_score, max_nodes, deadline)
+            for prefix in permutations(best_order, min(depth, len(debts)))
+        ]
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(tasks) <= 1:
+            results = [_search_task(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_search_task, tasks))
+
+        nodes_evaluated = sum(result[2] for result in results)
+        exhaustive = all(result[3] for result in results)
+        for score, order, _, _ in results:
+            if order is not None and score < best_score:
+                best_name, best_score, best_order = "optimized", score, order
+
+        events = _evaluate(debts, best_order, additional_cash_flow, months_to_display)
+        if best_name == "optimized":
+            candidates.append(("optimized", best_order, events))
+
+        comparison = sorted(
+            (
+                {
+                    'plan': name,
+                    'order': [debts[i].creditor for i in order],
+                    'total_months': plan.total_months,
+                    'total_interest': plan.total_interest,
+                    'paid_off': _paid_off(plan)
+                }
+                for name, order, plan in candidates
+            ),
+            key=lambda row: (not row['paid_off'], row['total_' + objective], row['plan'] != best_name)
+        )
+
+        return OptimizationResult(
+            objective,
+            best_name,
+            [debts[i].creditor for i in best_order],
+            events,
+            comparison,
+            nodes_evaluated,
+            exhaustive
+        )
+
+
+def _keep_order(debt: Debt) -> int:
+    """Strategy key that leaves debts in the order they are given."""
+    return 0
+
+
+def _evaluate(debts: List[Debt], order: List[int], additional_cash_flow: float,
+              months_to_display: int) -> PayoffEvents:
+    return PayoffSolver.solve([debts[i] for i in order], additional_cash_flow, months_to_display, _keep_order)
+
+
+def _paid_off(events: PayoffEvents) -> bool:
+    return all(month is not None for month in events.payoff_months)
+
+
+def _score(events: PayoffEvents, objective: str) -> Tuple[float, float]:
+    """Objective first, the other measure as tie-breaker; plans that never finish rank last."""
+    if not _paid_off(events):
+        return math.inf, math.inf
+    if objective == "interest":
+        return events.total_interest, events.total_months
+    return events.total_months, events.total_interest
+
+
+class _BranchAndBound:
+    """Depth-first search over priority orderings below a fixed prefix."""
+
+    def __init__(self, debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                 objective: str, best_score: Tuple[float, float], max_nodes: int, deadline: float):
+        self.debts = debts
+        self.additional_cash_flow = additional_cash_flow
+        self.months_to_display = months_to_display
+        self.objective = objective
+        self.best_score = best_score
+        self.best_order: Optional[List[int]] = None
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.nodes = 0
+        self.complete = True
+
+    def search(self, prefix: List[int], rest: List[int]):
+        if self.nodes >= self.max_nodes or (self.nodes and time.time() > self.deadline):
+            self.complete = False
+            return
+        self.nodes += 1
+
+        # Completing the prefix with the heuristic order gives a feasible plan
+        order = prefix + rest
+        events = _evaluate(self.debts, order, self.additional_cash_flow, self.months_to_display)
+        score = _score(events, self.objective)
+        if score < self.best_score:
+            self.best_score, self.best_order = score, order
+
+        # Prefixes that can only tie on the objective may still win the tie-breaker
+        if len(rest) <= 1 or self.lower_bound(prefix, order, events) > self.best_score[0] + BOUND_TOLERANCE:
+            return
+        for child in rest:
+            self.search(prefix + [child], [i for i in rest if i != child])
+
+    def lower_bound(self, prefix: List[int], order: List[int], events: PayoffEvents) -> float:
+        """
+        Lower bound on the objective for any ordering that starts with `prefix`.
+
+        Until every prefix debt is paid off, the debts after it only ever get
+        their minimum payment, so the prefix payoff month and the prefix
+        interest are the same for every completion. From that month on, no
+        remaining debt can be paid faster than its minimum plus all of the
+        cash flow and every minimum payment combined.
+        """
+        prefix_months = events.payoff_months[:len(prefix)]
+        if any(month is None for month in prefix_months):
+            return math.inf
+
+        prefix_done = max(prefix_months, default=1)
+        bound = sum(events.interest[:len(prefix)]) if self.objective == "interest" else prefix_done
+        most_cash = self.additional_cash_flow + sum(debt.min_payment for debt in self.debts)
+
+        for i in order[len(prefix):]:
+            debt = self.debts[i]
+            rate = debt.apr / 1200
+            balance, interest, months = _pay_down(debt.balance, rate, debt.min_payment, prefix_done - 1)
+            if balance > 0:
+                balance, extra_interest, extra_months = _pay_down(
+                    balance, rate, debt.min_payment + most_cash, self.months_to_display - months
+                )
+                if balance > 0:
+                    return math.inf
+                interest += extra_interest
+                months += extra_months
+            if self.objective == "interest":
+                bound += interest
+            else:
+                bound = max(bound, months)
+        return bound
+
+
+def _pay_down(balance: float, rate: float, payment: float, months: int) -> Tuple[float, float, int]:
+    """
+    Closed-form run of one debt paying a fixed amount for up to `months` months.
+
+    Interest accrues before each payment. Returns the balance left (0 when
+    paid off), the interest charged and the months used.
+    """
+    if balance <= 0 or months <= 0:
+        return max(balance, 0.0), 0.0, 0
+
+    if payment > balance * rate:
+        to_payoff = -math.log1p(-rate * balance / payment) / math.log1p(rate) if rate > 0 else balance / payment
+        payoff_month = max(math.ceil(to_payoff - 1e-9), 1)
+    else:
+        payoff_month = math.inf
+
+    full_months = min(payoff_month - 1, months)
+    growth = (1 + rate) ** full_months
+    annuity = (growth - 1) / rate if rate > 0 else full_months
+    remaining = balance * growth - payment * annuity
+    interest = full_months * payment - (balance - remaining)
+
+    if full_months < months:
+        # The payoff month itself: interest on what is left, then paid in full
+        return 0.0, interest + remaining * rate, full_months + 1
+    return remaining, interest, full_months
+
+
+def _search_task(task: Tuple) -> Tuple[Tuple[float, float], Optional[List[int]], int, bool]:
+    """Process-pool entry point: search every ordering below one prefix."""
+    debts, additional_cash_flow, months_to_display, objective, prefix, rest, best_score, max_nodes, deadline = task
+    search = _BranchAndBound(
+        debts, additional_cash_flow, months_to_display, objective, best_score, max_nodes, deadline
+    )
+    search.search(prefix, rest)
+    return search.best_score, search.best_order, search.nodes, search.complete
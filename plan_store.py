@@ -0,0 +1,249 @@
+# plan_store.py
+"""
+Saved repayment plans on local disk.
+
+A SQLite index holds one row per plan, keyed by the plan's input
+fingerprint, so saving the same inputs twice stores them once. The schedule
+matrices sit next to it as one .npy file per column and are reopened with
+memory mapping: opening a plan reads no schedule data up front, and every
+process that opens it shares the same page-cache pages.
+
+Each plan records the ENGINE_VERSION that calculated it. A plan stored by
+another version is recalculated from its inputs when opened or saved again,
+so engine fixes reach plans saved before them.
+
+- DEBTCALC_PLAN_STORE=path: store directory, defaults to debtcalc-plans
+"""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import numpy as np
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from cache import fingerprint
+from calculator import DebtCalculator, ENGINE_VERSION
+from models import Debt
+from schedule import RepaymentSchedule
+from strategies import STRATEGIES, StrategyLike, get_strategy
+from typing import Iterator, List, Optional, Tuple
+
+ENV_STORE = 'DEBTCALC_PLAN_STORE'
+DEFAULT_ROOT = 'debtcalc-plans'
+INDEX_NAME = 'plans.sqlite'
+SCHEDULE_COLUMNS = ('balance', 'total_payment', 'min_payment', 'interest', 'cash_flow_used', 'remaining_cash_flow')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created REAL NOT NULL,
+    debts TEXT NOT NULL,
+    additional_cash_flow REAL NOT NULL,
+    months_to_display INTEGER NOT NULL,
+    strategy TEXT NOT NULL,
+    creditors TEXT NOT NULL,
+    total_months INTEGER NOT NULL,
+    engine_version INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+@dataclass
+class SavedPlan:
+    """Inputs and summary of a stored plan; the schedule itself is loaded separately."""
+    key: str
+    name: str
+    created: float
+    debts: List[Debt]
+    additional_cash_flow: float
+    months_to_display: int
+    strategy: str
+    creditors: List[str]
+    total_months: int
+    engine_version: int
+
+    @classmethod
+    def _from_row(cls, row: sqlite3.Row) -> 'SavedPlan':
+        return cls(
+            row['key'],
+            row['name'],
+            row['created'],
+            [Debt.create(*values) for values in json.loads(row['debts'])],
+            row['additional_cash_flow'],
+            row['months_to_display'],
+            row['strategy'],
+            json.loads(row['creditors']),
+            row['total_months'],
+            row['engine_version']
+        )
+
+
+class PlanStore:
+    """
+    SQLite index plus memory-mapped schedule columns under one directory.
+
+    Safe to share between threads and processes: index writes are SQLite
+    transactions, and schedule files are written to a temporary directory
+    and renamed into place before the plan is indexed.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.environ.get(ENV_STORE) or DEFAULT_ROOT
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def save(self, name: str, debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+             strategy: StrategyLike, schedule: RepaymentSchedule, total_months: int) -> SavedPlan:
+        """
+        Store a plan, or rename it if a plan with the same inputs is already stored.
+
+        A stored plan from another engine version gets the given schedule.
+
+        Args:
+        - name: Label shown when listing plans
+        - debts: Debts the plan was calculated from, in input order
+        - additional_cash_flow: Extra money available beyond minimum payments
+        - months_to_display: Horizon the plan was calculated for
+        - strategy: Priority order used for extra payments
+        - schedule: The calculated schedule
+        - total_months: Months the schedule covers
+
+        Returns:
+        - the stored plan
+        """
+        # Stored plans are reopened by name, so only registered strategies can be restored
+        strategy_name = getattr(strategy, 'name', strategy)
+        if not isinstance(strategy_name, str) or STRATEGIES.get(strategy_name) != get_strategy(strategy):
+            raise ValueError("Only registered strategies can be saved")
+        key = fingerprint(debts, additional_cash_flow, months_to_display, strategy=strategy_name)
+
+        with self._connect() as connection:
+            updated = connection.execute(
+                "UPDATE plans SET name = ? WHERE key = ? AND engine_version = ?", (name, key, ENGINE_VERSION)
+            ).rowcount
+        if not updated:
+            self._store(key, name, debts, additional_cash_flow, months_to_display, strategy_name, schedule,
+                        total_months)
+        return self.get(key)
+
+    def get(self, key: str) -> Optional[SavedPlan]:
+        """The stored plan with this fingerprint, or None."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM plans WHERE key = ?", (key,)).fetchone()
+        return SavedPlan._from_row(row) if row is not None else None
+
+    def plans(self) -> List[SavedPlan]:
+        """Every stored plan, newest first."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT * FROM plans ORDER BY created DESC").fetchall()
+        return [SavedPlan._from_row(row) for row in rows]
+
+    def open(self, key: str) -> Tuple[SavedPlan, RepaymentSchedule]:
+        """
+        Stored plan with its schedule.
+
+        The schedule columns are read-only memory maps of the stored files,
+        so they are paged in on first access rather than read here. A plan
+        stored by another engine version is recalculated and stored again
+        first.
+        """
+        plan = self.get(key)
+        if plan is None:
+            raise KeyError(key)
+        if plan.engine_version != ENGINE_VERSION:
+            schedule, total_months = DebtCalculator.calculate_repayment_schedule(
+                plan.debts, plan.additional_cash_flow, plan.months_to_display, "numpy", plan.strategy
+            )
+            self._store(key, plan.name, plan.debts, plan.additional_cash_flow, plan.months_to_display,
+                        plan.strategy, schedule, total_months)
+            return self.get(key), schedule
+        directory = self._schedule_dir(key)
+        columns = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r' if plan.total_months else None)
+            for name in SCHEDULE_COLUMNS
+        }
+        return plan, RepaymentSchedule(plan.creditors, **columns)
+
+    def delete(self, key: str) -> bool:
+        """Remove a stored plan; returns whether it existed."""
+        with self._connect() as connection:
+            deleted = connection.execute("DELETE FROM plans WHERE key = ?", (key,)).rowcount
+        # Open memory maps keep their pages until they are closed
+        self._remove_stale(key, keep=None)
+        return bool(deleted)
+
+    def _store(self, key: str, name: str, debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+               strategy: str, schedule: RepaymentSchedule, total_months: int):
+        """Write the schedule files, then index them under key at the current engine version."""
+        self._write_schedule(key, schedule)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO plans (key, name, created, debts, additional_cash_flow, months_to_display, "
+                "strategy, creditors, total_months, engine_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET name = excluded.name, creditors = excluded.creditors, "
+                "total_months = excluded.total_months, engine_version = excluded.engine_version",
+                (
+                    key, name, time.time(),
+                    json.dumps([
+                        [debt.creditor, float(debt.balance), float(debt.limit), float(debt.min_payment),
+                         float(debt.apr)]
+                        for debt in debts
+                    ]),
+                    float(additional_cash_flow), int(months_to_display), strategy,
+                    json.dumps(list(schedule.creditors)), int(total_months), ENGINE_VERSION
+                )
+            )
+        self._remove_stale(key)
+
+    def _write_schedule(self, key: str, schedule: RepaymentSchedule):
+        directory = self._schedule_dir(key)
+        if os.path.isdir(directory):
+            return
+        staging = tempfile.mkdtemp(prefix=f'.{key}-', dir=self.root)
+        try:
+            for name in SCHEDULE_COLUMNS:
+                np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(getattr(schedule, name)))
+            try:
+                os.rename(staging, directory)
+            except OSError:
+                # Another writer stored the same plan first
+                if not os.path.isdir(directory):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _remove_stale(self, key: str, keep: Optional[int] = ENGINE_VERSION):
+        """Remove the key's schedule files from engine versions other than keep."""
+        current = None if keep is None else os.path.basename(self._schedule_dir(key, keep))
+        for name in os.listdir(self.root):
+            if (name == key or name.startswith(f'{key}.v')) and name != current:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def _schedule_dir(self, key: str, version: int = ENGINE_VERSION) -> str:
+        return os.path.join(self.root, f'{key}.v{version}')
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection to the index inside one transaction, closed on exit."""
+        path = os.path.join(self.root, INDEX_NAME)
+        with self._lock:
+            if not self._ready:
+                os.makedirs(self.root, exist_ok=True)
+                with closing(sqlite3.connect(path, timeout=30)) as connection, connection:
+                    connection.execute(_SCHEMA)
+                    # Indexes created before plans recorded their engine version
+                    columns = {row[1] for row in connection.execute("PRAGMA table_info(plans)")}
+                    if 'engine_version' not in columns:
+                        connection.execute("ALTER TABLE plans ADD COLUMN engine_version INTEGER NOT NULL DEFAULT 0")
+                self._ready = True
+        with closing(sqlite3.connect(path, timeout=30)) as connection:
+            connection.row_factory = sqlite3.Row
+            with connection:
+                yield connection
+
+# Process-wide store configured from the environment
+plan_store = PlanStore()
@@ -0,0 +1,351 @@
+# schedule.py
+import numpy as np
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Dict, Iterator, ClassVar, Optional, Tuple
+
+
+@dataclass(eq=False)
+class RepaymentSchedule:
+    """
+    Columnar repayment schedule.
+
+    Per-debt values are months x debts matrices in priority order; values that
+    are shared by every debt in a month are stored once per month. Rows in the
+    legacy dict format are produced lazily, month by month, creditor by creditor,
+    so month m always occupies rows (m - 1) * debts to m * debts.
+    """
+    creditors: List[str]
+    balance: np.ndarray
+    total_payment: np.ndarray
+    min_payment: np.ndarray
+    interest: np.ndarray
+    cash_flow_used: np.ndarray
+    remaining_cash_flow: np.ndarray
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        'month', 'creditor', 'min_payment', 'additional_payment',
+        'total_payment', 'balance', 'cash_flow_used', 'remaining_cash_flow', 'interest'
+    )
+
+    @property
+    def months(self) -> int:
+        return self.balance.shape[0]
+
+    @property
+    def debt_count(self) -> int:
+        return len(self.creditors)
+
+    @cached_property
+    def additional_payment(self) -> np.ndarray:
+        """Payment above the minimum for each month and debt."""
+        return np.maximum(0.0, self.total_payment - self.min_payment)
+
+    @cached_property
+    def month_numbers(self) -> List[int]:
+        """Months covered by the schedule, 1-based."""
+        return list(range(1, self.months + 1))
+
+    @cached_property
+    def total_balance(self) -> np.ndarray:
+        """Sum of all balances at the end of each month."""
+        return self.balance.sum(axis=1)
+
+    @cached_property
+    def total_paid(self) -> np.ndarray:
+        """Sum of all payments made in each month."""
+        return self.total_payment.sum(axis=1)
+
+    @cached_property
+    def total_interest(self) -> np.ndarray:
+        """Sum of all interest charged in each month."""
+        return self.interest.sum(axis=1)
+
+    @cached_property
+    def cumulative_paid(self) -> np.ndarray:
+        """Sum of all payments made up to and including each month."""
+        return np.cumsum(self.total_paid)
+
+    @cached_property
+    def cumulative_interest(self) -> np.ndarray:
+        """Sum of all interest charged up to and including each month."""
+        return np.cumsum(self.total_interest)
+
+    @cached_property
+    def freed_min_payment(self) -> np.ndarray:
+        """Minimum payments of the debts paid off by the end of each month."""
+        if not self.months:
+            return np.zeros(0)
+        return ((self.balance <= 0) * self.min_payment[0]).sum(axis=1)
+
+    @property
+    def starting_balance(self) -> float:
+        """Total balance before the first month."""
+        if not self.months:
+            return 0.0
+        return float(self.total_balance[0] + self.total_paid[0] - self.total_interest[0])
+
+    def month_data(self, month: int) -> Dict[str, Dict[str, float]]:
+        """Debt states for a 1-based month, keyed by creditor."""
+        if not 1 <= month <= self.months:
+            return {}
+        row = month - 1
+        return {
+            creditor: {
+                'balance': balance,
+                'min_payment': min_paid,
+                'additional_payment': extra,
+                'total_payment': paid,
+                'interest': charged
+            }
+            for creditor, balance, min_paid, extra, paid, charged in zip(
+                self.creditors,
+                self.balance[row].tolist(),
+                self.min_payment[row].tolist(),
+                self.additional_payment[row].tolist(),
+                self.total_payment[row].tolist(),
+                self.interest[row].tolist()
+            )
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric columns."""
+        return sum(
+            getattr(self, name).nbytes
+            for name in ('balance', 'total_payment', 'min_payment', 'interest', 'cash_flow_used', 'remaining_cash_flow')
+        )
+
+    def __len__(self) -> int:
+        return self.months * self.debt_count
+
+    def __iter__(self) -> Iterator[Dict]:
+        for month in range(self.months):
+            yield from self._month_rows(month)
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("schedule row out of range")
+        month, debt = divmod(index, self.debt_count)
+        return self._row(month, debt)
+
+    def _row(self, month: int, debt: int) -> Dict:
+        return {
+            'month': month + 1,
+            'creditor': self.creditors[debt],
+            'min_payment': float(self.min_payment[month, debt]),
+            'additional_payment': float(self.additional_payment[month, debt]),
+            'total_payment': float(self.total_payment[month, debt]),
+            'balance': float(self.balance[month, debt]),
+            'cash_flow_used': float(self.cash_flow_used[month]),
+            'remaining_cash_flow': float(self.remaining_cash_flow[month]),
+            'interest': float(self.interest[month, debt])
+        }
+
+    def _month_rows(self, month: int) -> Iterator[Dict]:
+        used = float(self.cash_flow_used[month])
+        left = float(self.remaining_cash_flow[month])
+        for creditor, min_paid, extra, paid, bal, charged in zip(
+            self.creditors,
+            self.min_payment[month].tolist(),
+            self.additional_payment[month].tolist(),
+            self.total_payment[month].tolist(),
+            self.balance[month].tolist(),
+            self.interest[month].tolist()
+        ):
+            yield {
+                'month': month + 1,
+                'creditor': creditor,
+                'min_payment': min_paid,
+                'additional_payment': extra,
+                'total_payment': paid,
+                'balance': bal,
+                'cash_flow_used': used,
+                'remaining_cash_flow': left,
+                'interest': charged
+            }
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        One legacy column as a flat array in row order.
+
+        Per-debt columns are views of the months x debts matrices; per-month
+        columns and the month / creditor keys are expanded on request.
+        """
+        if name == 'month':
+            return np.repeat(np.arange(1, self.months + 1, dtype=np.int32), self.debt_count)
+        if name == 'creditor':
+            return np.tile(self._creditor_codes()[0], self.months)
+        if name in ('cash_flow_used', 'remaining_cash_flow'):
+            return np.repeat(getattr(self, name), self.debt_count)
+        if name in ('min_payment', 'additional_payment', 'total_payment', 'balance', 'interest'):
+            return np.ascontiguousarray(getattr(self, name)).reshape(-1)
+        raise KeyError(name)
+
+    def _creditor_codes(self) -> Tuple[np.ndarray, List[str]]:
+        """Dictionary-encode creditor names; duplicates share a code."""
+        categories: Dict[str, int] = {}
+        codes = np.array(
+            [categories.setdefault(creditor, len(categories)) for creditor in self.creditors],
+            dtype=np.int32
+        )
+        return codes, list(categories)
+
+    def to_pandas(self):
+        """DataFrame in the legacy row layout; numeric per-debt columns share memory with the schedule."""
+        import pandas as pd
+
+        codes, categories = self._creditor_codes()
+        data = {name: self.column(name) for name in self.COLUMNS if name != 'creditor'}
+        data['creditor'] = pd.Categorical.from_codes(np.tile(codes, self.months), categories=categories)
+        return pd.DataFrame({name: data[name] for name in self.COLUMNS}, copy=False)
+
+    def window(self, creditors: Optional[List[str]] = None, first_month: int = 1,
+               last_month: Optional[int] = None) -> 'ScheduleWindow':
+        """
+        Rows of some creditors over a month range, without copying the schedule.
+
+        Args:
+        - creditors: Creditors to keep, all when None or empty
+        - first_month: First 1-based month to keep
+        - last_month: Last 1-based month to keep, the final month when None
+
+        Returns:
+        - window whose pages are materialized on request
+        """
+        if creditors:
+            wanted = set(creditors)
+            positions = np.array([i for i, creditor in enumerate(self.creditors) if creditor in wanted], dtype=np.intp)
+        else:
+            positions = np.arange(self.debt_count, dtype=np.intp)
+        last_month = self.months if last_month is None else min(last_month, self.months)
+        return ScheduleWindow(self, positions, max(first_month, 1), last_month)
+
+    def to_arrow(self):
+        """Arrow table in the legacy row layout; numeric per-debt columns are zero-copy."""
+        import pyarrow as pa
+
+        codes, categories = self._creditor_codes()
+        arrays = {name: pa.array(self.column(name)) for name in self.COLUMNS if name != 'creditor'}
+        arrays['creditor'] = pa.DictionaryArray.from_arrays(
+            pa.array(np.tile(codes, self.months)), pa.array(categories, type=pa.string())
+        )
+        return pa.table({name: arrays[name] for name in self.COLUMNS})
+
+
+@dataclass(eq=False)
+class ScheduleWindow:
+    """
+    Filtered view of a schedule in the legacy row order.
+
+    Holds only the debt positions and month range; `page` gathers the values
+    of one page of rows, so the cost of showing a page does not grow with
+    the size of the schedule.
+    """
+    schedule: RepaymentSchedule
+    positions: np.ndarray
+    first_month: int
+    last_month: int
+
+    def __len__(self) -> int:
+        return max(self.last_month - self.first_month + 1, 0) * len(self.positions)
+
+    def page_count(self, page_size: int) -> int:
+        return max(-(-len(self) // page_size), 1)
+
+    def page(self, number: int, page_size: int):
+        """
+        One page of rows as a DataFrame with the legacy columns.
+
+        Args:
+        - number: 1-based page number, clamped to the available pages
+        - page_size: Rows per page
+
+        Returns:
+        - DataFrame of at most page_size rows
+        """
+        import pandas as pd
+
+        number = min(max(number, 1), self.page_count(page_size))
+        entries = np.arange((number - 1) * page_size, min(number * page_size, len(self)))
+        rows = self.first_month - 1 + entries // max(len(self.positions), 1)
+        debts = self.positions[entries % max(len(self.positions), 1)]
+
+        schedule = self.schedule
+        min_payment = schedule.min_payment[rows, debts]
+        total_payment = schedule.total_payment[rows, debts]
+        return pd.DataFrame({
+            'month': rows + 1,
+            'creditor': [schedule.creditors[debt] for debt in debts.tolist()],
+            'min_payment': min_payment,
+            'additional_payment': np.maximum(0.0, total_payment - min_payment),
+            'total_payment': total_payment,
+            'balance': schedule.balance[rows, debts],
+            'cash_flow_used': schedule.cash_flow_used[rows],
+            'remaining_cash_flow': schedule.remaining_cash_flow[rows],
+            'interest': schedule.interest[rows, debts]
+        })
+
+
+@dataclass(eq=False)
+class ScheduleMonth:
+    """One month of a streamed schedule; per-debt arrays are in priority order."""
+    month: int
+    creditors: List[str]
+    balance: np.ndarray
+    total_payment: np.ndarray
+    min_payment: np.ndarray
+    interest: np.ndarray
+    cash_flow_used: float
+    remaining_cash_flow: float
+    paid_off: List[str]
+
+    def rows(self) -> Iterator[Dict]:
+        """The month's rows in the legacy dict format."""
+        for creditor, min_paid, paid, bal, charged in zip(
+            self.creditors,
+            self.min_payment.tolist(),
+            self.total_payment.tolist(),
+            self.balance.tolist(),
+            self.interest.tolist()
+        ):
+            yield {
+                'month': self.month,
+                'creditor': creditor,
+                'min_payment': min_paid,
+                'additional_payment': max(0.0, paid - min_paid),
+                'total_payment': paid,
+                'balance': bal,
+                'cash_flow_used': self.cash_flow_used,
+                'remaining_cash_flow': self.remaining_cash_flow,
+                'interest': charged
+            }
+
+
+class ScheduleAggregates:
+    """
+    Running totals over a streamed schedule.
+
+    Pass an instance as the `sink` of DebtCalculator.iter_repayment_schedule
+    to keep totals and payoff events without holding any monthly rows.
+    """
+
+    def __init__(self):
+        self.months = 0
+        self.total_paid = 0.0
+        self.total_interest = 0.0
+        self.final_balance = 0.0
+        self.payoff_events: List[Tuple[int, str]] = []
+
+    def update(self, month: ScheduleMonth):
+        self.months = month.month
+        self.total_paid += float(month.total_payment.sum())
+        self.total_interest += float(month.interest.sum())
+        self.final_balance = float(month.balance.sum())
+        self.payoff_events.extend((month.month, creditor) for creditor in month.paid_off)
+
+    def payoff_month(self, creditor: str) -> Optional[int]:
+        """Month the creditor's balance reached zero, or None if it has not yet."""
+        return next((month for month, paid in self.payoff_events if paid == creditor), None)
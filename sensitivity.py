@@ -0,0 +1,105 @@
+# sensitivity.py
+"""
+Payoff sensitivity to the additional cash flow.
+
+Every value on a cash flow grid becomes one client of the batch waterfall,
+so the whole curve is simulated in a single pass, with exactly the
+DebtCalculator rules at each point.
+"""
+import numpy as np
+from dataclasses import dataclass
+from batch import BatchCalculator
+from calculator import DebtCalculator
+from models import Debt, DebtPortfolio
+from strategies import StrategyLike
+from typing import List, Optional, Sequence, Union
+
+DEFAULT_POINTS = 41
+
+
+@dataclass
+class SensitivityCurve:
+    """
+    Payoff month and total interest at each additional cash flow.
+
+    `payoff_months` is 0 where the debts are not paid off within
+    `months_to_display`.
+    """
+    months_to_display: int
+    cash_flows: np.ndarray
+    payoff_months: np.ndarray
+    paid_off: np.ndarray
+    total_interest: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.cash_flows, self.payoff_months, self.paid_off, self.total_interest))
+
+    def payoff_month(self, additional_cash_flow: float) -> Optional[int]:
+        """Payoff month at the grid point closest to the given cash flow, or None if not paid off."""
+        if not len(self.cash_flows):
+            return None
+        point = int(np.abs(self.cash_flows - additional_cash_flow).argmin())
+        return int(self.payoff_months[point]) if self.paid_off[point] else None
+
+    def to_frame(self):
+        """One row per grid point; payoff_month is missing where the debts are not paid off."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            'additional_cash_flow': self.cash_flows,
+            'payoff_month': pd.Series(self.payoff_months, dtype='Int64').mask(~self.paid_off),
+            'total_interest': self.total_interest
+        })
+
+
+class SensitivityAnalyzer:
+    @staticmethod
+    def cash_flow_grid(additional_cash_flow: float, debts: Union[List[Debt], DebtPortfolio],
+                       points: int = DEFAULT_POINTS) -> np.ndarray:
+        """
+        Evenly spaced cash flows from zero to twice the given one.
+
+        With no additional cash flow the grid runs up to the total minimum
+        payments instead.
+        """
+        upper = 2 * additional_cash_flow
+        if upper <= 0:
+            upper = sum(debt.min_payment for debt in debts) or 100.0
+        return np.round(np.linspace(0.0, upper, points), 2)
+
+    @staticmethod
+    def sweep(debts: Union[List[Debt], DebtPortfolio], cash_flows: Sequence[float], months_to_display: int,
+              strategy: StrategyLike = "cash_flow_recap") -> SensitivityCurve:
+        """
+        Simulate a repayment plan at every additional cash flow in one batched pass.
+
+        Args:
+        - debts: List of Debt objects or a DebtPortfolio
+        - cash_flows: Additional cash flow values to evaluate
+        - months_to_display: Maximum months to simulate per value
+        - strategy: Priority order for extra payments
+
+        Returns:
+        - payoff month and total interest per cash flow
+        """
+        portfolio = debts if isinstance(debts, DebtPortfolio) else DebtPortfolio.from_debts(debts)
+        sorted_debts = DebtCalculator.sort_debts_by_priority(portfolio, strategy)
+        cash_flows = np.asarray(cash_flows, dtype=np.float64)
+        shape = (len(cash_flows), len(sorted_debts))
+
+        result = BatchCalculator._simulate(
+            np.broadcast_to(sorted_debts.balance, shape),
+            np.broadcast_to(sorted_debts.min_payment, shape),
+            np.broadcast_to(sorted_debts.apr, shape),
+            cash_flows,
+            months_to_display,
+            include_schedule=False
+        )
+        return SensitivityCurve(
+            months_to_display,
+            cash_flows,
+            np.where(result['paid_off'], result['total_months'], 0),
+            result['paid_off'],
+            result['total_interest']
+        )
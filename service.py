@@ -0,0 +1,363 @@
+# service.py
+"""
+Local HTTP/JSON calculation service.
+
+    python -m service --port 8765 --workers 4
+
+- POST /schedule: repayment plan for a JSON body
+  {"debts": [{"creditor", "balance", "limit", "min_payment", "apr"}, ...],
+   "additional_cash_flow", "months", "strategy", "engine", "detail"}
+- GET /health: uptime, latency percentiles, queue depth, cache and coalescing counters
+
+Runs on asyncio without extra dependencies. Schedules are calculated and
+serialized on a process pool so the event loop never blocks; identical
+requests in flight share one calculation and finished responses are cached.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from cache import ScheduleCache, fingerprint
+from calculator import DebtCalculator
+from models import Debt
+from strategies import STRATEGIES
+from validators import InputValidator
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 1024 * 1024
+MAX_MONTHS = 1200
+LATENCY_WINDOW = 2048
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+
+class Overloaded(Exception):
+    """More calculations are queued than the service accepts."""
+
+
+@dataclass(frozen=True)
+class PlanRequest:
+    debts: Tuple[Debt, ...]
+    additional_cash_flow: float
+    months: int
+    strategy: str = "cash_flow_recap"
+    engine: str = "numpy"
+    detail: bool = False
+
+    @classmethod
+    def from_json(cls, data) -> 'PlanRequest':
+        """
+        Validate a decoded request body.
+
+        Raises:
+        - ValueError: with a message for the client when the body is invalid
+        """
+        if not isinstance(data, dict) or not isinstance(data.get('debts'), list) or not data['debts']:
+            raise ValueError("Body must be an object with a non-empty debts list")
+
+        debts = []
+        for position, item in enumerate(data['debts']):
+            try:
+                creditor = str(item['creditor'])
+                balance, limit, min_payment = (float(item[name]) for name in ('balance', 'limit', 'min_payment'))
+                apr = float(item.get('apr', 0.0))
+            except (KeyError, TypeError, ValueError, OverflowError):
+                raise ValueError(f"Debt {position + 1}: creditor, balance, limit and min_payment are required numbers")
+            if not all(np.isfinite([balance, limit, min_payment, apr])):
+                raise ValueError(f"Debt {position + 1}: amounts must be finite numbers")
+            is_valid, error = InputValidator.validate_debt_input(creditor, balance, limit, min_payment, apr)
+            if not is_valid:
+                raise ValueError(f"Debt {position + 1}: {error}")
+            debts.append(Debt.create(creditor, balance, limit, min_payment, apr))
+
+        try:
+            additional_cash_flow = float(data.get('additional_cash_flow', 0.0))
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("additional_cash_flow must be a number")
+        if not np.isfinite(additional_cash_flow) or additional_cash_flow < 0:
+            raise ValueError("additional_cash_flow must be a non-negative number")
+        months = data.get('months', 360)
+        # JSON true is a Python int and 12.7 would truncate, so only whole numbers pass
+        if isinstance(months, bool) or not isinstance(months, (int, float)) \
+                or isinstance(months, float) and not months.is_integer():
+            raise ValueError("months must be a whole number")
+        months = int(months)
+        if not 1 <= months <= MAX_MONTHS:
+            raise ValueError(f"months must be between 1 and {MAX_MONTHS}")
+
+        strategy = data.get('strategy', "cash_flow_recap")
+        if not isinstance(strategy, str) or strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of: {', '.join(STRATEGIES)}")
+        engine = data.get('engine', "numpy")
+        if not isinstance(engine, str) or engine not in ("python", "numpy", "cents"):
+            raise ValueError("engine must be python, numpy or cents")
+        detail = data.get('detail', False)
+        if not isinstance(detail, bool):
+            raise ValueError("detail must be true or false")
+        return cls(tuple(debts), additional_cash_flow, months, strategy, engine, detail)
+
+    @property
+    def key(self) -> str:
+        return fingerprint(
+            list(self.debts), self.additional_cash_flow, self.months,
+            strategy=self.strategy, engine=self.engine, detail=self.detail
+        )
+
+
+def compute_plan(request: PlanRequest) -> bytes:
+    """Process-pool entry point: calculate a plan and return the JSON response body."""
+    schedule, total_months = DebtCalculator.calculate_repayment_schedule(
+        list(request.debts), request.additional_cash_flow, request.months,
+        engine=request.engine, strategy=request.strategy
+    )
+    cleared = schedule.balance <= 0
+    payoff_months = np.where(cleared.any(axis=0), cleared.argmax(axis=0) + 1, 0).tolist()
+    remaining_balance = float(schedule.total_balance[-1]) if total_months else 0.0
+
+    response = {
+        'total_months': total_months,
+        'paid_off': remaining_balance <= 0,
+        'creditors': schedule.creditors,
+        'payoff_months': [month or None for month in payoff_months],
+        'total_paid': float(schedule.total_paid.sum()),
+        'total_interest': float(schedule.total_interest.sum()),
+        'remaining_balance': remaining_balance,
+        'monthly': {
+            'total_balance': schedule.total_balance.tolist(),
+            'total_paid': schedule.total_paid.tolist(),
+            'total_interest': schedule.total_interest.tolist()
+        }
+    }
+    if request.detail:
+        response['schedule'] = {
+            name: getattr(schedule, name).tolist()
+            for name in ('balance', 'total_payment', 'min_payment', 'interest', 'cash_flow_used', 'remaining_cash_flow')
+        }
+    return json.dumps(response, separators=(',', ':')).encode('utf-8')
+
+
+class CalculationService:
+    """
+    Request handling independent of the HTTP layer.
+
+    Cached response bodies are served from the event loop; misses go to the
+    process pool, and a request identical to one still running waits for
+    that calculation instead of starting another.
+    """
+
+    def __init__(self, workers: int = os.cpu_count() or 1, max_queue: int = 256,
+                 cache: Optional[ScheduleCache] = None):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.cache = cache or ScheduleCache()
+        self.started = time.time()
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.queue_depth = 0
+        self.connections = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.errors = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        """Route one request; returns the status code and the JSON body."""
+        if path == '/health':
+            if method != 'GET':
+                return 405, _error("Use GET")
+            return 200, json.dumps(self.health()).encode('utf-8')
+        if path != '/schedule':
+            return 404, _error(f"Unknown path: {path}")
+        if method != 'POST':
+            return 405, _error("Use POST")
+
+        started = time.perf_counter()
+        self.requests += 1
+        try:
+            request = PlanRequest.from_json(json.loads(body or b'null'))
+            response = await self.plan(request)
+        except (ValueError, UnicodeDecodeError) as error:
+            return 400, _error(str(error))
+        except Overloaded:
+            self.rejected += 1
+            return 503, _error("Too many calculations queued, retry later")
+        except Exception:
+            self.errors += 1
+            logger.exception("Calculation failed")
+            return 500, _error("Internal error")
+        self.latencies.append(time.perf_counter() - started)
+        return 200, response
+
+    async def plan(self, request: PlanRequest) -> bytes:
+        key = request.key
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        running = self._in_flight.get(key)
+        if running is not None:
+            self.coalesced += 1
+            return await asyncio.shield(running)
+
+        if self.queue_depth >= self.max_queue:
+            raise Overloaded()
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.queue_depth += 1
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(self.pool, compute_plan, request)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            # Waiters re-raise it; without any the exception is still marked as retrieved
+            future.exception()
+            raise
+        finally:
+            self.queue_depth -= 1
+            del self._in_flight[key]
+        self.cache.put(key, response)
+        future.set_result(response)
+        return response
+
+    def health(self) -> Dict:
+        latencies = np.array(self.latencies) * 1000
+        percentiles = np.percentile(latencies, (50, 90, 99)).tolist() if len(latencies) else [None] * 3
+        return {
+            'status': 'ok',
+            'uptime_s': time.time() - self.started,
+            'workers': self.workers,
+            'queue_depth': self.queue_depth,
+            'in_flight': len(self._in_flight),
+            'connections': self.connections,
+            'requests': self.requests,
+            'coalesced': self.coalesced,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'latency_ms': dict(zip(('p50', 'p90', 'p99'), percentiles), window=len(latencies)),
+            'cache': self.cache.stats()
+        }
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _error(message: str) -> bytes:
+    return json.dumps({'error': message}).encode('utf-8')
+
+
+async def serve_connection(service: CalculationService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP/1.1: one request at a time per connection, keep-alive by default."""
+    service.connections += 1
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                await _respond(writer, 400, _error("Malformed request line"), False)
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+            try:
+                length = int(headers.get('content-length') or 0)
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_BODY:
+                await _respond(writer, 413 if length > MAX_BODY else 400, _error("Bad Content-Length"), False)
+                break
+
+            body = await reader.readexactly(length) if length else b''
+            status, payload = await service.handle(method.upper(), target.split('?', 1)[0], body)
+            await _respond(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        service.connections -= 1
+        writer.close()
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool):
+    head = (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode('latin-1') + payload)
+    await writer.drain()
+
+
+async def serve(host: str, port: int, service: CalculationService, ready: Optional[asyncio.Event] = None):
+    server = await asyncio.start_server(
+        lambda reader, writer: serve_connection(service, reader, writer), host, port
+    )
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]} with {service.workers} workers", flush=True)
+    if ready is not None:
+        ready.set()
+
+    # SIGTERM stops serving cleanly, so main() still shuts the pool workers down
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+    async with server:
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='service', description="Debt repayment HTTP/JSON service")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Calculation processes")
+    parser.add_argument('--max-queue', type=int, default=256, help="Calculations queued before answering 503")
+    parser.add_argument('--cache-mb', type=int, default=256, help="Response cache size")
+    args = parser.parse_args(argv)
+
+    service = CalculationService(
+        args.workers, args.max_queue, ScheduleCache(max_entries=4096, max_bytes=args.cache_mb * 1024 * 1024)
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+# solver.py
+import numpy as np
+from dataclasses import dataclass
+from models import Debt
+from calculator import DebtCalculator
+from schedule import RepaymentSchedule
+from strategies import StrategyLike
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class PayoffEvents:
+    """Payoff timeline from the event-driven solver, without monthly rows."""
+    creditors: List[str]
+    payoff_months: List[Optional[int]]
+    interest: List[float]
+    total_months: int
+    debts: List[Debt]
+    additional_cash_flow: float
+    months_to_display: int
+    strategy: StrategyLike = "cash_flow_recap"
+
+    def payoff_month(self, creditor: str) -> Optional[int]:
+        """Month the creditor's balance reaches zero, or None if not within the horizon."""
+        return self.payoff_months[self.creditors.index(creditor)]
+
+    @property
+    def total_interest(self) -> float:
+        return sum(self.interest)
+
+    def schedule(self, engine: str = "numpy") -> RepaymentSchedule:
+        """Build the full monthly schedule for the same inputs."""
+        payment_schedule, _ = DebtCalculator.calculate_repayment_schedule(
+            self.debts, self.additional_cash_flow, self.months_to_display,
+            engine=engine, strategy=self.strategy
+        )
+        return payment_schedule
+
+
+@dataclass
+class CashFlowGoal:
+    """Smallest additional cash flow found to be debt free by a target month."""
+    target_month: int
+    additional_cash_flow: float
+    payoff_month: int
+    evaluations: int
+
+
+class PayoffSolver:
+    @staticmethod
+    def solve(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+              strategy: StrategyLike = "cash_flow_recap") -> PayoffEvents:
+        """
+        Find payoff months by jumping from one payoff event to the next.
+
+        Between events every active debt pays its minimum and the extra cash
+        goes to the first active debt, so each balance follows the amortization
+        formula for a fixed monthly payment (plain arithmetic without interest)
+        and the idle stretch can be applied in one step. Event months themselves
+        run through DebtCalculator.apply_payments, so the freed cash flow rules
+        are the same as the month-by-month loop.
+
+        Args:
+        - debts: List of debts to process
+        - additional_cash_flow: Extra money available BEYOND minimum payments
+        - months_to_display: Maximum months to calculate
+        - strategy: Priority order for extra payments
+
+        Returns:
+        - payoff events with per-debt payoff months and total months
+        """
+        sorted_debts = DebtCalculator.sort_debts_by_priority(debts, strategy)
+        balance = np.array([debt.balance for debt in sorted_debts], dtype=np.float64)
+        min_payment = np.array([debt.min_payment for debt in sorted_debts], dtype=np.float64)
+        apr = np.array([debt.apr for debt in sorted_debts], dtype=np.float64)
+        rate = apr / 1200
+        interest = np.zeros_like(balance)
+        payoff_months = np.where(balance > 0, 0, 1)
+
+        current_cash_flow = additional_cash_flow
+        month = 0
+
+        while month < months_to_display:
+            # Month 1 always runs exactly so debts that start at zero free their minimums
+            if month > 0:
+                idle_months, monthly_payment = PayoffSolver._idle_months(
+                    balance, min_payment, rate, current_cash_flow
+                )
+                # No debt will ever be paid off: run out the horizon in one step
+                if idle_months is None:
+                    idle_months = months_to_display - month
+                idle_months = min(idle_months, months_to_display - month)
+                if idle_months:
+                    interest += PayoffSolver._amortize(balance, rate, monthly_payment, idle_months)
+                    month += idle_months
+                    if month >= months_to_display:
+                        break
+
+            month += 1
+            interest += DebtCalculator.accrue_interest_array(balance, apr)
+            DebtCalculator.apply_payments(balance, min_payment, current_cash_flow)
+            payoff_months[(balance == 0) & (payoff_months == 0)] = month
+
+            # When a debt is paid off, its minimum payment becomes additional cash flow
+            freed = (balance == 0) & (min_payment > 0)
+            if freed.any():
+                current_cash_flow = additional_cash_flow + sum(min_payment[freed].tolist())
+                min_payment[balance == 0] = 0.0
+
+            if not (balance > 0).any():
+                break
+
+        return PayoffEvents(
+            [debt.creditor for debt in sorted_debts],
+            [int(payoff) if payoff else None for payoff in payoff_months.tolist()],
+            interest.tolist(),
+            month,
+            list(debts),
+            additional_cash_flow,
+            months_to_display,
+            strategy
+        )
+
+    @staticmethod
+    def payoff_month(debts: List[Debt], additional_cash_flow: float, months_to_display: int,
+                     strategy: StrategyLike = "cash_flow_recap") -> Optional[int]:
+        """
+        Month every debt is paid off, or None if that takes longer than months_to_display.
+
+        Runs the same month loop as the NumPy schedule engine without
+        keeping any rows, so the answer always matches the schedule.
+        """
+        _, steps = DebtCalculator._simulate_months(debts, additional_cash_flow, months_to_display,
+                                                   strategy=strategy)
+        month, balance = 0, None
+        for balance, *_ in steps:
+            month += 1
+        if balance is None or balance.max(initial=0) > 0:
+            return None
+        return month
+
+    @staticmethod
+    def minimum_cash_flow(debts: List[Debt], target_month: int,
+                          strategy: StrategyLike = "cash_flow_recap") -> CashFlowGoal:
+        """
+        Smallest additional cash flow, in whole cents, that pays every debt off by target_month.
+
+        Bisects between closed-form bounds using the event-driven solver,
+        which needs no month loop:
+        - below (total balance / target_month - total minimum payments)
+          even interest-free debts cannot be paid off in time
+        - paying each debt off as a fixed annuity over target_month months
+          is tried as a tighter upper bound, falling back to clearing every
+          balance in month 1, which always succeeds
+
+        Near a payoff the event solver's closed-form balances can differ
+        from the month loop in the last bits, so the candidate is then
+        checked with payoff_month and, if they disagree, the bracket is
+        widened and bisected again with payoff_month alone.
+
+        Assumes the payoff month does not get later as the cash flow grows,
+        which holds for the waterfall in practice; the returned amount is
+        always one that meets the target.
+
+        Args:
+        - debts: List of debts to process
+        - target_month: Month by which every debt must be paid off
+        - strategy: Priority order for extra payments
+
+        Returns:
+        - the cash flow with the payoff month it achieves
+        """
+        if target_month < 1:
+            raise ValueError("target_month must be at least 1")
+
+        evaluations = 0
+
+        def estimate(cents: int) -> Optional[int]:
+            nonlocal evaluations
+            evaluations += 1
+            events = PayoffSolver.solve(debts, cents / 100, target_month, strategy)
+            if any(month is None for month in events.payoff_months):
+                return None
+            return events.total_months
+
+        def exact(cents: int) -> Optional[int]:
+            nonlocal evaluations
+            evaluations += 1
+            return PayoffSolver.payoff_month(debts, cents / 100, target_month, strategy)
+
+        balance = np.array([debt.balance for debt in debts], dtype=np.float64)
+        min_payment = np.array([debt.min_payment for debt in debts], dtype=np.float64)
+        rate = np.array([debt.apr for debt in debts], dtype=np.float64) / 1200
+
+        # low is the largest amount known to miss the target, high the smallest known to meet it
+        floor = max(int(np.floor((balance.sum() / target_month - min_payment.sum()) * 100)) - 1, -1)
+        ceiling = int(np.ceil((balance * (1 + rate)).sum() * 100)) + 1
+        low = floor
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annuity = np.where(rate > 0, balance * rate / -np.expm1(-target_month * np.log1p(rate)),
+                               balance / target_month)
+        high = max(int(np.ceil(np.maximum(annuity - min_payment, 0).sum() * 100)), 0)
+        if estimate(high) is None:
+            low, high = max(low, high), ceiling
+        if low < 0 < high:
+            if estimate(0) is None:
+                low = 0
+            else:
+                low, high = -1, 0
+        low, high, _ = PayoffSolver._bisect(estimate, low, high)
+
+        # Confirm both ends with the month loop, widening in doubling steps where it disagrees
+        step = 1
+        high_month = exact(high)
+        while high_month is None:
+            low, high = high, min(high + step, ceiling)
+            high_month = exact(high)
+            step *= 2
+        step = 1
+        while low >= 0:
+            low_month = exact(low)
+            if low_month is None:
+                break
+            low, high, high_month = max(low - step, -1), low, low_month
+            step *= 2
+        low, high, month = PayoffSolver._bisect(exact, low, high)
+        return CashFlowGoal(target_month, high / 100, month or high_month, evaluations)
+
+    @staticmethod
+    def _bisect(payoff, low: int, high: int) -> Tuple[int, int, Optional[int]]:
+        """
+        Narrow low (misses the target) and high (meets it) until they are one cent apart.
+
+        Returns:
+        - low, high and the payoff month at high if it was evaluated
+        """
+        month = None
+        while high - low > 1:
+            middle = (low + high) // 2
+            middle_month = payoff(middle)
+            if middle_month is None:
+                low = middle
+            else:
+                high, month = middle, middle_month
+        return low, high, month
+
+    @staticmethod
+    def _idle_months(balance: np.ndarray, min_payment: np.ndarray, rate: np.ndarray,
+                     cash_flow: float) -> Tuple[Optional[int], np.ndarray]:
+        """
+        Months that can be skipped before the next payoff event.
+
+        A balance B paying P a month at monthly rate r reaches zero after
+        n = -log(1 - rB/P) / log(1 + r) months (B / P without interest), and
+        never if P <= rB. Returns None when no balance will ever reach zero.
+        The count stops one month short of the earliest predicted payoff, and
+        a month earlier still when the prediction sits on a whole month, so
+        rounding in the bulk step can never jump over an event.
+        """
+        active = balance > 0
+        monthly_payment = np.where(active, min_payment, 0.0)
+        if cash_flow > 0 and active.any():
+            monthly_payment[np.argmax(active)] += cash_flow
+
+        moving = active & (monthly_payment > balance * rate)
+        if not moving.any():
+            return None, monthly_payment
+
+        b, p, r = balance[moving], monthly_payment[moving], rate[moving]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            months_to_payoff = np.where(r > 0, -np.log1p(-r * b / p) / np.log1p(r), b / p)
+        return max(int(np.ceil(months_to_payoff.min() - 1e-6)) - 1, 0), monthly_payment
+
+    @staticmethod
+    def _amortize(balance: np.ndarray, rate: np.ndarray, monthly_payment: np.ndarray, months: int) -> np.ndarray:
+        """
+        Applies `months` idle months to the active balances in place.
+
+        Uses B' = B(1 + r)^k - P((1 + r)^k - 1) / r, or B - kP without interest.
+
+        Returns:
+        - interest charged per debt over those months
+        """
+        active = balance > 0
+        growth = (1 + rate) ** months
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annuity = np.where(rate > 0, (growth - 1) / rate, months)
+        updated = np.where(active, balance * growth - monthly_payment * annuity, balance)
+        interest = np.where(active & (rate > 0), updated - balance + months * monthly_payment, 0.0)
+        balance[:] = updated
+        return interest
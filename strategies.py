@@ -0,0 +1,71 @@
+# strategies.py
+import numpy as np
+from dataclasses import dataclass
+from operator import attrgetter
+from models import Debt, DebtPortfolio
+from typing import Callable, Dict, List, Optional, Union
+
+
+@dataclass(frozen=True)
+class PriorityStrategy:
+    """
+    Orders debts for the extra-payment waterfall; the first debt receives extra cash first.
+
+    Strategies keyed on a Debt attribute name it as `column`, so portfolios
+    are sorted on the whole column at once.
+    """
+    name: str
+    label: str
+    key: Callable[[Debt], float]
+    reverse: bool = False
+    column: Optional[str] = None
+
+    def order(self, debts: List[Debt]) -> List[Debt]:
+        """Stable sort, so ties keep their input order."""
+        return sorted(debts, key=self.key, reverse=self.reverse)
+
+    def order_portfolio(self, portfolio: DebtPortfolio) -> DebtPortfolio:
+        """Same stable order as `order`, for a portfolio."""
+        if self.column is None:
+            positions = sorted(range(len(portfolio)), key=lambda i: self.key(portfolio[i]), reverse=self.reverse)
+        else:
+            keys = getattr(portfolio, self.column)
+            positions = np.argsort(-keys if self.reverse else keys, kind='stable')
+        return portfolio.take(positions)
+
+
+CASH_FLOW_RECAP = PriorityStrategy(
+    "cash_flow_recap", "Cash flow recapture (highest first)", attrgetter("cash_flow_recap"), reverse=True,
+    column="cash_flow_recap"
+)
+AVALANCHE = PriorityStrategy(
+    "avalanche", "Avalanche (highest APR first)", attrgetter("apr"), reverse=True, column="apr"
+)
+SNOWBALL = PriorityStrategy("snowball", "Snowball (smallest balance first)", attrgetter("balance"), column="balance")
+UTILIZATION = PriorityStrategy(
+    "utilization", "Utilization (highest first)", attrgetter("utilization"), reverse=True, column="utilization"
+)
+
+STRATEGIES: Dict[str, PriorityStrategy] = {
+    strategy.name: strategy for strategy in (CASH_FLOW_RECAP, AVALANCHE, SNOWBALL, UTILIZATION)
+}
+
+StrategyLike = Union[str, PriorityStrategy, Callable[[Debt], float]]
+
+
+def get_strategy(strategy: StrategyLike) -> PriorityStrategy:
+    """
+    Resolve a strategy name, a PriorityStrategy, or a user key function.
+
+    User key functions sort ascending: the debt with the smallest key is paid first.
+    """
+    if isinstance(strategy, PriorityStrategy):
+        return strategy
+    if isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        return STRATEGIES[strategy]
+    if callable(strategy):
+        name = getattr(strategy, "__name__", "custom")
+        return PriorityStrategy(name, name, strategy)
+    raise TypeError(f"Unsupported strategy: {strategy!r}")
@@ -0,0 +1,30 @@
+# tests/conftest.py
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Debt  # noqa: E402
+
+
+def make_debts(rng: random.Random, count: int, with_apr: bool = True, zero_apr_share: float = 0.2):
+    """Random debts with cent-rounded amounts and unique creditor names."""
+    debts = []
+    for i in range(count):
+        apr = round(rng.uniform(0, 29.99), 2) if with_apr and rng.random() >= zero_apr_share else 0.0
+        debts.append(Debt.create(
+            f"Creditor {i + 1}",
+            round(rng.uniform(50, 20000), 2),
+            round(rng.uniform(1000, 30000), 2),
+            round(rng.uniform(10, 400), 2),
+            apr
+        ))
+    return debts
+
+
+@pytest.fixture
+def portfolio_factory():
+    return make_debts
@@ -0,0 +1,124 @@
+# tests/test_batch.py
+"""Batch runs give every client the schedule calculate_repayment_schedule gives it alone."""
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import BatchCalculator
+from calculator import DebtCalculator
+from strategies import STRATEGIES
+
+CENT = 0.01 + 1e-9
+COLUMNS = ('balance', 'total_payment', 'min_payment', 'interest', 'cash_flow_used', 'remaining_cash_flow')
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_batch_matches_single_schedules(portfolio_factory, strategy):
+    rng = random.Random(strategy)
+    months = 180
+    sizes = [0, 1, 1, 2, 5, 8, 3, 0, 12]
+    scenarios = [
+        (portfolio_factory(rng, size, with_apr=rng.random() < 0.7), round(rng.choice([0.0, rng.uniform(0, 1500)]), 2))
+        for size in sizes
+    ]
+
+    result = BatchCalculator.calculate_batch(scenarios, months, include_schedule=True, strategy=strategy)
+    assert len(result) == len(scenarios)
+
+    for client, (debts, cash_flow) in enumerate(scenarios):
+        expected, expected_months = DebtCalculator.calculate_repayment_schedule(
+            debts, cash_flow, months, "python", strategy
+        )
+        assert result.total_months[client] == expected_months
+        assert result.creditors[client] == expected.creditors
+
+        schedule = result.schedule(client)
+        for column in COLUMNS:
+            np.testing.assert_allclose(getattr(schedule, column), getattr(expected, column),
+                                       rtol=0, atol=CENT, err_msg=f"client {client} {column}")
+        assert result.paid_off[client] == bool((expected.balance[-1] <= 0).all())
+        assert result.total_interest[client] == pytest.approx(expected.interest.sum(), abs=CENT)
+
+
+def test_batch_without_schedule_keeps_totals(portfolio_factory):
+    rng = random.Random(7)
+    scenarios = [(portfolio_factory(rng, rng.randint(1, 6)), 250.0) for _ in range(20)]
+
+    full = BatchCalculator.calculate_batch(scenarios, 120, include_schedule=True)
+    summary = BatchCalculator.calculate_batch(scenarios, 120)
+
+    np.testing.assert_array_equal(summary.total_months, full.total_months)
+    np.testing.assert_allclose(summary.total_interest, full.total_interest, rtol=0, atol=CENT)
+    with pytest.raises(ValueError):
+        summary.schedule(0)
+
+
+def client_scenarios(portfolio_factory, seed):
+    rng = random.Random(seed)
+    return [
+        (portfolio_factory(rng, size, with_apr=rng.random() < 0.7), round(rng.uniform(0, 1500), 2))
+        for size in [1, 4, 0, 7, 2, 5]
+    ]
+
+
+def assert_matches_calculator(result, scenarios, months, strategy):
+    for client, (debts, cash_flow) in enumerate(scenarios):
+        expected, expected_months = DebtCalculator.calculate_repayment_schedule(
+            debts, cash_flow, months, "python", strategy
+        )
+        assert result.total_months[client] == expected_months
+        assert result.creditors[client] == expected.creditors
+        schedule = result.schedule(result.client_ids[client])
+        for column in COLUMNS:
+            np.testing.assert_allclose(getattr(schedule, column), getattr(expected, column),
+                                       rtol=0, atol=CENT, err_msg=f"client {client} {column}")
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES) + [lambda debt: debt.min_payment])
+def test_array_input_follows_the_strategy(portfolio_factory, strategy):
+    scenarios = client_scenarios(portfolio_factory, 3)
+    result = BatchCalculator.calculate_batch_arrays(
+        [[debt.balance for debt in debts] for debts, _ in scenarios],
+        [[debt.min_payment for debt in debts] for debts, _ in scenarios],
+        [cash_flow for _, cash_flow in scenarios],
+        180,
+        creditors=[[debt.creditor for debt in debts] for debts, _ in scenarios],
+        aprs=[[debt.apr for debt in debts] for debts, _ in scenarios],
+        limits=[[debt.limit for debt in debts] for debts, _ in scenarios],
+        include_schedule=True,
+        strategy=strategy
+    )
+    assert result.client_ids == list(range(len(scenarios)))
+    assert_matches_calculator(result, scenarios, 180, strategy)
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES) + [lambda debt: debt.min_payment])
+def test_frame_input_follows_the_strategy(portfolio_factory, strategy):
+    scenarios = client_scenarios(portfolio_factory, 4)
+    frame = pd.DataFrame([
+        {'client_id': f"c{client}", 'creditor': debt.creditor, 'balance': debt.balance, 'limit': debt.limit,
+         'min_payment': debt.min_payment, 'apr': debt.apr, 'additional_cash_flow': cash_flow}
+        for client, (debts, cash_flow) in enumerate(scenarios) for debt in debts
+    ])
+    # Rows of different clients may interleave
+    frame = frame.sample(frac=1, random_state=4).sort_values('client_id', kind='stable')
+    result = BatchCalculator.calculate_batch_frame(frame, 180, include_schedule=True, strategy=strategy)
+
+    kept = [(debts, cash_flow) for debts, cash_flow in scenarios if debts]
+    assert result.client_ids == [f"c{client}" for client, (debts, _) in enumerate(scenarios) if debts]
+    shuffled = [
+        [next(debt for debt in debts if debt.creditor == creditor)
+         for creditor in frame.loc[frame['client_id'] == client_id, 'creditor']]
+        for client_id, (debts, _) in zip(result.client_ids, kept)
+    ]
+    assert_matches_calculator(result, [(debts, cash_flow) for debts, (_, cash_flow) in zip(shuffled, kept)],
+                              180, strategy)
+
+
+def test_array_input_checks_shapes():
+    with pytest.raises(ValueError):
+        BatchCalculator.calculate_batch_arrays([[100.0, 50.0]], [[10.0]], [0.0], 12)
+    with pytest.raises(ValueError):
+        BatchCalculator.calculate_batch_arrays([[100.0]], [[10.0]], [0.0], 12, limits=[[1.0, 2.0]])
@@ -0,0 +1,59 @@
+# tests/test_bulk_io.py
+import numpy as np
+import pandas as pd
+
+from bulk_io import BulkIO
+
+HEADER = "client_id,creditor,balance,limit,min_payment,apr,additional_cash_flow\n"
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / "debts.csv"
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+    return str(path)
+
+
+def test_blank_client_id_is_a_row_error(tmp_path):
+    path = write_csv(tmp_path, [
+        "1,Card,1000,2000,50,19.9,100",
+        "1,Loan,500,500,25,5,100",
+        ",Orphan,300,300,30,0,100",
+        "2,Card,800,1000,40,24.9,50"
+    ])
+    table = BulkIO.load_debts(path)
+
+    assert table.errors[['row', 'error']].values.tolist() == [[2, "Client id cannot be empty"]]
+    assert table.rejected_clients == []
+    assert table.client_ids == [1, 2]
+    assert table.frame['client_id'].dtype == np.int64
+
+    result = table.run(120)
+    assert result.client_ids == [1, 2]
+    assert result.paid_off.all()
+
+
+def test_blank_string_client_id_is_a_row_error():
+    frame = pd.DataFrame({
+        'client_id': ["a", "  ", None, "b"],
+        'creditor': ["Card", "Card", "Card", "Card"],
+        'balance': [100.0, 100.0, 100.0, 100.0],
+        'limit': [200.0, 200.0, 200.0, 200.0],
+        'min_payment': [10.0, 10.0, 10.0, 10.0]
+    })
+    table = BulkIO.validate_frame(frame)
+
+    assert table.errors['row'].tolist() == [1, 2]
+    assert set(table.errors['error']) == {"Client id cannot be empty"}
+    assert table.client_ids == ["a", "b"]
+
+
+def test_invalid_row_rejects_its_client(tmp_path):
+    path = write_csv(tmp_path, [
+        "1,Card,1000,2000,50,19.9,100",
+        "1,,500,500,25,5,100",
+        "2,Card,800,1000,40,24.9,50"
+    ])
+    table = BulkIO.load_debts(path)
+    assert table.rejected_clients == [1]
+    assert table.client_ids == [2]
+    assert BulkIO.load_debts(path, reject_client_on_error=False).client_ids == [1, 2]
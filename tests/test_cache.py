@@ -0,0 +1,49 @@
+# tests/test_cache.py
+import random
+
+import pandas as pd
+
+from cache import ScheduleCache, _sizeof, fingerprint
+from strategies import AVALANCHE, PriorityStrategy
+
+
+def test_fingerprint_tells_custom_strategies_apart(portfolio_factory):
+    debts = portfolio_factory(random.Random(0), 3)
+    by_balance = lambda debt: debt.balance  # noqa: E731
+    by_apr = lambda debt: -debt.apr  # noqa: E731
+
+    def local_key(debt):
+        return debt.min_payment
+
+    def other_local_key(debt):
+        return debt.min_payment
+
+    other_local_key.__qualname__ = local_key.__qualname__
+    keys = {fingerprint(debts, 100.0, 60, strategy=key) for key in (by_balance, by_apr, local_key, other_local_key)}
+    assert len(keys) == 4
+    assert fingerprint(debts, 100.0, 60, strategy=by_balance) == fingerprint(debts, 100.0, 60, strategy=by_balance)
+
+
+def test_fingerprint_keys_registered_strategies_by_name(portfolio_factory):
+    debts = portfolio_factory(random.Random(0), 3)
+    assert fingerprint(debts, 100.0, 60, strategy=AVALANCHE) == fingerprint(debts, 100.0, 60, strategy="avalanche")
+
+    # Same name as a registered strategy, different ordering
+    impostor = PriorityStrategy("avalanche", "Avalanche", lambda debt: debt.balance)
+    assert fingerprint(debts, 100.0, 60, strategy=impostor) != fingerprint(debts, 100.0, 60, strategy="avalanche")
+
+
+def test_chart_size_includes_embedded_data():
+    import altair as alt
+
+    frame = pd.DataFrame({'month': range(5000), 'balance': [float(i) for i in range(5000)]})
+    data_bytes = int(frame.memory_usage(deep=True).sum())
+    line = alt.Chart(frame).mark_line().encode(x='month:Q', y='balance:Q')
+    assert _sizeof(line) >= data_bytes
+    other = alt.Chart(frame.copy()).mark_point().encode(x='month:Q', y='balance:Q')
+    assert _sizeof(line + other) >= 2 * data_bytes
+
+    cache = ScheduleCache(max_bytes=data_bytes + data_bytes // 2)
+    cache.put('first', line)
+    cache.put('second', line)
+    assert 'first' not in cache and 'second' in cache
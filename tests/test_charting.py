@@ -0,0 +1,66 @@
+# tests/test_charting.py
+import random
+
+import numpy as np
+import pytest
+
+from calculator import DebtCalculator
+from charting import OTHER_SERIES, TOTAL_SERIES, ChartData
+
+
+@pytest.mark.parametrize("count, budget", [(10, 3), (101, 7), (1000, 50), (1000, 999), (5000, 2000)])
+def test_lttb_keeps_endpoints_and_budget(count, budget):
+    rng = np.random.default_rng(count + budget)
+    x = np.arange(count)
+    y = np.cumsum(rng.standard_normal(count))
+    kept = ChartData.lttb(x, y, budget)
+
+    assert len(kept) == budget
+    assert kept[0] == 0 and kept[-1] == count - 1
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_short_lines_and_tiny_budgets():
+    np.testing.assert_array_equal(ChartData.lttb(np.arange(5), np.arange(5.0), 5), np.arange(5))
+    np.testing.assert_array_equal(ChartData.lttb(np.arange(5), np.arange(5.0), 2), [0, 4])
+
+
+def test_lttb_keeps_a_spike():
+    y = np.zeros(1000)
+    y[617] = 50.0
+    assert 617 in ChartData.lttb(np.arange(1000), y, 20)
+
+
+def test_timeline_keeps_first_last_and_payoff_months(portfolio_factory):
+    debts = portfolio_factory(random.Random(17), 15)
+    schedule, total_months = DebtCalculator.calculate_repayment_schedule(debts, 25.0, 600, "numpy")
+    timeline = ChartData.payoff_timeline(schedule, point_budget=120)
+    lines = timeline.lines
+
+    balance = schedule.balance
+    cleared = balance <= 0
+    payoff_months = {
+        creditor: int(cleared[:, position].argmax()) + 1
+        for position, creditor in enumerate(schedule.creditors) if cleared[:, position].any()
+    }
+    assert len(payoff_months) > 5
+
+    total = lines[lines['creditor'] == TOTAL_SERIES]
+    assert len(total) < total_months
+    months = set(total['month'])
+    assert {1, total_months} <= months
+    assert set(payoff_months.values()) <= months
+    np.testing.assert_allclose(total['balance'], schedule.total_balance[total['month'] - 1])
+
+    for position, creditor in enumerate(schedule.creditors[:9]):
+        line = lines[lines['creditor'] == creditor]
+        assert line['month'].min() == 1
+        assert line['month'].max() == payoff_months.get(creditor, total_months)
+        np.testing.assert_allclose(line['balance'], balance[line['month'] - 1, position])
+    other = lines[lines['creditor'] == OTHER_SERIES]
+    assert other['month'].min() == 1
+    assert other['month'].max() == max(payoff_months.get(creditor, total_months)
+                                       for creditor in schedule.creditors[9:])
+
+    assert dict(zip(timeline.payoffs['creditor'], timeline.payoffs['month'])) == payoff_months
+    assert timeline.payoffs['month'].is_monotonic_increasing
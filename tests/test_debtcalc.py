@@ -0,0 +1,121 @@
+# tests/test_debtcalc.py
+import os
+import random
+
+import pandas as pd
+import pytest
+
+import debtcalc
+from batch import BatchCalculator
+
+MONTHS = 120
+
+
+def write_clients(tmp_path, portfolio_factory, clients=7):
+    rng = random.Random(13)
+    rows = []
+    for client in range(clients):
+        for debt in portfolio_factory(rng, rng.randint(1, 4)):
+            rows.append({
+                'client_id': client, 'creditor': debt.creditor, 'balance': debt.balance, 'limit': debt.limit,
+                'min_payment': min(debt.min_payment, debt.balance), 'apr': debt.apr, 'additional_cash_flow': 300.0
+            })
+    path = tmp_path / "clients.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path), pd.DataFrame(rows)
+
+
+def run(path, output, *extra):
+    return debtcalc.main(['run', path, '--output', str(output), '--workers', '1', '--months', str(MONTHS),
+                          '--shard-size', '2', *extra])
+
+
+def summaries(output):
+    names = sorted(name for name in os.listdir(output) if name.startswith('summary-'))
+    return pd.concat([pd.read_parquet(os.path.join(output, name)) for name in names], ignore_index=True)
+
+
+def test_interrupted_run_resumes_missing_shards(tmp_path, portfolio_factory, monkeypatch, capsys):
+    path, frame = write_clients(tmp_path, portfolio_factory)
+    output = tmp_path / "results"
+    run_shard = debtcalc._run_shard
+    shards_run = []
+
+    def interrupt_third(task):
+        if task[0] == 2:
+            raise KeyboardInterrupt
+        shards_run.append(task[0])
+        return run_shard(task)
+
+    monkeypatch.setattr(debtcalc, '_run_shard', interrupt_third)
+    assert run(path, output, '--schedules') == 130
+    assert shards_run == [0, 1]
+    assert sorted(os.listdir(output)) == [
+        'manifest.json', 'schedules-00000.parquet', 'schedules-00001.parquet',
+        'summary-00000.parquet', 'summary-00001.parquet'
+    ]
+
+    def record(task):
+        shards_run.append(task[0])
+        return run_shard(task)
+
+    shards_run.clear()
+    monkeypatch.setattr(debtcalc, '_run_shard', record)
+    assert run(path, output, '--schedules') == 0
+    assert shards_run == [2, 3]
+    assert "Resuming: 2 of 4 shards already done" in capsys.readouterr().out
+
+    expected = BatchCalculator.calculate_batch_frame(frame, MONTHS).to_frame().reset_index()
+    pd.testing.assert_frame_equal(summaries(output), expected)
+    schedules = pd.read_parquet(output / 'schedules-00003.parquet')
+    assert schedules['client_id'].unique().tolist() == [6]
+
+
+def test_finished_run_is_not_repeated_and_other_runs_are_refused(tmp_path, portfolio_factory, capsys):
+    path, _ = write_clients(tmp_path, portfolio_factory)
+    output = tmp_path / "results"
+    assert run(path, output) == 0
+    assert run(path, output) == 0
+    assert "Resuming: 4 of 4 shards already done" in capsys.readouterr().out
+
+    assert run(path, output, '--schedules') == 2
+    assert run(path, output, '--schedules', '--restart') == 0
+    assert len([name for name in os.listdir(output) if name.startswith('schedules-')]) == 4
+
+
+def test_blank_client_id_is_reported_not_run(tmp_path, portfolio_factory):
+    path, frame = write_clients(tmp_path, portfolio_factory, clients=3)
+    frame['client_id'] = frame['client_id'].astype(object)
+    frame.loc[1, 'client_id'] = None
+    frame.to_csv(path, index=False)
+    output = tmp_path / "results"
+
+    assert run(path, output) == 0
+    errors = pd.read_csv(output / 'errors.csv')
+    assert errors['row'].tolist() == [1]
+    assert summaries(output)['client_id'].tolist() == [0, 1, 2]
+
+
+def test_rows_without_client_ids_are_refused(tmp_path, portfolio_factory, monkeypatch):
+    path, _ = write_clients(tmp_path, portfolio_factory, clients=2)
+    load_debts = debtcalc.BulkIO.load_debts
+
+    def unvalidated(*args, **kwargs):
+        table = load_debts(*args, **kwargs)
+        table.frame = table.frame.astype({'client_id': object})
+        table.frame.iloc[0, 0] = None
+        return table
+
+    monkeypatch.setattr(debtcalc.BulkIO, 'load_debts', unvalidated)
+    with pytest.raises(ValueError):
+        run(path, tmp_path / "results")
+
+
+def test_strategy_is_passed_to_every_shard(tmp_path, portfolio_factory):
+    path, frame = write_clients(tmp_path, portfolio_factory)
+    output = tmp_path / "results"
+    assert run(path, output, '--strategy', 'snowball') == 0
+
+    expected = BatchCalculator.calculate_batch_frame(frame, MONTHS, strategy='snowball').to_frame().reset_index()
+    pd.testing.assert_frame_equal(summaries(output), expected)
+    assert run(path, output, '--strategy', 'avalanche') == 2
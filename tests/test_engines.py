@@ -0,0 +1,74 @@
+# tests/test_engines.py
+"""The NumPy and integer-cent engines reproduce the reference loop."""
+import random
+
+import numpy as np
+import pytest
+
+from calculator import DebtCalculator
+from strategies import STRATEGIES
+
+CENT = 0.01 + 1e-9
+COLUMNS = ('balance', 'total_payment', 'interest', 'cash_flow_used')
+
+
+def rounding_tolerance(debts, months: int) -> np.ndarray:
+    """
+    Per-month tolerance for the cents engine.
+
+    It rounds each debt's interest to the cent every month, so with an APR
+    the difference from the float loop can grow by half a cent per debt per
+    month, compounded at the highest rate. Without interest it stays within
+    a cent.
+    """
+    rate = max(debt.apr for debt in debts) / 1200
+    if rate == 0:
+        return np.full((months, 1), CENT)
+    elapsed = np.arange(1, months + 1)[:, None]
+    return 0.005 * len(debts) * elapsed * (1 + rate) ** elapsed + CENT
+
+
+def assert_schedules_match(expected, actual, tolerance=CENT):
+    expected_schedule, expected_months = expected
+    actual_schedule, actual_months = actual
+    assert actual_months == expected_months
+    assert actual_schedule.creditors == expected_schedule.creditors
+    for column in COLUMNS:
+        expected_values = getattr(expected_schedule, column)
+        difference = np.abs(getattr(actual_schedule, column) - expected_values)
+        if difference.ndim == 1:
+            difference = difference[:, None]
+        assert (difference <= tolerance).all(), f"{column} differs by up to {difference.max():.4f}"
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+@pytest.mark.parametrize("with_apr", [True, False])
+def test_engines_match_reference_loop(portfolio_factory, strategy, with_apr):
+    rng = random.Random(f"{strategy}-{with_apr}")
+    for _ in range(25):
+        debts = portfolio_factory(rng, rng.randint(1, 8), with_apr)
+        cash_flow = round(rng.choice([0.0, rng.uniform(0, 2000)]), 2)
+        months = rng.randint(1, 240)
+
+        reference = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, "python", strategy)
+        assert_schedules_match(
+            reference, DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, "numpy", strategy)
+        )
+        assert_schedules_match(
+            reference,
+            DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, "cents", strategy),
+            rounding_tolerance(debts, reference[1])
+        )
+
+
+def test_engines_do_not_modify_inputs(portfolio_factory):
+    debts = portfolio_factory(random.Random(1), 5)
+    before = [debt.copy() for debt in debts]
+    for engine in ("python", "numpy", "cents"):
+        DebtCalculator.calculate_repayment_schedule(debts, 100.0, 60, engine)
+    assert debts == before
+
+
+def test_unknown_engine_is_rejected(portfolio_factory):
+    with pytest.raises(ValueError):
+        DebtCalculator.calculate_repayment_schedule(portfolio_factory(random.Random(0), 1), 0.0, 12, "fortran")
@@ -0,0 +1,164 @@
+# tests/test_incremental.py
+"""Incremental recomputation gives exactly the schedule of a fresh calculation."""
+import random
+
+import numpy as np
+import pytest
+
+from calculator import DebtCalculator
+from incremental import IncrementalCalculator
+from models import Debt
+from strategies import STRATEGIES
+
+COLUMNS = ('balance', 'total_payment', 'min_payment', 'interest', 'cash_flow_used', 'remaining_cash_flow')
+EDITS = ('balance', 'min_payment', 'apr', 'add', 'remove', 'cash_flow', 'horizon')
+
+
+class Recorder:
+    """Counts full recomputes of one IncrementalCalculator."""
+
+    def __init__(self, calculator: IncrementalCalculator):
+        self.full = 0
+        original = calculator._full
+
+        def full(*args, **kwargs):
+            self.full += 1
+            return original(*args, **kwargs)
+
+        calculator._full = full
+
+
+def replace(debt: Debt, **changes) -> Debt:
+    values = dict(creditor=debt.creditor, balance=debt.balance, limit=debt.limit,
+                  min_payment=debt.min_payment, apr=debt.apr)
+    values.update(changes)
+    return Debt.create(**values)
+
+
+def apply_edit(rng: random.Random, kind: str, debts, cash_flow: float, months: int, serial: int):
+    debts = list(debts)
+    position = rng.randrange(len(debts))
+    debt = debts[position]
+    if kind == 'balance':
+        debts[position] = replace(debt, balance=round(max(debt.balance * rng.uniform(0.5, 1.5), 1.0), 2))
+    elif kind == 'min_payment':
+        debts[position] = replace(debt, min_payment=round(debt.min_payment * rng.uniform(0.7, 1.3), 2))
+    elif kind == 'apr':
+        debts[position] = replace(debt, apr=round(rng.uniform(0, 29.99), 2))
+    elif kind == 'add':
+        debts.insert(position, Debt.create(f"Added {serial}", round(rng.uniform(100, 8000), 2), 10000.0,
+                                           round(rng.uniform(20, 200), 2), round(rng.uniform(0, 25), 2)))
+    elif kind == 'remove' and len(debts) > 1:
+        del debts[position]
+    elif kind == 'cash_flow':
+        cash_flow = round(rng.uniform(0, 1500), 2)
+    elif kind == 'horizon':
+        months = rng.randint(1, 360)
+    return debts, cash_flow, months
+
+
+def assert_matches_fresh(result, debts, cash_flow, months, engine, strategy):
+    schedule, total_months = result
+    expected, expected_months = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, engine, strategy)
+    assert total_months == expected_months
+    assert schedule.creditors == expected.creditors
+    for column in COLUMNS:
+        np.testing.assert_array_equal(getattr(schedule, column), getattr(expected, column), err_msg=column)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "cents"])
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_random_edit_sequences_match_fresh_schedules(portfolio_factory, engine, strategy):
+    rng = random.Random(f"{engine}-{strategy}")
+    for _ in range(4):
+        debts = portfolio_factory(rng, rng.randint(2, 8))
+        cash_flow, months = round(rng.uniform(0, 1000), 2), rng.randint(12, 360)
+        calculator = IncrementalCalculator(engine=engine, strategy=strategy)
+        assert_matches_fresh(calculator.calculate(debts, cash_flow, months), debts, cash_flow, months, engine, strategy)
+
+        for serial in range(25):
+            debts, cash_flow, months = apply_edit(rng, rng.choice(EDITS), debts, cash_flow, months, serial)
+            assert_matches_fresh(calculator.calculate(debts, cash_flow, months), debts, cash_flow, months,
+                                 engine, strategy)
+
+
+def creditor_order(debts, strategy):
+    return [debt.creditor for debt in DebtCalculator.sort_debts_by_priority(debts, strategy)]
+
+
+def open_after_first_month(debts, creditor, cash_flow, months, engine, strategy) -> bool:
+    schedule, _ = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, engine, strategy)
+    return bool(schedule.balance[0, schedule.creditors.index(creditor)] > 0)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "cents"])
+@pytest.mark.parametrize("kind, strategy", [
+    ('balance', 'avalanche'),
+    ('min_payment', 'avalanche'),
+    ('apr', 'snowball'),
+    ('horizon', 'avalanche')
+])
+def test_edits_that_keep_the_order_resume(portfolio_factory, engine, kind, strategy):
+    rng = random.Random(f"resume-{engine}-{kind}")
+    checked = 0
+    for _ in range(10):
+        # Small minimums keep plans running, so edits land inside the schedule
+        debts = [replace(debt, min_payment=round(debt.balance * 0.02 + 5, 2))
+                 for debt in portfolio_factory(rng, rng.randint(2, 8))]
+        cash_flow, months = round(rng.uniform(0, 300), 2), 120
+        calculator = IncrementalCalculator(engine=engine, strategy=strategy)
+        recorder = Recorder(calculator)
+        calculator.calculate(debts, cash_flow, months)
+
+        for serial in range(10):
+            edited, cash_flow, new_months = apply_edit(rng, kind, debts, cash_flow, months, serial)
+            # A debt edit resumes while the priority order holds and the edited
+            # debt outlives the first month; otherwise it falls back to a full run
+            changed = [new.creditor for old, new in zip(debts, edited) if old != new]
+            expect_resume = kind == 'horizon' or (
+                creditor_order(edited, strategy) == creditor_order(debts, strategy)
+                and all(open_after_first_month(plan, creditor, cash_flow, plan_months, engine, strategy)
+                        for creditor in changed
+                        for plan, plan_months in ((debts, months), (edited, new_months)))
+            )
+            debts, months = edited, new_months
+
+            full_before = recorder.full
+            result = calculator.calculate(debts, cash_flow, months)
+            assert_matches_fresh(result, debts, cash_flow, months, engine, strategy)
+            if expect_resume:
+                checked += 1
+                assert recorder.full == full_before, f"{kind} edit {serial} recomputed everything"
+    assert checked >= 80
+
+
+@pytest.mark.parametrize("kind", ['add', 'remove', 'cash_flow'])
+def test_structural_edits_recompute_everything(portfolio_factory, kind):
+    rng = random.Random(kind)
+    debts = portfolio_factory(rng, 5)
+    cash_flow, months = 200.0, 120
+    calculator = IncrementalCalculator(strategy="avalanche")
+    recorder = Recorder(calculator)
+    calculator.calculate(debts, cash_flow, months)
+
+    debts, cash_flow, months = apply_edit(rng, kind, debts, cash_flow, months, 0)
+    result = calculator.calculate(debts, cash_flow, months)
+    assert recorder.full == 2
+    assert calculator.resumed_from is None
+    assert_matches_fresh(result, debts, cash_flow, months, "numpy", "avalanche")
+
+
+@pytest.mark.parametrize("engine", ["numpy", "cents"])
+def test_short_schedules_do_not_keep_the_horizon_buffers(engine):
+    debts = [Debt.create(f"Card {i}", 100.0, 500.0, 50.0, 12.0) for i in range(50)]
+    calculator = IncrementalCalculator(engine, "avalanche")
+    schedule, total_months = calculator.calculate(debts, 0.0, 1200)
+    assert total_months <= 3
+
+    debts[3] = replace(debts[3], balance=90.0)
+    edited, _ = calculator.calculate(debts, 0.0, 1200)
+    shorter, _ = calculator.calculate(debts, 0.0, 1)
+    for result in (schedule, edited, shorter):
+        for column in ('balance', 'total_payment', 'min_payment', 'interest', 'cash_flow_used', 'remaining_cash_flow'):
+            values = getattr(result, column)
+            assert values.base is None or values.base.nbytes <= 2 * values.nbytes
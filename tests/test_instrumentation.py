@@ -0,0 +1,121 @@
+# tests/test_instrumentation.py
+import json
+import os
+import tempfile
+import threading
+
+import pytest
+
+import instrumentation as instrumentation_module
+from instrumentation import Instrumentation
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "trace.jsonl")
+
+
+def read_log(path):
+    with open(path) as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_disabled_records_nothing(log_path):
+    tracer = Instrumentation(enabled=False, profile='', log_path=log_path)
+    with tracer.trace("run"):
+        with tracer.span("stage"):
+            tracer.count("rows", 3)
+    assert tracer.last_report is None
+    assert not os.path.exists(log_path)
+
+
+def test_trace_records_nested_spans_and_counters(log_path):
+    tracer = Instrumentation(enabled=True, profile='', log_path=log_path)
+    with tracer.span("ignored"):
+        tracer.count("ignored")
+
+    with tracer.trace("run", session="abc"):
+        with tracer.span("outer", rows=10):
+            tracer.count("months", 12)
+            with tracer.span("inner"):
+                tracer.count("months", 3)
+                tracer.count("clients")
+        with tracer.span("second"):
+            pass
+
+    report = tracer.last_report
+    assert report['trace'] == "run" and report['session'] == "abc"
+    assert [(span['name'], span['depth']) for span in report['spans']] == [("outer", 0), ("inner", 1), ("second", 0)]
+    assert report['spans'][0]['rows'] == 10
+    outer, inner, second = report['spans']
+    assert outer['duration_ms'] >= inner['duration_ms'] >= 0
+    assert outer['start_ms'] <= inner['start_ms'] <= second['start_ms'] <= report['duration_ms']
+    assert report['counters'] == {"months": 15, "clients": 1}
+    assert read_log(log_path) == [json.loads(json.dumps(report))]
+
+
+def test_nested_traces_and_failures_keep_one_report(log_path):
+    tracer = Instrumentation(enabled=True, profile='', log_path=log_path)
+    with pytest.raises(RuntimeError):
+        with tracer.trace("outer"):
+            with tracer.trace("nested"):
+                with tracer.span("stage"):
+                    raise RuntimeError("boom")
+    assert [report['trace'] for report in tracer.reports] == ["outer"]
+    assert tracer.last_report['spans'][0]['name'] == "stage"
+    assert "duration_ms" in tracer.last_report['spans'][0]
+
+    # The failed trace has ended, so the next one starts cleanly
+    with tracer.trace("next"):
+        tracer.count("rows")
+    assert tracer.last_report['counters'] == {"rows": 1}
+    assert len(read_log(log_path)) == 2
+
+
+def test_threads_keep_separate_traces(log_path):
+    tracer = Instrumentation(enabled=True, profile='', log_path=log_path)
+    barrier = threading.Barrier(4)
+
+    def work(number):
+        with tracer.trace("thread", number=number):
+            barrier.wait()
+            tracer.count("calls", number)
+            with tracer.span(f"stage-{number}"):
+                barrier.wait()
+
+    threads = [threading.Thread(target=work, args=(number,)) for number in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reports = sorted(tracer.reports, key=lambda report: report['number'])
+    assert [report['counters'] for report in reports] == [{"calls": number} for number in range(1, 5)]
+    assert [[span['name'] for span in report['spans']] for report in reports] == \
+        [[f"stage-{number}"] for number in range(1, 5)]
+    assert len(read_log(log_path)) == 4
+
+
+def test_profiling_implies_tracing(log_path):
+    tracer = Instrumentation(enabled=False, profile='cprofile, tracemalloc, unknown', log_path=log_path)
+    assert tracer.enabled and tracer.profile == ['cprofile', 'tracemalloc']
+    with tracer.trace("run"):
+        sum(range(1000))
+    report = tracer.last_report
+    assert 'cumulative' in report['cprofile']
+    assert report['tracemalloc']['peak_bytes'] >= 0
+
+
+def test_unwritable_log_does_not_break_the_trace(tmp_path):
+    tracer = Instrumentation(enabled=True, profile='', log_path=str(tmp_path / "missing" / "trace.jsonl"))
+    with tracer.trace("run"):
+        tracer.count("rows")
+    assert tracer.last_report['counters'] == {"rows": 1}
+
+
+def test_default_log_is_outside_the_working_tree(monkeypatch):
+    monkeypatch.delenv(instrumentation_module.ENV_LOG, raising=False)
+    tracer = Instrumentation(enabled=True, profile='')
+    assert os.path.dirname(tracer.log_path) == tempfile.gettempdir()
+    monkeypatch.setenv(instrumentation_module.ENV_LOG, "custom.jsonl")
+    assert Instrumentation(enabled=True, profile='').log_path == "custom.jsonl"
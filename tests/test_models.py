@@ -0,0 +1,37 @@
+# tests/test_models.py
+import random
+
+import numpy as np
+
+from models import Debt, DebtPortfolio
+
+
+def test_take_keeps_derived_columns_lazy():
+    portfolio = DebtPortfolio(["A", "B", "C"], [100.0, 0.0, 50.0], [200.0, 0.0, 50.0], [10.0, 5.0, 25.0])
+    taken = portfolio.take([2, 0])
+    assert portfolio._utilization is None and portfolio._cash_flow_recap is None
+    assert taken._utilization is None and taken._cash_flow_recap is None
+    np.testing.assert_array_equal(taken.utilization, [100.0, 50.0])
+    np.testing.assert_array_equal(taken.cash_flow_recap, [50.0, 10.0])
+
+
+def test_take_carries_stored_derived_columns(portfolio_factory):
+    debts = portfolio_factory(random.Random(4), 6)
+    # Stored values that differ from the formulas must survive a take
+    debts[1].utilization = 12.5
+    portfolio = DebtPortfolio.from_debts(debts)
+    taken = portfolio.take([1, 3])
+    assert taken.to_debts() == [debts[1], debts[3]]
+
+
+def test_portfolio_round_trips_debts(portfolio_factory):
+    debts = portfolio_factory(random.Random(5), 5)
+    portfolio = DebtPortfolio.from_debts(debts)
+    assert portfolio.to_debts() == debts
+    assert list(portfolio) == debts
+    assert portfolio[2] == debts[2]
+
+    changed = portfolio.replace(2, balance=10.0)
+    assert changed[2] == Debt.create(debts[2].creditor, 10.0, debts[2].limit, debts[2].min_payment, debts[2].apr)
+    assert portfolio.to_debts() == debts
+    assert changed.min_payment is portfolio.min_payment
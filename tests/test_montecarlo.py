@@ -0,0 +1,48 @@
+# tests/test_montecarlo.py
+import random
+
+import numpy as np
+import pytest
+
+from batch import BatchCalculator
+from calculator import DebtCalculator
+from montecarlo import MonteCarloSimulator, StressScenario
+from strategies import STRATEGIES
+
+MONTHS = 240
+CENT = 0.01 + 1e-9
+
+
+def test_same_seed_repeats_exactly(portfolio_factory):
+    debts = portfolio_factory(random.Random(19), 6)
+    scenario = StressScenario(paths=500, seed=42, shock_probability=0.05, apr_drift=0.01)
+
+    first = MonteCarloSimulator.simulate(debts, 300.0, MONTHS, scenario)
+    second = MonteCarloSimulator.simulate(debts, 300.0, MONTHS, scenario)
+    for name in ('payoff_months', 'paid_off', 'total_interest', 'balance_bands'):
+        np.testing.assert_array_equal(getattr(first, name), getattr(second, name))
+
+    other = MonteCarloSimulator.simulate(debts, 300.0, MONTHS, StressScenario(paths=500, seed=43))
+    assert not np.array_equal(first.total_interest, other.total_interest)
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_zero_noise_matches_the_deterministic_plan(portfolio_factory, strategy):
+    debts = portfolio_factory(random.Random(strategy), 7)
+    cash_flow = 250.0
+    scenario = StressScenario(paths=8, cash_flow_volatility=0.0, shock_probability=0.0, apr_volatility=0.0)
+    result = MonteCarloSimulator.simulate(debts, cash_flow, MONTHS, scenario, strategy)
+
+    batch = BatchCalculator.calculate_batch([(debts, cash_flow)], MONTHS, strategy=strategy)
+    schedule, total_months = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, MONTHS, "numpy", strategy)
+    paid_off = bool(batch.paid_off[0])
+
+    assert (result.paid_off == paid_off).all()
+    assert (result.payoff_months == (batch.total_months[0] if paid_off else 0)).all()
+    np.testing.assert_array_equal(result.total_interest, np.full(scenario.paths, batch.total_interest[0]))
+
+    # Every path is the same, so every band is the plan's total balance
+    assert total_months == batch.total_months[0]
+    for band in result.balance_bands:
+        np.testing.assert_allclose(band[:total_months], schedule.total_balance, rtol=0, atol=CENT)
+        np.testing.assert_allclose(band[total_months:], 0.0, rtol=0, atol=CENT)
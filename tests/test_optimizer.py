@@ -0,0 +1,54 @@
+# tests/test_optimizer.py
+"""Branch and bound finds the same best plan as trying every ordering."""
+import itertools
+import random
+
+import pytest
+
+from optimizer import OBJECTIVES, PayoffOptimizer, _evaluate, _score
+
+MONTHS = 360
+# 25 and 47 have orderings that tie on interest and differ only in months
+SEEDS = [0, 1, 2, 3, 4, 5, 6, 7, 25, 47]
+
+
+def portfolio(portfolio_factory, seed):
+    rng = random.Random(seed)
+    debts = portfolio_factory(rng, rng.randint(3, 6))
+    return debts, round(rng.uniform(0, 800), 2)
+
+
+def brute_force(debts, cash_flow, objective):
+    return min(
+        _score(_evaluate(debts, list(order), cash_flow, MONTHS), objective)
+        for order in itertools.permutations(range(len(debts)))
+    )
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+@pytest.mark.parametrize("seed", SEEDS)
+def test_search_matches_brute_force(portfolio_factory, seed, objective):
+    debts, cash_flow = portfolio(portfolio_factory, seed)
+    result = PayoffOptimizer.optimize(debts, cash_flow, MONTHS, objective, workers=1)
+
+    assert result.exhaustive
+    assert _score(result.events, objective) == brute_force(debts, cash_flow, objective)
+    assert result.best_order == [debt.creditor for debt in result.events.debts]
+    assert result.comparison[0]['plan'] == result.best_plan
+
+
+@pytest.mark.parametrize("objective", OBJECTIVES)
+def test_process_pool_matches_in_process_search(portfolio_factory, objective):
+    debts, cash_flow = portfolio(portfolio_factory, 25)
+    in_process = PayoffOptimizer.optimize(debts, cash_flow, MONTHS, objective, workers=1)
+    pooled = PayoffOptimizer.optimize(debts, cash_flow, MONTHS, objective, workers=2)
+
+    assert pooled.exhaustive
+    assert pooled.best_order == in_process.best_order
+    assert pooled.nodes_evaluated == in_process.nodes_evaluated
+    assert _score(pooled.events, objective) == brute_force(debts, cash_flow, objective)
+
+
+def test_unknown_objective():
+    with pytest.raises(ValueError):
+        PayoffOptimizer.optimize([], 0.0, MONTHS, "fees")
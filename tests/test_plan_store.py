@@ -0,0 +1,120 @@
+# tests/test_plan_store.py
+import json
+import os
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+import plan_store as store_module
+from calculator import DebtCalculator
+from plan_store import SCHEDULE_COLUMNS, PlanStore
+
+MONTHS = 120
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PlanStore(str(tmp_path / "plans"))
+
+
+def calculate(debts, cash_flow=150.0, strategy="avalanche"):
+    return DebtCalculator.calculate_repayment_schedule(debts, cash_flow, MONTHS, "numpy", strategy)
+
+
+def save(store, name, debts, cash_flow=150.0, strategy="avalanche"):
+    schedule, total_months = calculate(debts, cash_flow, strategy)
+    return store.save(name, debts, cash_flow, MONTHS, strategy, schedule, total_months), schedule
+
+
+def test_save_and_reopen_memory_mapped(store, portfolio_factory):
+    debts = portfolio_factory(random.Random(1), 6)
+    plan, schedule = save(store, "Cards", debts)
+
+    reopened, loaded = store.open(plan.key)
+    assert reopened == plan
+    assert reopened.debts == debts and reopened.strategy == "avalanche"
+    assert loaded.creditors == schedule.creditors
+    for column in SCHEDULE_COLUMNS:
+        values = getattr(loaded, column)
+        assert isinstance(values, np.memmap) and not values.flags.writeable
+        np.testing.assert_array_equal(values, getattr(schedule, column))
+    assert loaded.month_data(3) == schedule.month_data(3)
+
+
+def test_saving_the_same_inputs_renames(store, portfolio_factory):
+    debts = portfolio_factory(random.Random(2), 4)
+    first, _ = save(store, "First", debts)
+    second, _ = save(store, "Second", debts)
+    third, _ = save(store, "Other", debts, cash_flow=300.0)
+
+    assert second.key == first.key and second.name == "Second" and second.created == first.created
+    assert third.key != first.key
+    assert [plan.name for plan in store.plans()] == ["Other", "Second"]
+    assert sorted(name for name in os.listdir(store.root) if not name.endswith('.sqlite')) == \
+        sorted(f"{key}.v{store_module.ENGINE_VERSION}" for key in (first.key, third.key))
+
+
+def test_delete_removes_index_row_and_files(store, portfolio_factory):
+    plan, _ = save(store, "Gone", portfolio_factory(random.Random(3), 3))
+    assert store.delete(plan.key)
+    assert store.get(plan.key) is None and store.plans() == []
+    assert os.listdir(store.root) == ["plans.sqlite"]
+    assert not store.delete(plan.key)
+    with pytest.raises(KeyError):
+        store.open(plan.key)
+
+
+def test_plans_from_another_engine_version_are_recalculated(store, portfolio_factory, monkeypatch):
+    debts = portfolio_factory(random.Random(4), 5)
+    plan, schedule = save(store, "Old", debts)
+
+    # Simulate a plan stored by an older engine with a wrong schedule on disk
+    np.save(os.path.join(store._schedule_dir(plan.key), "balance.npy"), np.zeros_like(schedule.balance))
+    monkeypatch.setattr(store_module, 'ENGINE_VERSION', store_module.ENGINE_VERSION + 1)
+    monkeypatch.setattr(PlanStore._schedule_dir, '__defaults__', (store_module.ENGINE_VERSION,))
+    monkeypatch.setattr(PlanStore._remove_stale, '__defaults__', (store_module.ENGINE_VERSION,))
+
+    reopened, recalculated = store.open(plan.key)
+    assert reopened.engine_version == store_module.ENGINE_VERSION and reopened.name == "Old"
+    np.testing.assert_array_equal(recalculated.balance, schedule.balance)
+    _, loaded = store.open(plan.key)
+    assert isinstance(loaded.balance, np.memmap)
+    np.testing.assert_array_equal(loaded.balance, schedule.balance)
+    assert sorted(os.listdir(store.root)) == sorted(["plans.sqlite", f"{plan.key}.v{store_module.ENGINE_VERSION}"])
+
+
+def test_index_without_engine_version_is_migrated(tmp_path, portfolio_factory):
+    root = tmp_path / "plans"
+    root.mkdir()
+    debts = portfolio_factory(random.Random(5), 3)
+    schedule, total_months = calculate(debts)
+    with sqlite3.connect(root / "plans.sqlite") as connection:
+        connection.execute(
+            "CREATE TABLE plans (key TEXT PRIMARY KEY, name TEXT NOT NULL, created REAL NOT NULL, "
+            "debts TEXT NOT NULL, additional_cash_flow REAL NOT NULL, months_to_display INTEGER NOT NULL, "
+            "strategy TEXT NOT NULL, creditors TEXT NOT NULL, total_months INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "INSERT INTO plans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ("legacy", "Legacy", 0.0, json.dumps([[d.creditor, d.balance, d.limit, d.min_payment, d.apr] for d in debts]),
+             150.0, MONTHS, "avalanche", json.dumps(schedule.creditors), total_months)
+        )
+    connection.close()
+    (root / "legacy").mkdir()
+
+    store = PlanStore(str(root))
+    assert store.get("legacy").engine_version == 0
+    _, loaded = store.open("legacy")
+    np.testing.assert_array_equal(loaded.balance, schedule.balance)
+    plan = store.plans()[0]
+    assert plan.engine_version == store_module.ENGINE_VERSION and plan.name == "Legacy"
+    assert not (root / "legacy").exists()
+
+
+def test_only_registered_strategies_can_be_saved(store, portfolio_factory):
+    debts = portfolio_factory(random.Random(6), 2)
+    schedule, total_months = calculate(debts, strategy=lambda debt: debt.balance)
+    with pytest.raises(ValueError):
+        store.save("Custom", debts, 150.0, MONTHS, lambda debt: debt.balance, schedule, total_months)
@@ -0,0 +1,105 @@
+# tests/test_schedule.py
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculator import DebtCalculator
+from schedule import ScheduleAggregates
+from strategies import STRATEGIES
+
+
+@pytest.mark.parametrize("engine", ["numpy", "cents"])
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_streamed_months_match_the_full_schedule(portfolio_factory, engine, strategy):
+    rng = random.Random(f"{engine}-{strategy}")
+    for _ in range(5):
+        debts = portfolio_factory(rng, rng.randint(1, 9), with_apr=rng.random() < 0.8)
+        cash_flow, months = round(rng.uniform(0, 1200), 2), rng.choice([1, 24, 360])
+        schedule, total_months = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, engine, strategy)
+
+        aggregates = ScheduleAggregates()
+        streamed = list(DebtCalculator.iter_repayment_schedule(
+            debts, cash_flow, months, engine == "cents", strategy, sink=aggregates
+        ))
+        assert [month.month for month in streamed] == list(range(1, total_months + 1))
+
+        for month in streamed:
+            row = month.month - 1
+            assert month.creditors == schedule.creditors
+            for column in ('balance', 'total_payment', 'min_payment', 'interest'):
+                np.testing.assert_array_equal(getattr(month, column), getattr(schedule, column)[row])
+            assert month.cash_flow_used == schedule.cash_flow_used[row]
+            assert month.remaining_cash_flow == schedule.remaining_cash_flow[row]
+            assert list(month.rows()) == list(schedule._month_rows(row))
+
+        assert aggregates.months == total_months
+        assert aggregates.total_paid == pytest.approx(schedule.total_payment.sum(), abs=1e-6)
+        assert aggregates.total_interest == pytest.approx(schedule.interest.sum(), abs=1e-6)
+        assert aggregates.final_balance == pytest.approx(schedule.balance[-1].sum(), abs=1e-6)
+
+        for position, creditor in enumerate(schedule.creditors):
+            paid = np.flatnonzero(schedule.balance[:, position] <= 0)
+            expected = int(paid[0]) + 1 if len(paid) else None
+            assert aggregates.payoff_month(creditor) == expected, creditor
+        assert len(aggregates.payoff_events) == int((schedule.balance[-1] <= 0).sum())
+
+
+@pytest.fixture
+def window_schedule(portfolio_factory):
+    debts = portfolio_factory(random.Random(18), 6)
+    schedule, _ = DebtCalculator.calculate_repayment_schedule(debts, 120.0, 60, "numpy")
+    return schedule
+
+
+def expected_rows(schedule, creditors, first_month, last_month):
+    frame = schedule.to_pandas()
+    frame['creditor'] = frame['creditor'].astype(str)
+    keep = frame['month'].between(first_month, last_month)
+    if creditors:
+        keep &= frame['creditor'].isin(creditors)
+    return frame[keep].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("creditors, first_month, last_month", [
+    (None, 1, None),
+    ([], 5, 17),
+    (["Creditor 2", "Creditor 4"], 1, None),
+    (["Creditor 3"], 10, 30),
+    (["Creditor 5", "Unknown"], -3, 1000)
+])
+def test_window_pages_match_the_filtered_frame(window_schedule, creditors, first_month, last_month):
+    schedule = window_schedule
+    window = schedule.window(creditors, first_month, last_month)
+    expected = expected_rows(schedule, creditors, max(first_month, 1),
+                             schedule.months if last_month is None else last_month)
+    assert len(window) == len(expected)
+
+    for page_size in (1, 7, 50, len(expected) + 3):
+        pages = [window.page(number, page_size) for number in range(1, window.page_count(page_size) + 1)]
+        assert all(len(page) <= page_size for page in pages)
+        combined = pd.concat(pages, ignore_index=True)
+        pd.testing.assert_frame_equal(combined, expected, check_dtype=False)
+
+
+def test_out_of_range_pages_are_clamped(window_schedule):
+    window = window_schedule.window(["Creditor 1"], 3, 20)
+    last = window.page_count(5)
+    pd.testing.assert_frame_equal(window.page(0, 5), window.page(1, 5))
+    pd.testing.assert_frame_equal(window.page(-4, 5), window.page(1, 5))
+    pd.testing.assert_frame_equal(window.page(last + 10, 5), window.page(last, 5))
+
+
+@pytest.mark.parametrize("creditors, first_month, last_month", [
+    (["Unknown"], 1, None),
+    (None, 20, 10),
+    (None, 1000, None)
+])
+def test_empty_window(window_schedule, creditors, first_month, last_month):
+    window = window_schedule.window(creditors, first_month, last_month)
+    assert len(window) == 0
+    assert window.page_count(10) == 1
+    page = window.page(1, 10)
+    assert len(page) == 0
+    assert list(page.columns) == list(window_schedule.COLUMNS)
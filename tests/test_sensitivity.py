@@ -0,0 +1,48 @@
+# tests/test_sensitivity.py
+import random
+
+import numpy as np
+import pytest
+
+from calculator import DebtCalculator
+from models import DebtPortfolio
+from sensitivity import SensitivityAnalyzer
+from strategies import STRATEGIES
+
+MONTHS = 60
+CENT = 0.01 + 1e-9
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_sweep_matches_single_runs(portfolio_factory, strategy):
+    debts = portfolio_factory(random.Random(strategy), 8)
+    cash_flows = SensitivityAnalyzer.cash_flow_grid(1500.0, debts, points=15)
+    curve = SensitivityAnalyzer.sweep(debts, cash_flows, MONTHS, strategy)
+
+    assert curve.paid_off.any() and not curve.paid_off.all()
+    for point, cash_flow in enumerate(cash_flows.tolist()):
+        schedule, total_months = DebtCalculator.calculate_repayment_schedule(
+            debts, cash_flow, MONTHS, "python", strategy
+        )
+        paid_off = bool((schedule.balance[-1] <= 0).all())
+        assert curve.paid_off[point] == paid_off, cash_flow
+        assert curve.payoff_months[point] == (total_months if paid_off else 0), cash_flow
+        assert curve.total_interest[point] == pytest.approx(schedule.interest.sum(), abs=CENT)
+        assert curve.payoff_month(cash_flow) == (total_months if paid_off else None)
+
+
+def test_portfolio_input_matches_debt_list(portfolio_factory):
+    debts = portfolio_factory(random.Random(23), 5)
+    cash_flows = [0.0, 50.0, 500.0]
+    from_list = SensitivityAnalyzer.sweep(debts, cash_flows, MONTHS)
+    from_portfolio = SensitivityAnalyzer.sweep(DebtPortfolio.from_debts(debts), cash_flows, MONTHS)
+    np.testing.assert_array_equal(from_list.payoff_months, from_portfolio.payoff_months)
+    np.testing.assert_array_equal(from_list.total_interest, from_portfolio.total_interest)
+
+
+def test_grid_without_cash_flow_spans_the_minimums(portfolio_factory):
+    debts = portfolio_factory(random.Random(5), 3)
+    grid = SensitivityAnalyzer.cash_flow_grid(0.0, debts, points=5)
+    assert grid[0] == 0.0
+    assert grid[-1] == pytest.approx(round(sum(debt.min_payment for debt in debts), 2))
+    assert SensitivityAnalyzer.cash_flow_grid(0.0, [], points=3).tolist() == [0.0, 50.0, 100.0]
@@ -0,0 +1,92 @@
+# tests/test_service.py
+import asyncio
+import json
+
+import pytest
+
+from service import CalculationService, PlanRequest
+
+DEBT = {'creditor': "Card", 'balance': 1000.0, 'limit': 2000.0, 'min_payment': 50.0, 'apr': 19.99}
+
+
+def body(**fields) -> bytes:
+    data = {'debts': [DEBT], 'additional_cash_flow': 100.0, 'months': 120}
+    data.update(fields)
+    return json.dumps(data).encode('utf-8')
+
+
+@pytest.fixture
+def service():
+    service = CalculationService(workers=1)
+    yield service
+    service.close()
+
+
+def post(service: CalculationService, payload: bytes):
+    status, response = asyncio.run(service.handle('POST', '/schedule', payload))
+    return status, json.loads(response)
+
+
+@pytest.mark.parametrize("payload", [
+    body(months=float('inf')),
+    body(months=[12]),
+    body(months={'value': 12}),
+    body(months=0),
+    body(months=1201),
+    body(months="many"),
+    body(months=12.7),
+    body(months=True),
+    body(months="12"),
+    body(months=10 ** 400),
+    body(additional_cash_flow=-1.0),
+    body(additional_cash_flow=10 ** 400),
+    body(debts=[dict(DEBT, balance=10 ** 400)]),
+    body(debts=[]),
+    body(debts=["Card"]),
+    body(detail="false"),
+    body(detail="0"),
+    body(detail=0),
+    body(detail=None),
+    body(strategy=["avalanche"]),
+    body(strategy="fastest"),
+    body(engine={"name": "numpy"}),
+    b'{"debts": [',
+    b'\xff\xfe'
+])
+def test_invalid_requests_are_client_errors(service, payload):
+    status, response = post(service, payload)
+    assert status == 400
+    assert response['error']
+    assert service.errors == 0
+
+
+def test_months_must_be_a_whole_number():
+    assert PlanRequest.from_json(json.loads(body(months=24))).months == 24
+    assert PlanRequest.from_json(json.loads(body(months=24.0))).months == 24
+    assert PlanRequest.from_json({'debts': [DEBT]}).months == 360
+    with pytest.raises(ValueError, match="whole number"):
+        PlanRequest.from_json(json.loads(body(months=12.7)))
+
+
+def test_detail_must_be_a_json_boolean():
+    assert PlanRequest.from_json(json.loads(body(detail=True))).detail is True
+    assert PlanRequest.from_json(json.loads(body(detail=False))).detail is False
+    assert PlanRequest.from_json(json.loads(body())).detail is False
+
+
+def test_internal_errors_are_logged_not_returned(service, monkeypatch, caplog):
+    async def broken(request):
+        raise RuntimeError("secret internals")
+
+    monkeypatch.setattr(service, 'plan', broken)
+    status, response = post(service, body())
+    assert status == 500
+    assert "secret" not in json.dumps(response)
+    assert service.errors == 1
+    assert "secret internals" in caplog.text
+
+
+def test_valid_request_is_calculated(service):
+    status, response = post(service, body(months=1200))
+    assert status == 200
+    assert response['paid_off'] and response['payoff_months'] == [response['total_months']]
@@ -0,0 +1,130 @@
+# tests/test_solver.py
+"""The event-driven solver agrees with the month-by-month loop."""
+import random
+
+import numpy as np
+import pytest
+
+from calculator import DebtCalculator
+from models import Debt
+from solver import PayoffSolver
+from strategies import STRATEGIES
+
+
+def schedule_payoffs(debts, cash_flow, months, strategy):
+    """Per-creditor payoff months (None if unpaid), total interest and months from the numpy engine."""
+    schedule, total_months = DebtCalculator.calculate_repayment_schedule(debts, cash_flow, months, "numpy", strategy)
+    cleared = schedule.balance <= 0
+    payoffs = {
+        creditor: int(cleared[:, position].argmax()) + 1 if cleared[:, position].any() else None
+        for position, creditor in enumerate(schedule.creditors)
+    }
+    return payoffs, float(schedule.interest.sum()), total_months
+
+
+def assert_solver_matches(debts, cash_flow, months, strategy):
+    events = PayoffSolver.solve(debts, cash_flow, months, strategy)
+    payoffs, interest, total_months = schedule_payoffs(debts, cash_flow, months, strategy)
+    assert dict(zip(events.creditors, events.payoff_months)) == payoffs
+    assert events.total_months == total_months
+    assert events.total_interest == pytest.approx(interest, rel=1e-9, abs=1e-6)
+    return events
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+@pytest.mark.parametrize("with_apr", [True, False])
+def test_solver_matches_schedule(portfolio_factory, strategy, with_apr):
+    rng = random.Random(f"solver-{strategy}-{with_apr}")
+    for _ in range(40):
+        debts = portfolio_factory(rng, rng.randint(1, 8), with_apr)
+        cash_flow = round(rng.choice([0.0, rng.uniform(0, 2000)]), 2)
+        assert_solver_matches(debts, cash_flow, rng.randint(1, 360), strategy)
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_solver_at_the_horizon(portfolio_factory, strategy):
+    rng = random.Random(f"horizon-{strategy}")
+    for _ in range(20):
+        debts = portfolio_factory(rng, rng.randint(1, 6))
+        cash_flow = round(rng.uniform(50, 1500), 2)
+        payoffs, _, payoff = schedule_payoffs(debts, cash_flow, 1200, strategy)
+        if None in payoffs.values():
+            continue
+
+        # Ends exactly at the last month
+        events = assert_solver_matches(debts, cash_flow, payoff, strategy)
+        assert all(month is not None for month in events.payoff_months)
+        assert PayoffSolver.payoff_month(debts, cash_flow, payoff, strategy) == payoff
+
+        # One month short, the last debt is still open
+        if payoff > 1:
+            events = assert_solver_matches(debts, cash_flow, payoff - 1, strategy)
+            assert None in events.payoff_months
+            assert PayoffSolver.payoff_month(debts, cash_flow, payoff - 1, strategy) is None
+
+
+def test_solver_never_paid_off():
+    # Minimum payments below the monthly interest, and no extra cash
+    debts = [
+        Debt.create("Card A", 10000.0, 12000.0, 50.0, 24.99),
+        Debt.create("Card B", 5000.0, 6000.0, 60.0, 19.99),
+        Debt.create("Loan", 800.0, 1000.0, 100.0, 0.0)
+    ]
+    events = assert_solver_matches(debts, 0.0, 600, "avalanche")
+    assert events.payoff_month("Loan") is not None
+    assert events.payoff_month("Card A") is None
+    assert events.total_months == 600
+    assert PayoffSolver.payoff_month(debts, 0.0, 600, "avalanche") is None
+
+
+def test_solver_zero_apr_total_interest_is_zero(portfolio_factory):
+    debts = portfolio_factory(random.Random(3), 6, with_apr=False)
+    events = assert_solver_matches(debts, 300.0, 240, "snowball")
+    assert events.total_interest == 0
+    assert np.all(np.array(events.interest) == 0)
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_minimum_cash_flow_is_feasible_and_minimal(portfolio_factory, strategy):
+    rng = random.Random(f"goal-{strategy}")
+    for _ in range(25):
+        debts = portfolio_factory(rng, rng.randint(1, 8), with_apr=rng.random() < 0.8)
+        target = rng.randint(1, 240)
+        goal = PayoffSolver.minimum_cash_flow(debts, target, strategy)
+
+        schedule, total_months = DebtCalculator.calculate_repayment_schedule(
+            debts, goal.additional_cash_flow, target, "numpy", strategy
+        )
+        assert (schedule.balance[-1] <= 0).all()
+        assert total_months == goal.payoff_month <= target
+        assert goal.additional_cash_flow >= 0
+        if goal.additional_cash_flow > 0:
+            short = round(goal.additional_cash_flow - 0.01, 2)
+            assert PayoffSolver.payoff_month(debts, short, target, strategy) is None
+
+
+def test_minimum_cash_flow_at_a_payoff_boundary():
+    # Found by search: the event solver's closed-form balances disagree with
+    # the month loop on whether $149.06 pays these debts off in time
+    rng = random.Random(11)
+    debts = [Debt.create(f"c{i}", round(rng.uniform(100, 20000), 2), 30000.0, round(rng.uniform(10, 400), 2),
+                         rng.choice([0.0, round(rng.uniform(0, 29.99), 2)]))
+             for i in range(rng.randint(1, 8))]
+    assert None in PayoffSolver.solve(debts, 149.06, 76, "snowball").payoff_months
+    assert PayoffSolver.payoff_month(debts, 149.06, 76, "snowball") == 64
+    assert PayoffSolver.minimum_cash_flow(debts, 76, "snowball").additional_cash_flow == 149.06
+
+    for target in range(60, 80):
+        goal = PayoffSolver.minimum_cash_flow(debts, target, "snowball")
+        assert PayoffSolver.payoff_month(debts, goal.additional_cash_flow, target, "snowball") == goal.payoff_month
+        if goal.additional_cash_flow > 0:
+            assert PayoffSolver.payoff_month(debts, round(goal.additional_cash_flow - 0.01, 2), target,
+                                             "snowball") is None
+
+
+def test_minimum_cash_flow_needs_no_extra_when_minimums_suffice():
+    debts = [Debt.create("Loan", 300.0, 1000.0, 100.0, 0.0)]
+    goal = PayoffSolver.minimum_cash_flow(debts, 3)
+    assert goal.additional_cash_flow == 0 and goal.payoff_month == 3
+    with pytest.raises(ValueError):
+        PayoffSolver.minimum_cash_flow(debts, 0)
@@ -0,0 +1,78 @@
+# tests/test_validators.py
+"""validate_debt_columns gives the same message as validate_debt_input for every row."""
+import itertools
+import random
+
+import numpy as np
+
+from validators import InputValidator
+
+CREDITORS = ["Card", "", "   ", "\t", " Bank "]
+AMOUNTS = [-0.01, 0.0, 0.01, 50.0, 100.0, 1e9]
+APRS = [-0.01, 0.0, 0.01, 19.99, 100.0, 100.01]
+
+
+def assert_columns_match(rows):
+    creditor, balance, limit, min_payment, apr = (list(column) for column in zip(*rows))
+    messages = InputValidator.validate_debt_columns(
+        np.array(creditor, dtype=object), np.array(balance), np.array(limit), np.array(min_payment), np.array(apr)
+    )
+    for row, message in zip(rows, messages):
+        is_valid, expected = InputValidator.validate_debt_input(*row)
+        assert message == expected, row
+        assert (message == "") == is_valid
+
+
+def test_every_rule_and_boundary():
+    rows = list(itertools.product(CREDITORS, AMOUNTS, [0.0, -1.0, 500.0], AMOUNTS, APRS))
+    assert_columns_match(rows)
+
+
+def test_minimum_payment_against_balance():
+    rows = [
+        ("Card", 100.0, 0.0, 100.0, 0.0),     # equal to the balance
+        ("Card", 100.0, 0.0, 100.01, 0.0),    # above the balance
+        ("Card", 0.0, 0.0, 25.0, 0.0),        # any minimum on a zero balance
+        ("Card", 100.0, 0.0, -0.01, 0.0),
+        ("Card", 100.0, 0.0, 0.0, 100.0),
+        ("Card", 100.0, 0.0, 0.0, 0.0)
+    ]
+    assert_columns_match(rows)
+
+
+def test_random_rows():
+    rng = random.Random(12)
+    rows = [
+        (
+            rng.choice(CREDITORS),
+            round(rng.uniform(-100, 1000), 2),
+            round(rng.uniform(-100, 1000), 2),
+            round(rng.uniform(-50, 1100), 2),
+            round(rng.uniform(-5, 105), 2)
+        )
+        for _ in range(2000)
+    ]
+    assert_columns_match(rows)
+
+
+def test_missing_numbers_get_their_own_message():
+    messages = InputValidator.validate_debt_columns(
+        np.array(["A", "B", "C", "D"], dtype=object),
+        np.array([np.nan, 1.0, 1.0, 1.0]),
+        np.array([1.0, np.nan, 1.0, 1.0]),
+        np.array([1.0, 1.0, np.nan, 1.0]),
+        np.array([1.0, 1.0, 1.0, np.nan])
+    )
+    assert list(messages) == [
+        "Balance must be a number",
+        "Credit limit must be a number",
+        "Minimum payment must be a number",
+        "APR must be a number"
+    ]
+
+
+def test_apr_defaults_to_zero():
+    messages = InputValidator.validate_debt_columns(
+        np.array(["A"], dtype=object), np.array([10.0]), np.array([0.0]), np.array([5.0])
+    )
+    assert list(messages) == [""]
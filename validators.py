@@ -1,5 +1,6 @@
 # validators.py
-from typing import Tuple
+import numpy as np
+from typing import Optional, Tuple
 
 class InputValidator:
     @staticmethod
@@ -15,7 +16,12 @@ class InputValidator:
         return min_payment >= 0 and (balance == 0 or min_payment <= balance)
     
     @staticmethod
-    def validate_debt_input(creditor: str, balance: float, limit: float, min_payment: float) -> Tuple[bool, str]:
+    def validate_apr(apr: float) -> bool:
+        return 0 <= apr <= 100
+    
+    @staticmethod
+    def validate_debt_input(creditor: str, balance: float, limit: float, min_payment: float,
+                            apr: float = 0.0) -> Tuple[bool, str]:
         if not InputValidator.validate_creditor(creditor):
             return False, "Creditor name cannot be empty"
         if not InputValidator.validate_amount(balance):
@@ -24,5 +30,42 @@ class InputValidator:
             return False, "Credit limit cannot be negative"
         if not InputValidator.validate_min_payment(min_payment, balance):
             return False, "Invalid minimum payment amount"
+        if not InputValidator.validate_apr(apr):
+            return False, "APR must be between 0% and 100%"
         return True, ""
 
+    @staticmethod
+    def validate_debt_columns(creditor: np.ndarray, balance: np.ndarray, limit: np.ndarray,
+                              min_payment: np.ndarray, apr: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Apply the validate_debt_input rules to whole columns at once.
+
+        Missing or unparsable numbers are expected as NaN and get their own message.
+
+        Args:
+        - creditor: Creditor names
+        - balance, limit, min_payment, apr: Numeric columns of the same length; apr defaults to 0
+
+        Returns:
+        - error message per row, "" where the row is valid; the first failing
+          rule wins, in the same order as validate_debt_input
+        """
+        names = np.char.strip(np.asarray(creditor, dtype=str))
+        balance = np.asarray(balance, dtype=np.float64)
+        limit = np.asarray(limit, dtype=np.float64)
+        min_payment = np.asarray(min_payment, dtype=np.float64)
+        apr = np.zeros_like(balance) if apr is None else np.asarray(apr, dtype=np.float64)
+
+        with np.errstate(invalid='ignore'):
+            rules = [
+                (np.char.str_len(names) == 0, "Creditor name cannot be empty"),
+                (np.isnan(balance), "Balance must be a number"),
+                (balance < 0, "Balance cannot be negative"),
+                (np.isnan(limit), "Credit limit must be a number"),
+                (limit < 0, "Credit limit cannot be negative"),
+                (np.isnan(min_payment), "Minimum payment must be a number"),
+                ((min_payment < 0) | ((balance != 0) & (min_payment > balance)), "Invalid minimum payment amount"),
+                (np.isnan(apr), "APR must be a number"),
+                ((apr < 0) | (apr > 100), "APR must be between 0% and 100%")
+            ]
+        return np.select([failed for failed, _ in rules], [message for _, message in rules], default="").astype(object)